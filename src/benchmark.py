@@ -0,0 +1,456 @@
+"""
+src/benchmark.py - Node bileşenleri için mikro benchmark'lar.
+
+Kullanım:
+  python3 src/benchmark.py handler --requests 200
+  python3 src/benchmark.py state --sizes 10 100 1000
+  python3 src/benchmark.py gossip --sizes 10 100 1000
+  python3 src/benchmark.py swim --sizes 10 100 1000
+  python3 src/benchmark.py metrics --requests 2000
+  python3 src/benchmark.py codec --sizes 10 100 1000
+  python3 src/benchmark.py status --sizes 10 100 1000
+"""
+import argparse
+import json
+import time
+import logging
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def percentile(samples, pct):
+    """Sıralı olmayan örneklerden yüzdelik değeri döndürür (en yakın sıra)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def print_latency(label, samples_ms):
+    """p50/p99 gecikme satırını yazdırır."""
+    print(f"{label:<32} n={len(samples_ms):<6} "
+          f"p50={percentile(samples_ms, 50):9.3f} ms  "
+          f"p99={percentile(samples_ms, 99):9.3f} ms")
+
+
+# ============================================================================
+# handler: Bloklayan psutil çağrısı vs. önbelleklenmiş CPU yükü
+# ============================================================================
+
+def bench_handler(args):
+    """/ ve /load handler gecikmesini eski (bloklayan) ve yeni (önbellekli) yolla ölçer."""
+    import psutil
+    import node_server
+    from utils import State, CPUSampler, AdmissionController, StatusCache, make_limit
+
+    class BlockingCPUState(State):
+        """
+        Eski davranış: handler'ların okuduğu CPU yükü istek başına bir kez psutil
+        ile 0.5 sn beklenerek ölçülür (/load → load_signals, / → is_overloaded).
+        Örnekleyicinin yazdığı değer yok sayılır.
+        """
+
+        def begin_request(self):
+            self._request_cpu = None
+            super().begin_request()
+
+        @property
+        def my_cpu_load(self):
+            if getattr(self, "_request_cpu", None) is None:
+                self._request_cpu = psutil.cpu_percent(interval=0.5)
+            return self._request_cpu
+
+        @my_cpu_load.setter
+        def my_cpu_load(self, value):
+            pass
+
+    state = node_server.state = State()
+    node_server.my_addr = "http://benchmark:0"
+    node_server.admission = AdmissionController(make_limit("aimd"))
+    node_server.status_cache = StatusCache(state, node_server.my_addr, render=node_server._render_status)
+    CPUSampler(state, interval=0.1).start()
+    time.sleep(0.3)
+
+    client = node_server.app.test_client()
+    modes = [
+        ("before (blocking)", BlockingCPUState, args.blocking_requests),
+        ("after (cached)", State, args.requests),
+    ]
+
+    for endpoint in args.endpoints:
+        for label, state_class, count in modes:
+            # Sadece CPU yükünün okunduğu yer değişir; State'in geri kalanı aynı nesne
+            state.__class__ = state_class
+            samples = []
+            for _ in range(count):
+                start = time.perf_counter()
+                response = client.get(endpoint)
+                samples.append((time.perf_counter() - start) * 1000)
+                # Hata cevaplarının süresi ölçülmüş sayılmasın
+                assert response.status_code == 200, f"{endpoint} {label}: {response.status_code}"
+            print_latency(f"{endpoint} {label}", samples)
+
+    state.__class__ = State
+
+
+# ============================================================================
+# state: Lineer tarama vs. sıralı indeks ile best_peer()
+# ============================================================================
+
+def _linear_best_peer(state):
+    """Eski best_peer(): lock altında filtreleme + min()."""
+    with state.lock:
+        valid_peers = [p for p in state.peers.values() if p.load > 0 or p.latency > 0]
+        if not valid_peers:
+            return None
+        return min(valid_peers, key=lambda p: p.score)
+
+
+def _time_calls(func, iterations):
+    """func'ı iterations kez çağırır, çağrı başına ortalama süreyi (µs) döndürür."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_state(args):
+    """10/100/1000 peer için best_peer() okuma ve metrik güncelleme maliyetini ölçer."""
+    import random
+    from utils import State
+
+    rng = random.Random(42)
+    print(f"{'peers':>6} {'linear best':>14} {'indexed best':>14} {'top-5':>10} {'update':>10}  (µs/call)")
+    for size in args.sizes:
+        state = State()
+        addrs = [f"http://peer-{i}:8081" for i in range(size)]
+        state.set_peers(addrs)
+        for addr in addrs:
+            state.update_peer_metrics(addr, rng.uniform(1, 100), rng.uniform(1, 50))
+
+        linear = _time_calls(lambda: _linear_best_peer(state), args.iterations)
+        indexed = _time_calls(state.best_peer, args.iterations)
+        top_k = _time_calls(lambda: state.top_peers(5), args.iterations)
+        update = _time_calls(
+            lambda: state.update_peer_metrics(rng.choice(addrs), rng.uniform(1, 100), rng.uniform(1, 50)),
+            max(1, args.iterations // 10))
+        print(f"{size:>6} {linear:>14.3f} {indexed:>14.3f} {top_k:>10.3f} {update:>10.3f}")
+
+
+
+# ============================================================================
+# gossip: A_M_R delta gossip yakınsaması (process içi, ağsız)
+# ============================================================================
+
+class LocalTransport:
+    """A_M_R mesajlarını doğrudan hedef istemcinin handler'ına iletir ve baytları sayar."""
+
+    def __init__(self):
+        self.clients = {}
+        self.down = set()  # Çökmüş kabul edilen node'lar
+        self.messages = 0
+        self.bytes = 0
+
+    def post(self, peer_addr, path, payload, timeout):
+        self.messages += 1
+        self.bytes += len(json.dumps(payload))
+        if peer_addr in self.down:
+            raise TimeoutError(peer_addr)
+        client = self.clients[peer_addr]
+        handler = {
+            "/a_m_r/sync": client.handle_sync,
+            "/a_m_r/ping": client.handle_ping,
+            "/a_m_r/ping-req": client.handle_ping_req,
+        }[path]
+        reply = handler(payload)
+        self.bytes += len(json.dumps(reply))
+        return reply
+
+
+def bench_gossip(args):
+    """Halka şeklinde tohumlanmış N node'un tam üyeliğe kaç turda ulaştığını ve tur başı trafiği ölçer."""
+    import random
+    from utils import AMRClient
+
+    print(f"{'nodes':>6} {'rounds':>7} {'msgs/round':>11} {'KB/round':>10} "
+          f"{'steady KB/round':>16} {'full-list KB/round':>19}")
+    for size in args.sizes:
+        rng = random.Random(42)
+        transport = LocalTransport()
+        addrs = [f"http://node-{i}:8081" for i in range(size)]
+        for i, addr in enumerate(addrs):
+            client = AMRClient(addr, [addrs[(i + 1) % size]], transport=transport,
+                               fanout=args.fanout, rng=random.Random(rng.random()))
+            client.running = True
+            transport.clients[addr] = client
+
+        rounds = 0
+        while rounds < args.max_rounds:
+            rounds += 1
+            for client in transport.clients.values():
+                client.gossip_round()
+            if all(len(c.members) == size for c in transport.clients.values()):
+                break
+
+        converge_bytes, converge_messages = transport.bytes, transport.messages
+        # Yakınsamadan sonra değişiklik yokken tur başı trafik
+        transport.bytes = 0
+        for _ in range(args.steady_rounds):
+            for client in transport.clients.values():
+                client.gossip_round()
+        steady_kb = transport.bytes / max(1, args.steady_rounds) / 1024
+
+        # Eski yöntem: her node her peer'ına tam listeyi gönderir (/a_m_r/botlist + /a_m_r/sync)
+        full_list = len(json.dumps({"peers": addrs}))
+        full_kb = size * args.fanout * full_list * 2 / 1024
+        print(f"{size:>6} {rounds:>7} {converge_messages / rounds:>11.0f} "
+              f"{converge_bytes / rounds / 1024:>10.1f} {steady_kb:>16.1f} {full_kb:>19.1f}")
+
+
+
+def bench_swim(args):
+    """Bir node çöktüğünde herkesin onu dead görmesi için gereken probe turunu ve node başı mesajı ölçer."""
+    import random
+    from utils import AMRClient
+
+    print(f"{'nodes':>6} {'first suspect':>14} {'all dead':>9} {'msgs/node/round':>16}")
+    for size in args.sizes:
+        now = [0.0]
+        transport = LocalTransport()
+        addrs = [f"http://node-{i}:8081" for i in range(size)]
+        for i, addr in enumerate(addrs):
+            client = AMRClient(addr, addrs[:i] + addrs[i + 1:], transport=transport,
+                               rng=random.Random(i), probe_interval=1.0, time_fn=lambda: now[0])
+            client.running = True
+            transport.clients[addr] = client
+
+        victim = addrs[0]
+        transport.down.add(victim)
+        survivors = [c for addr, c in transport.clients.items() if addr != victim]
+        first_suspect = None
+        rounds = 0
+        while rounds < args.max_rounds:
+            rounds += 1
+            now[0] += 1.0
+            for client in survivors:
+                client.probe_round()
+            statuses = [c.members[victim]["status"] for c in survivors]
+            if first_suspect is None and any(st != "alive" for st in statuses):
+                first_suspect = rounds
+            if all(st == "dead" for st in statuses):
+                break
+
+        print(f"{size:>6} {first_suspect or '-':>14} {rounds:>9} "
+              f"{transport.messages / rounds / len(survivors):>16.2f}")
+
+
+# ============================================================================
+# metrics: Enstrümantasyonun handler süresine oranı
+# ============================================================================
+
+def bench_metrics(args):
+    """Metrik işlemlerinin tek tek maliyetini ve istek başına toplam payını ölçer."""
+    import node_server
+    from utils import State, METRICS, MetricsRegistry
+
+    node_server.state = State()
+    node_server.my_addr = "http://benchmark:0"
+    client = node_server.app.test_client()
+
+    scratch = MetricsRegistry()
+    counter = scratch.counter("dinc_benchmark_total", "benchmark")
+    histogram = scratch.histogram("dinc_benchmark_seconds", "benchmark", ("endpoint",))
+    child = histogram.labels("load")
+
+    # Bir isteğin eklediği işlemler: WSGI süre ölçümü (sarmalanan uygulama boş) + sonuç sayacı
+    timed = node_server._timed_wsgi_app(lambda environ, start_response: None)
+    environ = {"PATH_INFO": "/load"}
+
+    def per_request():
+        timed(environ, None)
+        node_server._INDEX_SERVED.inc()
+
+    ops = [
+        ("counter.inc()", counter.inc),
+        ("histogram.observe()", lambda: child.observe(0.001)),
+        ("labels().observe()", lambda: histogram.labels("load").observe(0.001)),
+        ("istek başına toplam", per_request),
+    ]
+    costs = {label: _time_calls(func, args.iterations) for label, func in ops}
+    for label, cost in costs.items():
+        print(f"{label:<32} {cost:9.3f} µs/call")
+
+    render = _time_calls(METRICS.render, 200)
+    print(f"{'/metrics render':<32} {render:9.3f} µs/call")
+
+    per_request_us = costs["istek başına toplam"]
+    for endpoint in args.endpoints:
+        samples = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            client.get(endpoint)
+            samples.append((time.perf_counter() - start) * 1000)
+        print_latency(endpoint, samples)
+        handler_us = percentile(samples, 50) * 1000
+        print(f"{'':<32} enstrümantasyon payı: %{per_request_us / handler_us * 100:.2f} (p50 handler süresine göre)")
+
+
+# ============================================================================
+# codec: Kontrol düzlemi mesajlarının boyutu ve kodlama/çözme maliyeti
+# ============================================================================
+
+def _codec_messages(size):
+    """size node'luk cluster'da bir node'un turunda gördüğü mesajlar: (ad, nesne, tur başına adet)."""
+    from datetime import datetime, timezone
+
+    addrs = [f"http://node-{i:04d}.dinc.local:8081" for i in range(size)]
+    now = datetime.now(timezone.utc).isoformat()
+    nodes = [{"address": addr, "lastSeen": now, "isHealthy": True, "cpuLoad": 37.25 + i % 50,
+              "effectiveLoad": 41.5 + i % 40, "inFlight": i % 9, "timestamp": 1792244097.781 + i,
+              "version": 1000 + i} for i, addr in enumerate(addrs)]
+    load = {"address": addrs[0], "cpuLoad": 37.25, "cpuAvg": 35.1, "cpuMax": 52.0, "inFlight": 3,
+            "latencyMs": 12.48, "acceptQueue": 0, "effectiveLoad": 41.5, "overloaded": False,
+            "overloadReason": None}
+    entries = [{"address": addr, "incarnation": i % 3, "status": "alive"} for i, addr in enumerate(addrs)]
+    sync = {"from": addrs[0], "clock": 5123, "since": 0, "digest": 12345678901234567890 % (1 << 63),
+            "probe": False, "entries": entries}
+    botlist = {"address": addrs[0], "peers": addrs, "count": size, "timestamp": now}
+    return [
+        ("/nodes (tam liste)", nodes, 1),
+        ("/load (peer başına)", load, size - 1),
+        ("/a_m_r/sync (tam delta)", sync, 1),
+        ("/a_m_r/botlist", botlist, 1),
+    ]
+
+
+def bench_codec(args):
+    """Her mesajı JSON, msgpack ve gzip'li halleriyle kodlar; bayt ve CPU süresini karşılaştırır."""
+    import gzip
+    from utils import codec
+
+    formats = [("json", False, False), ("json+gzip", False, True)]
+    if codec.msgpack is not None:
+        formats += [("msgpack", True, False), ("msgpack+gzip", True, True)]
+    else:
+        print("(msgpack kurulu değil; sadece JSON ölçülüyor)")
+
+    print(f"{'nodes':>6} {'mesaj':<26} {'format':<13} {'bayt':>9} {'kodla µs':>9} {'çöz µs':>9}")
+    for size in args.sizes:
+        totals = {name: [0, 0.0] for name, _, _ in formats}  # Tur başına bayt ve CPU (µs)
+        for label, obj, per_round in _codec_messages(size):
+            for name, binary, compress in formats:
+                # Sunucuların kullandığı eşik: küçük gövdeler gzip'e izin verilse de sıkıştırılmaz
+                body, headers = codec.encode(obj, binary=binary, compress=compress)
+                content_type = headers["Content-Type"]
+                compressed = "Content-Encoding" in headers
+                iterations = max(20, args.iterations // max(1, len(body) // 64))
+
+                def decode():
+                    raw = gzip.decompress(body) if compressed else body
+                    return codec.loads(raw, content_type)
+
+                encode_us = _time_calls(lambda: codec.encode(obj, binary=binary, compress=compress), iterations)
+                decode_us = _time_calls(decode, iterations)
+                print(f"{size:>6} {label:<26} {name:<13} {len(body):>9} {encode_us:>9.1f} {decode_us:>9.1f}")
+                totals[name][0] += len(body) * per_round
+                totals[name][1] += (encode_us + decode_us) * per_round
+        for name, (nbytes, cpu_us) in totals.items():
+            print(f"{size:>6} {'TUR TOPLAMI':<26} {name:<13} {nbytes:>9} {cpu_us / 1000:>15.2f} ms")
+        print()
+
+
+# ============================================================================
+# status: Durum sayfası; her istekte işleme vs. State sürümüne göre önbellek
+# ============================================================================
+
+def bench_status(args):
+    """Durum sayfasını her istekte işlemenin ve önbellekten vermenin maliyetini karşılaştırır."""
+    import random
+    import node_server
+    from utils import State
+    from utils.status import StatusCache
+
+    rng = random.Random(42)
+    print(f"{'peers':>6} {'render/hit':>12} {'cached hit':>12} {'rebuild':>10} {'status.json':>12} "
+          f"{'SSE delta':>10}  (µs/call)")
+    for size in args.sizes:
+        state = State()
+        addrs = [f"http://peer-{i}:8081" for i in range(size)]
+        state.set_peers(addrs)
+        for addr in addrs:
+            state.update_peer_metrics(addr, rng.uniform(1, 100), rng.uniform(1, 50))
+        cache = StatusCache(state, "http://benchmark:0", render=node_server._render_status)
+
+        def render_per_hit():
+            # Önceki davranış: her istekte peer'lar sözlüğe çevrilir ve şablon işlenir
+            cache._view = None
+            cache._page = (None, b"", "")
+            cache.page()
+
+        def rebuild():
+            # En kötü durum: her istekte sürüm değişmiş (CPU örneği geldi)
+            state.set_my_cpu_load(rng.uniform(1, 100))
+            cache.page()
+
+        def sse_delta():
+            old = cache.view()
+            state.update_peer_metrics(rng.choice(addrs), rng.uniform(1, 100), rng.uniform(1, 50))
+            cache.delta(old, cache.view())
+
+        iterations = max(20, args.iterations // size)
+        with node_server.app.app_context():
+            per_hit = _time_calls(render_per_hit, iterations)
+            cache.page()
+            cached = _time_calls(cache.page, args.iterations)
+            rebuilt = _time_calls(rebuild, iterations)
+            as_json = _time_calls(lambda: cache.view().json, args.iterations)
+            delta = _time_calls(sse_delta, iterations)
+        print(f"{size:>6} {per_hit:>12.1f} {cached:>12.2f} {rebuilt:>10.1f} {as_json:>12.2f} {delta:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DiNC mikro benchmark'ları")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("handler", help="Handler gecikmesi (CPU örnekleme öncesi/sonrası)")
+    p.add_argument("--requests", type=int, default=200, help="Önbellekli mod istek sayısı")
+    p.add_argument("--blocking-requests", type=int, default=10, help="Bloklayan mod istek sayısı")
+    p.add_argument("--endpoints", nargs="+", default=["/load", "/"], help="Ölçülecek endpoint'ler")
+    p.set_defaults(func=bench_handler)
+
+    p = sub.add_parser("state", help="best_peer() okuma maliyeti (lineer vs. indeks)")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Peer sayıları")
+    p.add_argument("--iterations", type=int, default=20000, help="Ölçüm başına çağrı sayısı")
+    p.set_defaults(func=bench_state)
+
+    p = sub.add_parser("gossip", help="A_M_R delta gossip yakınsama süresi ve trafiği")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Node sayıları")
+    p.add_argument("--fanout", type=int, default=3, help="Tur başına gossip hedefi")
+    p.add_argument("--max-rounds", type=int, default=100, help="Yakınsama için üst sınır")
+    p.add_argument("--steady-rounds", type=int, default=5, help="Yakınsamadan sonra ölçülen tur sayısı")
+    p.set_defaults(func=bench_gossip)
+
+    p = sub.add_parser("swim", help="A_M_R SWIM hata tespiti süresi ve probe yükü")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Node sayıları")
+    p.add_argument("--max-rounds", type=int, default=200, help="Tespit için üst sınır (probe turu)")
+    p.set_defaults(func=bench_swim)
+
+    p = sub.add_parser("metrics", help="Metrik enstrümantasyonunun handler süresine oranı")
+    p.add_argument("--requests", type=int, default=2000, help="Endpoint başına istek sayısı")
+    p.add_argument("--iterations", type=int, default=200000, help="İşlem başına çağrı sayısı")
+    p.add_argument("--endpoints", nargs="+", default=["/load", "/redirect", "/health"], help="Ölçülecek endpoint'ler")
+    p.set_defaults(func=bench_metrics)
+
+    p = sub.add_parser("codec", help="Kontrol düzlemi mesajlarının boyutu ve kodlama/çözme maliyeti")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Node sayıları")
+    p.add_argument("--iterations", type=int, default=2000, help="Küçük mesajlar için ölçüm başına çağrı sayısı")
+    p.set_defaults(func=bench_codec)
+
+    p = sub.add_parser("status", help="Durum sayfası: her istekte işleme vs. sürüme göre önbellek")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Peer sayıları")
+    p.add_argument("--iterations", type=int, default=20000, help="Önbellekli ölçüm başına çağrı sayısı")
+    p.set_defaults(func=bench_status)
+
+    args = parser.parse_args()
+    args.func(args)
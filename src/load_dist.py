@@ -0,0 +1,302 @@
+"""
+src/load_dist.py - Çok process'li (ve isteğe bağlı çok makineli) yük üretimi.
+Tek process'te GIL ve tek event loop yük üretecini sınırlar; ölçülen şey cluster
+değil üretecin kendisi olur. Koordinatör hedef hızı worker'lara böler, her worker
+kendi event loop'u ve bağlantı havuzuyla çalışır ve sonucunu histogram olarak
+geri gönderir; koordinatör histogramları birleştirip tek rapor üretir.
+
+Kullanım:
+  python3 src/load_test.py --rate 4000 --processes 4 --duration 30
+  python3 src/load_dist.py --listen 9000          # başka bir makinede/portta worker
+  python3 src/load_test.py --rate 8000 --processes 4 --remote-workers 10.0.0.5:9000 --duration 30
+"""
+import json
+import logging
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import requests
+
+from load_stats import RunStats
+from load_scenario import Scenario
+
+logger = logging.getLogger(__name__)
+
+START_SLACK = 1.0  # Worker'ların hazırlanması için ortak başlangıca kadar bekleme (saniye)
+
+
+def run_worker(config: Dict, stop_event) -> Dict:
+    """
+    Tek bir worker'ın testini çalıştırır ve sonucu sözlük olarak döndürür.
+    stop_event set edildiğinde (koordinatör, başka worker ya da --duration) test durur.
+    """
+    from load_test import LoadTestAsync, LoadTestThread, LoadTestScenario
+
+    share = config["share"]
+    RunStats.slo_ms = config.get("slo_ms", RunStats.slo_ms)
+    if config.get("scenario"):
+        scenario = Scenario(config["scenario"], rng=random.Random(config["index"]), share=share)
+        test = LoadTestScenario(scenario, monitor_failover=False)
+    elif config["mode"] == "async":
+        test = LoadTestAsync(attack_target=config["target"], finish_detector="",
+                             request_rate=config["rate"] * share,
+                             concurrent=max(1, round(config["concurrent"] * share)))
+    else:
+        test = LoadTestThread(attack_target=config["target"], finish_detector="",
+                              request_rate=config["rate"] * share,
+                              workers=max(1, round(config["workers"] * share)))
+
+    # Tüm worker'lar aynı anda başlasın; saniye başı throughput kovaları hizalı olur
+    delay = config.get("start_at", 0) - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+    def _watch_stop():
+        duration = config.get("duration") or None
+        stop_event.wait(duration)
+        test.running = False
+
+    threading.Thread(target=_watch_stop, daemon=True).start()
+
+    if isinstance(test, LoadTestThread):
+        test.start()
+        test.wait_for_finish()
+        test.stop()
+    else:
+        test.start()
+
+    result = {"index": config["index"]}
+    if isinstance(test, LoadTestScenario):
+        result["stop_reason"] = test.stop_reason
+        result["phases"] = [stats.to_dict() for _, stats in test.phase_stats]
+        if test.stop_reason:
+            # Bir worker'ın durma koşulu tüm testi durdurur
+            stop_event.set()
+    else:
+        result["stats"] = test.stats.to_dict()
+    return result
+
+
+def _process_main(config: Dict, stop_event, results):
+    """Yerel worker process'inin giriş noktası."""
+    # Ana modül (load_test) yeniden import edilirken INFO seviyesine ayarlanmış olabilir
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        results.put(run_worker(config, stop_event))
+    except Exception as e:
+        results.put({"index": config["index"], "error": f"{type(e).__name__}: {e}"})
+
+
+# ============================================================================
+# Uzak worker kontrol kanalı (basit HTTP/JSON)
+# ============================================================================
+
+class ControlServer:
+    """
+    Uzak worker: POST /run ile gelen yapılandırmayla testi çalıştırır ve sonucu
+    cevap olarak döndürür; POST /stop çalışan testi durdurur.
+    """
+
+    def __init__(self, port: int, host: str = "0.0.0.0"):
+        self.host = host
+        self.port = port
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()  # Aynı anda tek test
+
+    def serve_forever(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: Dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._reply(200, {"status": "ok", "busy": server.lock.locked()})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path == "/stop":
+                    server.stop_event.set()
+                    self._reply(200, {"status": "stopping"})
+                    return
+                if self.path != "/run":
+                    self._reply(404, {"error": "not found"})
+                    return
+                if not server.lock.acquire(blocking=False):
+                    self._reply(409, {"error": "worker meşgul"})
+                    return
+                try:
+                    config = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    server.stop_event.clear()
+                    logger.info(f"▶️  Test başladı (worker #{config['index']}, pay={config['share']:.3f})")
+                    self._reply(200, run_worker(config, server.stop_event))
+                except Exception as e:
+                    self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+                finally:
+                    server.lock.release()
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        logger.info(f"🛰️  Load worker kontrol kanalı: http://{self.host}:{self.port}")
+        httpd.serve_forever()
+
+
+def _run_remote(address: str, config: Dict, results: "queue.Queue"):
+    """Uzak worker'a testi başlatır ve sonucunu bekler."""
+    try:
+        response = requests.post(f"http://{address}/run", json=config, timeout=None)
+        response.raise_for_status()
+        results.put(response.json())
+    except Exception as e:
+        results.put({"index": config["index"], "error": f"{address}: {e}"})
+
+
+def _stop_remote(address: str):
+    try:
+        requests.post(f"http://{address}/stop", timeout=2)
+    except Exception as e:
+        logger.warning(f"Uzak worker durdurulamadı ({address}): {e}")
+
+
+# ============================================================================
+# Koordinatör
+# ============================================================================
+
+class Coordinator:
+    """Yerel process'leri ve uzak worker'ları başlatır, durdurur ve sonuçları birleştirir."""
+
+    def __init__(self, base_config: Dict, processes: int, remote_workers: Optional[List[str]] = None,
+                 finish_detector: str = ""):
+        self.base_config = base_config
+        self.processes = processes
+        self.remote_workers = remote_workers or []
+        self.finish_detector = finish_detector
+        self.requests_to_finish = 0
+        self.results: List[Dict] = []
+
+    def _configs(self) -> List[Dict]:
+        total = self.processes + len(self.remote_workers)
+        start_at = time.time() + START_SLACK + (START_SLACK if self.remote_workers else 0)
+        return [{**self.base_config, "index": i, "share": 1.0 / total, "start_at": start_at}
+                for i in range(total)]
+
+    def run(self) -> List[Dict]:
+        """Testi çalıştırır; her worker'ın sonuç sözlüğünü döndürür."""
+        ctx = multiprocessing.get_context("spawn")
+        stop_event = ctx.Event()
+        process_results = ctx.Queue()
+        remote_results: "queue.Queue" = queue.Queue()
+
+        configs = self._configs()
+        procs = [ctx.Process(target=_process_main, args=(cfg, stop_event, process_results), daemon=True)
+                 for cfg in configs[:self.processes]]
+        remotes = [threading.Thread(target=_run_remote, args=(addr, cfg, remote_results), daemon=True)
+                   for addr, cfg in zip(self.remote_workers, configs[self.processes:])]
+        for worker in procs + remotes:
+            worker.start()
+        logger.info(f"🚀 {len(procs)} yerel process, {len(remotes)} uzak worker başlatıldı")
+
+        remotes_stopped = False
+        try:
+            while any(w.is_alive() for w in procs + remotes):
+                if not stop_event.is_set() and self._finish_detected():
+                    stop_event.set()
+                if stop_event.is_set() and not remotes_stopped:
+                    for addr in self.remote_workers:
+                        _stop_remote(addr)
+                    remotes_stopped = True
+                # Process'ler bitmeden kuyruğu boşalt (büyük sonuçlar pipe'ı doldurabilir)
+                self._drain(process_results)
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            logger.info("⌨️  Kullanıcı tarafından durduruldu")
+            stop_event.set()
+            for addr in self.remote_workers:
+                _stop_remote(addr)
+            for worker in procs + remotes:
+                worker.join(timeout=10)
+
+        self._drain(process_results)
+        self._drain(remote_results)
+        for result in self.results:
+            if "error" in result:
+                logger.error(f"❌ Worker #{result['index']} hatası: {result['error']}")
+        return self.results
+
+    def _drain(self, results):
+        while True:
+            try:
+                self.results.append(results.get_nowait())
+            except queue.Empty:
+                return
+
+    def _finish_detected(self) -> bool:
+        """Bitiş node'u cevap verdi mi? (tek process'li moddaki /ping algılaması)"""
+        if not self.finish_detector:
+            return False
+        try:
+            if requests.get(f"{self.finish_detector}/ping", timeout=0.5).status_code == 200:
+                self.requests_to_finish += 1
+                logger.info("🛑 BITIŞE ULAŞILDI! Test otomatik sonlanıyor...")
+                return True
+        except Exception as e:
+            logger.debug(f"  Detector: {e}")
+        return False
+
+
+def merge_stats(results: List[Dict]) -> RunStats:
+    """Worker sonuçlarındaki histogramları tek RunStats'ta birleştirir."""
+    merged = RunStats()
+    for result in results:
+        if "stats" in result:
+            merged.merge(RunStats.from_dict(result["stats"]))
+    return merged
+
+
+def merge_phases(results: List[Dict]) -> List[RunStats]:
+    """Senaryo modunda worker sonuçlarını faz faz birleştirir."""
+    merged: List[RunStats] = []
+    for result in results:
+        for i, phase in enumerate(result.get("phases", [])):
+            if i == len(merged):
+                merged.append(RunStats())
+            merged[i].merge(RunStats.from_dict(phase))
+    return merged
+
+
+def print_worker_summary(results: List[Dict]):
+    """Worker başına hız ve p99; tek bir üretecin doyduğunu fark etmek için."""
+    for result in sorted(results, key=lambda r: r["index"]):
+        if "error" in result:
+            continue
+        stats = merge_stats([result])
+        for phase in result.get("phases", []):
+            stats.merge(RunStats.from_dict(phase))
+        latency = stats.latency.summary()
+        print(f"👷 worker #{result['index']:<3} {stats.sent + stats.failed:>8} istek  "
+              f"p99={latency['p99']:.1f} ms  max={latency['max']:.1f} ms")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="DiNC uzak load worker")
+    parser.add_argument("--listen", type=int, default=9000, help="Kontrol kanalı portu")
+    parser.add_argument("--host", type=str, default="0.0.0.0", help="Dinlenecek adres")
+    args = parser.parse_args()
+    ControlServer(args.listen, args.host).serve_forever()
@@ -0,0 +1,138 @@
+"""
+src/load_failover.py - Trafik sürerken registry kesintisini ve node'ların A_M_R'a
+geçiş (failover) / geri dönüş (failback) sürelerini ölçer.
+
+Registry ve her node'un /failover endpoint'i aralıklarla sorgulanır. Failover
+süresi, registry'nin cevap vermediğinin ilk görüldüğü andan node'un p2p moduna
+geçtiğinin ilk görüldüğü ana kadar geçen süredir; failback süresi de registry'nin
+geri geldiği andan node'un registry moduna dönüşüne kadar. Ölçüm çözünürlüğü
+sorgu aralığı kadardır. İsteğe bağlı komutlar registry'yi belirlenen anlarda
+durdurup başlatır.
+
+Senaryo dosyasında:
+  "failover": {"registry": "http://localhost:8000", "interval": 0.5,
+               "down_at": 30, "down_cmd": "pkill -STOP -x registry",
+               "up_at": 90, "up_cmd": "pkill -CONT -x registry"}
+nodes verilmezse senaryonun hedefleri izlenir.
+"""
+import asyncio
+import time
+import logging
+from typing import Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class FailoverMonitor:
+    """Registry'yi ve node modlarını izler; kesinti başına geçiş sürelerini hesaplar."""
+
+    def __init__(self, spec: Dict, targets: List[str]):
+        self.registry = spec["registry"].rstrip("/")
+        self.registry_path = spec.get("registry_path", "/nodes")
+        self.nodes = [n.rstrip("/") for n in (spec.get("nodes") or targets)]
+        self.interval = float(spec.get("interval", 0.5))
+        self.timeout = float(spec.get("timeout", 1.0))
+        self.actions = sorted(
+            (float(spec[f"{name}_at"]), name, spec.get(f"{name}_cmd"))
+            for name in ("down", "up") if f"{name}_at" in spec
+        )
+        self.registry_up: Optional[bool] = None
+        self.outages: List[Dict] = []  # [{"down": t, "up": t veya None}]
+        self.modes: Dict[str, str] = {}
+        self.switches: Dict[str, List] = {node: [] for node in self.nodes}  # node -> [(t, mod)]
+
+    async def _run_action(self, name: str, cmd: Optional[str]):
+        if not cmd:
+            logger.info(f"⏰ Registry {name} anı (komut yok, dışarıdan bekleniyor)")
+            return
+        logger.warning(f"⚡ Registry {name}: {cmd}")
+        proc = await asyncio.create_subprocess_shell(cmd)
+        await proc.wait()
+
+    async def _probe_registry(self, session) -> bool:
+        """5xx dışındaki her cevap registry'nin ayakta olduğunu gösterir."""
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with session.get(f"{self.registry}{self.registry_path}", timeout=timeout) as response:
+                await response.read()
+                return response.status < 500
+        except Exception:
+            return False
+
+    async def _probe_node(self, session, node: str) -> Optional[str]:
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with session.get(f"{node}/failover", timeout=timeout) as response:
+                if response.status != 200:
+                    return None
+                return (await response.json()).get("mode")
+        except Exception:
+            return None
+
+    async def run(self, started_at: float, is_running):
+        """is_running() False dönene kadar izler; zamanlar started_at'e göredir (saniye)."""
+        actions = list(self.actions)
+        async with aiohttp.ClientSession() as session:
+            while is_running():
+                t = time.monotonic() - started_at
+                while actions and actions[0][0] <= t:
+                    _, name, cmd = actions.pop(0)
+                    await self._run_action(name, cmd)
+
+                up, *modes = await asyncio.gather(self._probe_registry(session),
+                                                  *(self._probe_node(session, n) for n in self.nodes))
+                t = time.monotonic() - started_at
+                if up != self.registry_up:
+                    if up is False:
+                        self.outages.append({"down": t, "up": None})
+                        logger.warning(f"🔴 Registry cevap vermiyor (t={t:.1f}s)")
+                    elif self.registry_up is False:
+                        self.outages[-1]["up"] = t
+                        logger.info(f"🟢 Registry geri geldi (t={t:.1f}s)")
+                    self.registry_up = up
+                for node, mode in zip(self.nodes, modes):
+                    if mode and mode != self.modes.get(node):
+                        if node in self.modes:
+                            self.switches[node].append((t, mode))
+                            logger.info(f"🔁 {node}: {mode} (t={t:.1f}s)")
+                        self.modes[node] = mode
+                await asyncio.sleep(self.interval)
+
+    def _first_switch(self, node: str, mode: str, after: float, before: Optional[float]) -> Optional[float]:
+        for t, m in self.switches[node]:
+            if m == mode and t >= after and (before is None or t < before):
+                return t
+        return None
+
+    def summary(self) -> List[Dict]:
+        """Kesinti başına registry zamanları ve node başına failover/failback süreleri."""
+        result = []
+        for i, outage in enumerate(self.outages):
+            next_down = self.outages[i + 1]["down"] if i + 1 < len(self.outages) else None
+            nodes = {}
+            for node in self.nodes:
+                p2p_at = self._first_switch(node, "p2p", outage["down"], outage["up"] or next_down)
+                back_at = (self._first_switch(node, "registry", outage["up"], next_down)
+                           if outage["up"] is not None else None)
+                nodes[node] = {
+                    "failover_s": round(p2p_at - outage["down"], 2) if p2p_at is not None else None,
+                    "failback_s": round(back_at - outage["up"], 2) if back_at is not None else None,
+                }
+            result.append({"registry_down": round(outage["down"], 2),
+                           "registry_up": round(outage["up"], 2) if outage["up"] is not None else None,
+                           "nodes": nodes})
+        return result
+
+    def print_report(self):
+        print("🔁 Registry kesintileri:")
+        if not self.outages:
+            print("     (registry kesintisi görülmedi)")
+        for outage in self.summary():
+            up = f"{outage['registry_up']:.1f}s" if outage["registry_up"] is not None else "-"
+            print(f"     düştü t={outage['registry_down']:.1f}s, döndü t={up}")
+            for node, times in outage["nodes"].items():
+                failover = f"{times['failover_s']:.1f}s" if times["failover_s"] is not None else "-"
+                failback = f"{times['failback_s']:.1f}s" if times["failback_s"] is not None else "-"
+                print(f"     {node:<28} failover {failover:>7}   failback {failback:>7}")
@@ -0,0 +1,244 @@
+"""
+src/load_scenario.py - Senaryo dosyasıyla tanımlanan load test profilleri.
+Bir senaryo art arda çalışan fazlardan (ramp, step, spike, soak), ağırlıklı
+hedef/endpoint listelerinden ve hata oranı/gecikme tabanlı durma koşullarından oluşur.
+
+Örnek (JSON):
+{
+  "targets":   [{"url": "http://localhost:8081", "weight": 3},
+                {"url": "http://localhost:8082", "weight": 1}],
+  "endpoints": [{"path": "/", "weight": 9}, {"path": "/load", "weight": 1}],
+  "concurrent": 200,
+  "stop": {"error_rate": 0.05, "p99_ms": 2000, "window": 5, "min_requests": 50},
+  "failover": {"registry": "http://localhost:8000", "down_at": 30, "up_at": 90},
+  "phases": [
+    {"name": "ısınma", "type": "ramp",  "from": 10, "to": 200, "duration": 30},
+    {"type": "step",  "from": 200, "to": 1000, "step": 200, "step_duration": 15},
+    {"type": "spike", "rate": 100, "spike_rate": 1500, "at": 10, "spike_duration": 5, "duration": 30},
+    {"type": "soak",  "rate": 150, "duration": 600}
+  ]
+}
+"""
+import bisect
+import itertools
+import json
+import math
+import random
+from collections import deque
+from typing import Dict, List, Optional
+
+from load_stats import LatencyHistogram
+
+
+class Phase:
+    """Bir senaryo fazı: süre boyunca hedef istek hızını (req/sn) tanımlar."""
+
+    type = "soak"
+
+    def __init__(self, spec: Dict):
+        self.spec = spec
+        self.name = spec.get("name", self.type)
+        self.duration = float(spec["duration"])
+
+    def rate_at(self, t: float) -> float:
+        """Faz başından t saniye sonraki hedef hız."""
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return self.type
+
+
+class SoakPhase(Phase):
+    """Sabit hız (uzun süreli dayanıklılık testi)."""
+
+    type = "soak"
+
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self.rate = float(spec["rate"])
+
+    def rate_at(self, t: float) -> float:
+        return self.rate
+
+    def describe(self) -> str:
+        return f"{self.rate:g} req/s"
+
+
+class RampPhase(Phase):
+    """from'dan to'ya doğrusal artış (veya azalış)."""
+
+    type = "ramp"
+
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self.start = float(spec["from"])
+        self.end = float(spec["to"])
+
+    def rate_at(self, t: float) -> float:
+        return self.start + (self.end - self.start) * min(1.0, t / self.duration)
+
+    def describe(self) -> str:
+        return f"{self.start:g}→{self.end:g} req/s"
+
+
+class StepPhase(Phase):
+    """from'dan to'ya step_duration'da bir step kadar artan merdiven."""
+
+    type = "step"
+
+    def __init__(self, spec: Dict):
+        self.start = float(spec["from"])
+        self.end = float(spec["to"])
+        self.step = float(spec["step"])
+        self.step_duration = float(spec["step_duration"])
+        steps = int(math.floor((self.end - self.start) / self.step)) + 1
+        super().__init__({"duration": steps * self.step_duration, **spec})
+
+    def rate_at(self, t: float) -> float:
+        return min(self.end, self.start + self.step * int(t // self.step_duration))
+
+    def describe(self) -> str:
+        return f"{self.start:g}→{self.end:g} (+{self.step:g}/{self.step_duration:g}s)"
+
+
+class SpikePhase(Phase):
+    """Taban hızda çalışırken at saniyesinde spike_duration boyunca spike_rate'e sıçrar."""
+
+    type = "spike"
+
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self.rate = float(spec["rate"])
+        self.spike_rate = float(spec["spike_rate"])
+        self.at = float(spec.get("at", 0))
+        self.spike_duration = float(spec["spike_duration"])
+
+    def rate_at(self, t: float) -> float:
+        if self.at <= t < self.at + self.spike_duration:
+            return self.spike_rate
+        return self.rate
+
+    def describe(self) -> str:
+        return f"{self.rate:g} req/s, {self.spike_rate:g} @{self.at:g}s/{self.spike_duration:g}s"
+
+
+PHASE_TYPES = {cls.type: cls for cls in (SoakPhase, RampPhase, StepPhase, SpikePhase)}
+
+
+def make_phase(spec: Dict) -> Phase:
+    """Faz tanımından Phase nesnesi oluşturur ("constant" = "soak")."""
+    kind = spec.get("type", "soak")
+    if kind == "constant":
+        kind = "soak"
+    if kind not in PHASE_TYPES:
+        raise ValueError(f"Bilinmeyen faz tipi: {kind} (seçenekler: {', '.join(PHASE_TYPES)})")
+    return PHASE_TYPES[kind](spec)
+
+
+class WeightedChoice:
+    """Ağırlıklı rastgele seçim (kümülatif ağırlık + bisect)."""
+
+    def __init__(self, items: List, weights: List[float], rng: random.Random):
+        if not items:
+            raise ValueError("Boş seçim listesi")
+        self.items = items
+        self.cumulative = list(itertools.accumulate(weights))
+        self.rng = rng
+
+    def pick(self):
+        return self.items[bisect.bisect_right(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+
+class StopCondition:
+    """
+    Son window saniyedeki hata oranı veya p99 eşiği aşarsa testi durdurur.
+    Hata: bağlantı hatası ya da 5xx cevap.
+    """
+
+    def __init__(self, error_rate: Optional[float] = None, p99_ms: Optional[float] = None,
+                 window: int = 5, min_requests: int = 50):
+        self.error_rate = error_rate
+        self.p99_ms = p99_ms
+        self.window = window
+        self.min_requests = min_requests
+        self._buckets = deque()  # (saniye, histogram, toplam, hata)
+
+    def record(self, second: int, latency: float, error: bool):
+        """Tamamlanan isteği ilgili saniyenin kovasına ekler."""
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, LatencyHistogram(), 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1].record(latency)
+        bucket[2] += 1
+        bucket[3] += int(error)
+
+    def check(self, now_second: int) -> Optional[str]:
+        """Eşik aşıldıysa nedeni döndürür, aşılmadıysa None."""
+        while self._buckets and self._buckets[0][0] <= now_second - self.window:
+            self._buckets.popleft()
+        total = sum(b[2] for b in self._buckets)
+        if total < self.min_requests:
+            return None
+
+        errors = sum(b[3] for b in self._buckets)
+        if self.error_rate is not None and errors / total > self.error_rate:
+            return f"hata oranı %{errors / total * 100:.1f} > %{self.error_rate * 100:.1f} (son {self.window}s)"
+        if self.p99_ms is not None:
+            merged = LatencyHistogram()
+            for bucket in self._buckets:
+                merged.merge(bucket[1])
+            p99 = merged.percentile(99)
+            if p99 > self.p99_ms:
+                return f"p99 {p99:.0f} ms > {self.p99_ms:.0f} ms (son {self.window}s)"
+        return None
+
+
+class Scenario:
+    """Yüklenmiş senaryo: fazlar, hedefler, endpoint'ler ve durma koşulu."""
+
+    def __init__(self, spec: Dict, rng: Optional[random.Random] = None, share: float = 1.0):
+        """
+        Args:
+            share: Bu yük üretecinin payı (çok process'li modda 1/N); faz hızları
+                ve concurrency bu oranla ölçeklenir.
+        """
+        self.spec = spec
+        self.rng = rng or random.Random()
+        self.share = share
+        self.phases = [make_phase(p) for p in spec["phases"]]
+
+        targets = spec.get("targets", [{"url": "http://localhost:8081"}])
+        targets = [{"url": t} if isinstance(t, str) else t for t in targets]
+        self.targets = WeightedChoice([t["url"].rstrip("/") for t in targets],
+                                      [float(t.get("weight", 1)) for t in targets], self.rng)
+
+        endpoints = spec.get("endpoints", [{"path": "/"}])
+        endpoints = [{"path": e} if isinstance(e, str) else e for e in endpoints]
+        self.endpoints = WeightedChoice([e["path"] for e in endpoints],
+                                        [float(e.get("weight", 1)) for e in endpoints], self.rng)
+
+        self.concurrent = max(1, int(round(int(spec.get("concurrent", 100)) * share)))
+        self.timeout = float(spec.get("timeout", 2.0))
+        stop = spec.get("stop", {})
+        self.stop = StopCondition(stop.get("error_rate"), stop.get("p99_ms"),
+                                  int(stop.get("window", 5)),
+                                  max(1, int(int(stop.get("min_requests", 50)) * share)))
+        # Registry kesintisi ölçümü (bkz. load_failover.py); None = kapalı
+        self.failover = spec.get("failover")
+
+    @classmethod
+    def load(cls, path: str) -> "Scenario":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def rate_at(self, phase: Phase, t: float) -> float:
+        """Fazın t anındaki hızının bu yük üretecine düşen kısmı."""
+        return phase.rate_at(t) * self.share
+    
+    def next_url(self) -> str:
+        """Ağırlıklara göre bir sonraki isteğin URL'i."""
+        return self.targets.pick() + self.endpoints.pick()
+
+    @property
+    def duration(self) -> float:
+        return sum(p.duration for p in self.phases)
@@ -0,0 +1,226 @@
+"""
+src/load_stats.py - Load test ölçümleri: HDR tarzı gecikme histogramı ve koşu istatistikleri.
+Histogram sabit göreli hassasiyetle (≈%0.8) kovalara sayar; birleştirilebilir ve
+JSON'a yazılabilir, böylece farklı koşular/process'ler karşılaştırılabilir.
+"""
+import json
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+SUB_BUCKET_BITS = 7                      # Her 2'nin kuvveti aralığı 64 kovaya bölünür
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+SHED_STATUSES = ("429", "503")  # Node'un kabul kontrolüyle bilerek reddettiği istekler
+
+
+def _bucket_index(value: int) -> int:
+    """Değerin (µs) kova indeksini döndürür."""
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + ((value >> shift) - SUB_BUCKET_HALF)
+
+
+def _bucket_value(index: int) -> int:
+    """Kovanın temsil ettiği en yüksek değeri (µs) döndürür."""
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift = (index - SUB_BUCKET_COUNT) // SUB_BUCKET_HALF + 1
+    top = (index - SUB_BUCKET_COUNT) % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Mikrosaniye çözünürlüklü, log-lineer kovalı gecikme histogramı."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float, count: int = 1):
+        """Gecikmeyi (saniye) kaydeder."""
+        value = max(0, int(seconds * 1_000_000))
+        self.counts[_bucket_index(value)] += count
+        self.total += count
+        self.sum_us += value * count
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Başka bir histogramı bununla birleştirir."""
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, pct: float) -> float:
+        """Yüzdelik değeri milisaniye olarak döndürür."""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(round(pct / 100.0 * self.total)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_bucket_value(index), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self) -> Dict[str, float]:
+        """Ortalama, yüzdelikler ve maksimum (ms)."""
+        result = {"count": self.total,
+                  "mean": round(self.sum_us / self.total / 1000.0, 3) if self.total else 0.0}
+        for pct in PERCENTILES:
+            result[f"p{pct:g}".replace(".", "")] = round(self.percentile(pct), 3)
+        result["max"] = round(self.max_us / 1000.0, 3)
+        return result
+
+    def to_dict(self) -> Dict:
+        return {"counts": {str(k): v for k, v in self.counts.items()},
+                "total": self.total, "sum_us": self.sum_us, "max_us": self.max_us}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = Counter({int(k): v for k, v in data.get("counts", {}).items()})
+        histogram.total = data.get("total", 0)
+        histogram.sum_us = data.get("sum_us", 0)
+        histogram.max_us = data.get("max_us", 0)
+        return histogram
+
+
+class RunStats:
+    """
+    Bir load test koşusunun sonuçları.
+    latency: planlanan gönderim zamanından cevaba kadar (coordinated omission düzeltilmiş)
+    service: isteğin gerçekten gönderildiği andan cevaba kadar
+    goodput: planlanan zamandan itibaren slo_ms içinde başarıyla (2xx/3xx) biten istekler;
+        doyma noktasının ötesinde ham throughput artarken bu sayı çökebilir
+    """
+
+    slo_ms = 1000.0  # Goodput için gecikme hedefi (load_test.py --slo-ms)
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.status: Counter = Counter()       # "200", "307", "error:Timeout" ...
+        self.throughput: Counter = Counter()   # Başlangıçtan itibaren saniye -> tamamlanan
+        self.goodput: Counter = Counter()      # Başlangıçtan itibaren saniye -> SLO içinde başarılı
+        self.served_by: Counter = Counter()    # Yönlendirmeden sonra isteği karşılayan node'lar
+        self.redirects = 0
+        self.redirected = 0                    # En az bir kez yönlendirilen/iletilen istekler
+        self.sent = 0
+        self.failed = 0
+        self.good = 0
+        self.shed = 0                          # 429/503: hızlı ret (yük atma)
+        self.started_at: Optional[float] = None
+        self.elapsed = 0.0
+
+    def begin(self):
+        self.started_at = time.monotonic()
+
+    def finish(self):
+        self.elapsed = time.monotonic() - self.started_at
+
+    def record(self, intended: float, sent: float, finished: float, status: str, failed: bool = False):
+        """Tek bir isteğin sonucunu kaydeder (zamanlar time.monotonic())."""
+        self.latency.record(finished - intended)
+        self.service.record(finished - sent)
+        self.status[status] += 1
+        second = int(finished - self.started_at)
+        self.throughput[second] += 1
+        if failed:
+            self.failed += 1
+            return
+        self.sent += 1
+        if status in SHED_STATUSES:
+            self.shed += 1
+        elif status[:1] in ("2", "3") and (finished - intended) * 1000 <= self.slo_ms:
+            self.good += 1
+            self.goodput[second] += 1
+
+    def merge(self, other: "RunStats"):
+        """Başka bir koşunun (ör. başka bir process'in) sonuçlarını ekler."""
+        self.latency.merge(other.latency)
+        self.service.merge(other.service)
+        self.status.update(other.status)
+        self.throughput.update(other.throughput)
+        self.goodput.update(other.goodput)
+        self.served_by.update(other.served_by)
+        self.redirects += other.redirects
+        self.redirected += other.redirected
+        self.sent += other.sent
+        self.failed += other.failed
+        self.good += other.good
+        self.shed += other.shed
+        self.slo_ms = other.slo_ms
+        self.elapsed = max(self.elapsed, other.elapsed)
+
+    def to_dict(self) -> Dict:
+        return {
+            "elapsed": round(self.elapsed, 3),
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate": round(self.sent / self.elapsed, 2) if self.elapsed else 0.0,
+            "slo_ms": self.slo_ms,
+            "good": self.good,
+            "goodput_rate": round(self.good / self.elapsed, 2) if self.elapsed else 0.0,
+            "shed": self.shed,
+            "redirects": self.redirects,
+            "redirected": self.redirected,
+            "served_by": dict(self.served_by),
+            "status": dict(self.status),
+            "throughput": {str(k): v for k, v in sorted(self.throughput.items())},
+            "goodput": {str(k): v for k, v in sorted(self.goodput.items())},
+            "latency_ms": self.latency.summary(),
+            "service_ms": self.service.summary(),
+            "histograms": {"latency": self.latency.to_dict(), "service": self.service.to_dict()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RunStats":
+        stats = cls()
+        stats.elapsed = data.get("elapsed", 0.0)
+        stats.sent = data.get("sent", 0)
+        stats.failed = data.get("failed", 0)
+        stats.good = data.get("good", 0)
+        stats.shed = data.get("shed", 0)
+        stats.slo_ms = data.get("slo_ms", cls.slo_ms)
+        stats.redirects = data.get("redirects", 0)
+        stats.redirected = data.get("redirected", 0)
+        stats.served_by = Counter(data.get("served_by", {}))
+        stats.status = Counter(data.get("status", {}))
+        stats.throughput = Counter({int(k): v for k, v in data.get("throughput", {}).items()})
+        stats.goodput = Counter({int(k): v for k, v in data.get("goodput", {}).items()})
+        histograms = data.get("histograms", {})
+        stats.latency = LatencyHistogram.from_dict(histograms.get("latency", {}))
+        stats.service = LatencyHistogram.from_dict(histograms.get("service", {}))
+        return stats
+
+    def write_json(self, path: str, **meta):
+        """Sonuçları (ve koşu parametrelerini) JSON dosyasına yazar."""
+        with open(path, "w") as f:
+            json.dump({**meta, **self.to_dict()}, f, indent=2)
+
+    def print_report(self):
+        """Gecikme yüzdelikleri, durum kodları ve saniye başı throughput'u yazdırır."""
+        for label, histogram in (("Gecikme (planlanan)", self.latency), ("Servis süresi", self.service)):
+            s = histogram.summary()
+            print(f"⏲️  {label:<20} p50={s['p50']:.1f}  p90={s['p90']:.1f}  p99={s['p99']:.1f}  "
+                  f"p999={s['p999']:.1f}  max={s['max']:.1f} ms")
+        print("🔢 Durum kodları: " + ", ".join(f"{k}={v}" for k, v in sorted(self.status.items())))
+        total = self.sent + self.failed
+        if total:
+            print(f"🎯 Goodput (≤{self.slo_ms:g} ms, 2xx/3xx): {self.good} (%{self.good / total * 100:.1f})  "
+                  f"yük atma (429/503): {self.shed} (%{self.shed / total * 100:.1f})")
+        if self.throughput:
+            last = max(self.throughput) + 1
+            for label, counter in (("Saniye başı", self.throughput), ("Goodput/sn", self.goodput)):
+                per_second = [counter.get(sec, 0) for sec in range(last)]
+                print(f"📈 {label:<12} min={min(per_second)} ort={sum(per_second) / len(per_second):.1f} "
+                      f"max={max(per_second)}  [{' '.join(str(n) for n in per_second[:30])}"
+                      f"{' ...' if len(per_second) > 30 else ''}]")
@@ -2,16 +2,32 @@
 src/load_test.py - Otomatik Load Test Orchestrator (Async + Thread Hybrid)
 8081'e istek atar, 8082 tarafında bir paket geldiğinde otomatik durur.
 
+İstekler açık döngüyle (sabit varış hızı) gönderilir: i. istek başlangıçtan
+i/rate saniye sonra planlanır ve önceki isteklerin bitmesini beklemez.
+Gecikme planlanan zamandan ölçülür; yük üreteci geride kalsa bile
+(coordinated omission) kuyrukta bekleme süresi gizlenmez.
+
 Kullanım:
   python3 src/load_test.py --rate 50 --mode async
   python3 src/load_test.py --rate 50 --mode thread
+  python3 src/load_test.py --rate 200 --duration 30 --json results/run1.json
+  python3 src/load_test.py --scenario src/scenarios/saturation.json --json results/sat.json
+  python3 src/load_test.py --scenario src/scenarios/saturation.json --slo-ms 500
+  python3 src/load_test.py --rate 4000 --processes 4 --duration 30
+  python3 src/load_test.py --scenario src/scenarios/registry_failover.json
 """
 import requests
 import threading
 import time
 import logging
 import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlsplit
+
+from load_stats import RunStats, SHED_STATUSES
+from load_scenario import Scenario
 
 # Async mode için aiohttp'i isteğe bağlı yükle
 try:
@@ -26,6 +42,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def print_redirect_distribution(redirects, served_by):
+    """Yönlendirilen isteklerin hangi node'lara dağıldığını yazdırır."""
+    print(f"↪️  Toplam yönlendirme: {redirects}")
+    total = sum(served_by.values())
+    for node, count in served_by.most_common():
+        print(f"     {node:<28} {count:>8} ({count / total * 100:5.1f}%)")
+
+
+def print_report(title, stats, requests_to_finish):
+    """Ortak test raporunu yazdırır."""
+    print()
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    print(f"⏱️  Süre: {stats.elapsed:.2f} saniye")
+    print(f"📤 8081'e gönderilen istekler: {stats.sent}")
+    print(f"❌ Başarısız istekler: {stats.failed}")
+    print(f"📥 8082'den algılanan paketler: {requests_to_finish}")
+    print(f"📊 Ortalama hız: {stats.sent / stats.elapsed if stats.elapsed > 0 else 0:.2f} req/sec")
+    stats.print_report()
+    print_redirect_distribution(stats.redirects, stats.served_by)
+    print("=" * 60)
+    print()
+
+
 class LoadTestThread:
     """Thread tabanlı load test (yüksek concurrency için)."""
     
@@ -38,54 +79,61 @@ class LoadTestThread:
         self.workers = workers
         
         self.running = False
-        self.requests_sent = 0
-        self.requests_failed = 0
         self.requests_to_finish = 0
-        self.start_time = None
+        self.stats = RunStats()
         self.threads = []
         self.lock = threading.Lock()
+        self._local = threading.local()  # Worker başına keep-alive oturum
     
-    def send_request(self):
-        """Tek bir isteği gönder."""
+    def send_request(self, intended, slot):
+        """Tek bir isteği gönder ve planlanan zamana göre gecikmesini kaydet."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        sent = time.monotonic()
         try:
-            response = requests.get(self.attack_target, timeout=2)
+            response = session.get(self.attack_target, timeout=2)
+            finished = time.monotonic()
             with self.lock:
-                self.requests_sent += 1
-            logger.debug(f"  ➜ Istek #{self.requests_sent}: {response.status_code}")
+                self.stats.record(intended, sent, finished, str(response.status_code))
+                if response.history:
+                    self.stats.redirects += len(response.history)
+                    self.stats.redirected += 1
+                    self.stats.served_by[urlsplit(response.url).netloc] += 1
+            logger.debug(f"  ➜ Istek: {response.status_code}")
         except Exception as e:
+            finished = time.monotonic()
             with self.lock:
-                self.requests_failed += 1
+                self.stats.record(intended, sent, finished, f"error:{type(e).__name__}", failed=True)
             logger.debug(f"  ✗ Istek hatası: {e}")
-    
-    def worker_loop(self, requests_per_worker):
-        """Her worker belirli sayıda istek gönderir."""
-        for _ in range(requests_per_worker):
-            if not self.running:
-                break
-            self.send_request()
+        finally:
+            slot.release()
     
     def attack_loop(self):
-        """Periyodik olarak worker thread'ler oluştur."""
+        """Her isteği planlanan zamanında havuza verir (sabit varış hızı)."""
         logger.info(f"🎯 Attack başladı: {self.attack_target} ({self.request_rate} req/sec, {self.workers} workers)")
         
-        while self.running:
-            requests_per_worker = max(1, self.request_rate // self.workers)
-            
-            # Worker thread'ler oluştur
-            worker_threads = []
-            for _ in range(self.workers):
-                t = threading.Thread(target=self.worker_loop, args=(requests_per_worker,), daemon=True)
-                t.start()
-                worker_threads.append(t)
-            
-            # Tüm worker'ları bekle
-            for t in worker_threads:
-                t.join(timeout=1.0)
-            
-            time.sleep(1.0)
+        slot = threading.BoundedSemaphore(self.workers)
+        interval = 1.0 / self.request_rate
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="load") as pool:
+            index = 0
+            while self.running:
+                intended = self.stats.started_at + index * interval
+                delay = intended - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                # Tüm worker'lar meşgulse bekle; bekleme süresi gecikmeye dahil olur
+                while self.running and not slot.acquire(timeout=0.1):
+                    pass
+                if not self.running:
+                    break
+                pool.submit(self.send_request, intended, slot)
+                index += 1
     
     def detect_finish(self):
         """8082'den paket algılaması yapıyor."""
+        if not self.finish_detector:
+            return
         logger.info(f"🔍 Finish detector başladı: {self.finish_detector}")
         
         while self.running:
@@ -113,10 +161,9 @@ class LoadTestThread:
             return
         
         self.running = True
-        self.requests_sent = 0
-        self.requests_failed = 0
         self.requests_to_finish = 0
-        self.start_time = time.time()
+        self.stats = RunStats()
+        self.stats.begin()
         
         # Threads'i başlat
         attack_thread = threading.Thread(target=self.attack_loop, daemon=True)
@@ -141,23 +188,11 @@ class LoadTestThread:
         self.running = False
         for t in self.threads:
             t.join(timeout=2)
+        self.stats.finish()
     
     def report(self):
         """Test raporunu yazdır."""
-        elapsed = time.time() - self.start_time
-        rate = self.requests_sent / elapsed if elapsed > 0 else 0
-        
-        print()
-        print("=" * 60)
-        print("TEST RAPORU (THREAD MODE)")
-        print("=" * 60)
-        print(f"⏱️  Süre: {elapsed:.2f} saniye")
-        print(f"📤 8081'e gönderilen istekler: {self.requests_sent}")
-        print(f"❌ Başarısız istekler: {self.requests_failed}")
-        print(f"📥 8082'den algılanan paketler: {self.requests_to_finish}")
-        print(f"📊 Ortalama hız: {rate:.2f} req/sec")
-        print("=" * 60)
-        print()
+        print_report("TEST RAPORU (THREAD MODE)", self.stats, self.requests_to_finish)
 
 
 class LoadTestAsync:
@@ -175,50 +210,59 @@ class LoadTestAsync:
         self.concurrent = concurrent
         
         self.running = False
-        self.requests_sent = 0
-        self.requests_failed = 0
         self.requests_to_finish = 0
-        self.start_time = None
-        self.lock = asyncio.Lock()
+        self.stats = RunStats()
     
-    async def send_request(self, session):
-        """Async isteği gönder."""
+    async def send_request(self, session, intended, slot):
+        """Async isteği gönder ve planlanan zamana göre gecikmesini kaydet."""
+        sent = time.monotonic()
         try:
             async with session.get(self.attack_target, timeout=aiohttp.ClientTimeout(total=2)) as response:
-                if response.status == 200:
-                    self.requests_sent += 1
-                    logger.debug(f"  ➜ Istek #{self.requests_sent}")
+                await response.read()
+                self.stats.record(intended, sent, time.monotonic(), str(response.status))
+                if response.history:
+                    self.stats.redirects += len(response.history)
+                    self.stats.redirected += 1
+                    self.stats.served_by[f"{response.url.host}:{response.url.port}"] += 1
         except Exception as e:
-            self.requests_failed += 1
+            self.stats.record(intended, sent, time.monotonic(), f"error:{type(e).__name__}", failed=True)
             logger.debug(f"  ✗ Istek hatası: {e}")
+        finally:
+            slot.release()
     
     async def attack_loop(self):
-        """Async attack loop - belirtilen rate'te istek gönder."""
+        """Her isteği planlanan zamanında başlatır (sabit varış hızı, açık döngü)."""
         logger.info(f"🎯 Attack başladı: {self.attack_target} ({self.request_rate} req/sec, concurrent={self.concurrent})")
         
-        async with aiohttp.ClientSession() as session:
+        slot = asyncio.Semaphore(self.concurrent)
+        interval = 1.0 / self.request_rate
+        connector = aiohttp.TCPConnector(limit=self.concurrent)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = set()
+            index = 0
             while self.running:
-                tasks = []
-                
-                # Her saniyede request_rate kadar istek oluştur
-                for _ in range(self.request_rate):
-                    if not self.running:
-                        break
-                    tasks.append(self.send_request(session))
-                    
-                    # Concurrency limitini kontrol et
-                    if len(tasks) >= self.concurrent:
-                        await asyncio.gather(*tasks)
-                        tasks = []
-                
-                # Kalan taskları bitmesini bekle
-                if tasks:
-                    await asyncio.gather(*tasks)
-                
-                await asyncio.sleep(1.0)
+                intended = self.stats.started_at + index * interval
+                delay = intended - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # Concurrency limiti doluysa bekle; bekleme süresi gecikmeye dahil olur
+                await slot.acquire()
+                if not self.running:
+                    slot.release()
+                    break
+                task = asyncio.create_task(self.send_request(session, intended, slot))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                index += 1
+            
+            # Uçuştaki isteklerin bitmesini bekle
+            if tasks:
+                await asyncio.gather(*tasks)
     
     async def detect_finish(self):
         """Async finish detection."""
+        if not self.finish_detector:
+            return
         logger.info(f"🔍 Finish detector başladı: {self.finish_detector}")
         
         async with aiohttp.ClientSession() as session:
@@ -241,10 +285,9 @@ class LoadTestAsync:
     async def start_async(self):
         """Attack ve detection'ı paralel olarak başlatır."""
         self.running = True
-        self.requests_sent = 0
-        self.requests_failed = 0
         self.requests_to_finish = 0
-        self.start_time = time.time()
+        self.stats = RunStats()
+        self.stats.begin()
         
         logger.info("=" * 60)
         logger.info("TEST BAŞLATILDI (ASYNC MODE)")
@@ -255,6 +298,7 @@ class LoadTestAsync:
             self.attack_loop(),
             self.detect_finish()
         )
+        self.stats.finish()
     
     def start(self):
         """Async event loop'unu başlat."""
@@ -262,21 +306,185 @@ class LoadTestAsync:
     
     def report(self):
         """Test raporunu yazdır."""
-        elapsed = time.time() - self.start_time
-        rate = self.requests_sent / elapsed if elapsed > 0 else 0
+        print_report("TEST RAPORU (ASYNC MODE)", self.stats, self.requests_to_finish)
+
+
+class LoadTestScenario:
+    """
+    Senaryo dosyasındaki fazları sırayla çalıştırır (async, açık döngü).
+    Her faz kendi RunStats'ını tutar; durma koşulu saniyede bir kontrol edilir.
+    """
+    
+    def __init__(self, scenario: Scenario, monitor_failover: bool = True):
+        """
+        Args:
+            monitor_failover: Senaryoda "failover" varsa registry kesintisini bu process izler
+                (çok process'li modda sadece koordinatör izler)
+        """
+        if not HAS_AIOHTTP:
+            raise ImportError("Senaryo modu için 'pip install aiohttp' çalıştırın")
+        
+        self.scenario = scenario
+        self.running = False
+        self.stop_reason = None
+        self.started_at = None
+        self.phase_stats = []  # [(Phase, RunStats)]
+        self.failover = None
+        if scenario.failover and monitor_failover:
+            from load_failover import FailoverMonitor
+            self.failover = FailoverMonitor(scenario.failover, scenario.targets.items)
+    
+    @property
+    def stats(self) -> RunStats:
+        """Tüm fazların birleşik sonucu."""
+        total = RunStats()
+        for _, stats in self.phase_stats:
+            total.merge(stats)
+        total.elapsed = sum(stats.elapsed for _, stats in self.phase_stats)
+        return total
+    
+    async def send_request(self, session, url, intended, stats, slot):
+        """İsteği gönderir; sonucu fazın istatistiklerine ve durma penceresine yazar."""
+        sent = time.monotonic()
+        error = False
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.scenario.timeout)
+            async with session.get(url, timeout=timeout) as response:
+                await response.read()
+                finished = time.monotonic()
+                # 503 + Retry-After bilinçli yük atmadır; durma koşulunda hata sayılmaz
+                error = response.status >= 500 and str(response.status) not in SHED_STATUSES
+                stats.record(intended, sent, finished, str(response.status))
+                
+                # 307 zinciri ya da proxy modunda X-Served-By ile iletilen istekler
+                hops = [int(r.headers.get("X-Redirect-Count", 0)) for r in response.history]
+                if response.history or "X-Served-By" in response.headers:
+                    stats.redirected += 1
+                    stats.redirects += max(hops, default=0) or 1
+                    served_by = response.headers.get("X-Served-By") or f"{response.url.host}:{response.url.port}"
+                    stats.served_by[served_by] += 1
+        except Exception as e:
+            finished = time.monotonic()
+            error = True
+            stats.record(intended, sent, finished, f"error:{type(e).__name__}", failed=True)
+            logger.debug(f"  ✗ Istek hatası: {e}")
+        finally:
+            slot.release()
+        self.scenario.stop.record(int(finished - self.started_at), finished - intended, error)
+    
+    async def run_phase(self, session, phase, slot, tasks):
+        """Fazın hız fonksiyonuna göre istekleri planlanan zamanlarında başlatır."""
+        stats = RunStats()
+        stats.begin()
+        self.phase_stats.append((phase, stats))
+        logger.info(f"▶️  Faz: {phase.name} ({phase.describe()}, {phase.duration:g}s)")
+        
+        t = 0.0
+        while self.running and t < phase.duration:
+            rate = self.scenario.rate_at(phase, t)
+            if rate <= 0:
+                t += 0.1
+                continue
+            intended = stats.started_at + t
+            delay = intended - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await slot.acquire()
+            if not self.running:
+                slot.release()
+                break
+            task = asyncio.create_task(
+                self.send_request(session, self.scenario.next_url(), intended, stats, slot))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            t += 1.0 / rate
+        
+        # Kalan süreyi bekle (düşük hızlı fazın sonu) ve fazı kapat
+        remaining = stats.started_at + phase.duration - time.monotonic()
+        if self.running and remaining > 0:
+            await asyncio.sleep(remaining)
+        stats.finish()
+    
+    async def watch_stop(self):
+        """Durma koşulunu saniyede bir kontrol eder."""
+        while self.running:
+            await asyncio.sleep(1.0)
+            reason = self.scenario.stop.check(int(time.monotonic() - self.started_at))
+            if reason:
+                self.stop_reason = reason
+                logger.warning(f"🛑 Durma koşulu: {reason}")
+                self.running = False
+    
+    async def start_async(self):
+        self.running = True
+        self.started_at = time.monotonic()
+        logger.info("=" * 60)
+        logger.info(f"SENARYO BAŞLATILDI ({len(self.scenario.phases)} faz, {self.scenario.duration:g}s)")
+        logger.info("=" * 60)
         
+        slot = asyncio.Semaphore(self.scenario.concurrent)
+        connector = aiohttp.TCPConnector(limit=self.scenario.concurrent)
+        watcher = asyncio.create_task(self.watch_stop())
+        monitor = (asyncio.create_task(self.failover.run(self.started_at, lambda: self.running))
+                   if self.failover else None)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = set()
+            for phase in self.scenario.phases:
+                if not self.running:
+                    break
+                await self.run_phase(session, phase, slot, tasks)
+            if tasks:
+                await asyncio.gather(*tasks)
+        self.running = False
+        watcher.cancel()
+        if monitor:
+            await monitor
+    
+    def start(self):
+        asyncio.run(self.start_async())
+    
+    def report(self):
+        """Faz başına throughput, goodput, gecikme ve yönlendirilen istek oranını yazdırır."""
         print()
-        print("=" * 60)
-        print("TEST RAPORU (ASYNC MODE)")
-        print("=" * 60)
-        print(f"⏱️  Süre: {elapsed:.2f} saniye")
-        print(f"📤 8081'e gönderilen istekler: {self.requests_sent}")
-        print(f"❌ Başarısız istekler: {self.requests_failed}")
-        print(f"📥 8082'den algılanan paketler: {self.requests_to_finish}")
-        print(f"📊 Ortalama hız: {rate:.2f} req/sec")
-        print("=" * 60)
+        print("=" * 114)
+        print("SENARYO RAPORU")
+        print("=" * 114)
+        print(f"{'faz':<14} {'profil':<26} {'süre':>6} {'req/s':>8} {'good/s':>8} {'p50':>8} {'p99':>8} "
+              f"{'p999':>8} {'hata%':>6} {'atma%':>6} {'yönl.%':>7}")
+        for phase, stats in self.phase_stats:
+            total = stats.sent + stats.failed
+            errors = stats.failed + sum(v for k, v in stats.status.items()
+                                        if k[:1] == "5" and k not in SHED_STATUSES)
+            lat = stats.latency.summary()
+            print(f"{phase.name:<14} {phase.describe():<26} {stats.elapsed:>6.1f} "
+                  f"{total / stats.elapsed if stats.elapsed else 0:>8.1f} "
+                  f"{stats.good / stats.elapsed if stats.elapsed else 0:>8.1f} "
+                  f"{lat['p50']:>8.1f} {lat['p99']:>8.1f} {lat['p999']:>8.1f} "
+                  f"{errors / total * 100 if total else 0:>6.1f} "
+                  f"{stats.shed / total * 100 if total else 0:>6.1f} "
+                  f"{stats.redirected / total * 100 if total else 0:>7.1f}")
+        if self.stop_reason:
+            print(f"🛑 Erken durduruldu: {self.stop_reason}")
+        print("-" * 114)
+        total = self.stats
+        total.print_report()
+        print_redirect_distribution(total.redirects, total.served_by)
+        if self.failover:
+            self.failover.print_report()
+        print("=" * 114)
         print()
-
+    
+    def write_json(self, path: str):
+        """Faz sonuçlarını JSON dosyasına yazar."""
+        with open(path, "w") as f:
+            json.dump({
+                "recorded_at": datetime.now().isoformat(),
+                "stop_reason": self.stop_reason,
+                "phases": [{"name": phase.name, "type": phase.type, "spec": phase.spec, **stats.to_dict()}
+                           for phase, stats in self.phase_stats],
+                "total": self.stats.to_dict(),
+                "failover": self.failover.summary() if self.failover else None,
+            }, f, indent=2)
 
 
 if __name__ == "__main__":
@@ -288,13 +496,97 @@ if __name__ == "__main__":
                        help="Mode: async (yüksek perf) ya da thread (basit)")
     parser.add_argument("--workers", type=int, default=10, help="Thread mode'da worker sayısı")
     parser.add_argument("--concurrent", type=int, default=100, help="Async mode'da concurrent istek sayısı")
+    parser.add_argument("--target", type=str, default="http://localhost:8081", help="İstek atılacak adres")
+    parser.add_argument("--finish-detector", type=str, default="http://localhost:8082",
+                       help="Bitişi algılayan node ('' = kapalı)")
+    parser.add_argument("--duration", type=float, default=0, help="Test süresi (saniye, 0 = sınırsız)")
+    parser.add_argument("--json", type=str, default="", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--scenario", type=str, default="",
+                       help="Faz/hedef/durma koşulu tanımlı senaryo dosyası (JSON); --rate/--target yok sayılır")
+    parser.add_argument("--processes", type=int, default=1,
+                       help="Yük üreten process sayısı; hız ve concurrency process'lere bölünür")
+    parser.add_argument("--remote-workers", type=str, default="",
+                       help="Ek uzak worker'lar (host:port,...; bkz. src/load_dist.py --listen)")
+    parser.add_argument("--slo-ms", type=float, default=RunStats.slo_ms,
+                       help="Goodput gecikme hedefi: bu sürede biten 2xx/3xx istekler başarılı sayılır (ms)")
     args = parser.parse_args()
+    RunStats.slo_ms = args.slo_ms
+    
+    remote_workers = [w for w in args.remote_workers.split(",") if w]
+    if args.processes > 1 or remote_workers:
+        from load_dist import Coordinator, merge_stats, merge_phases, print_worker_summary
+        
+        scenario_spec = None
+        if args.scenario:
+            with open(args.scenario) as f:
+                scenario_spec = json.load(f)
+        coordinator = Coordinator(
+            {"mode": args.mode, "target": args.target, "rate": args.rate, "concurrent": args.concurrent,
+             "workers": args.workers, "duration": args.duration, "scenario": scenario_spec,
+             "slo_ms": args.slo_ms},
+            processes=args.processes, remote_workers=remote_workers,
+            finish_detector="" if scenario_spec else args.finish_detector)
+        # Registry kesintisi worker'larda değil, koordinatörde bir kez izlenir
+        monitor = None
+        if scenario_spec and scenario_spec.get("failover"):
+            from load_failover import FailoverMonitor
+            monitor = FailoverMonitor(scenario_spec["failover"], Scenario(scenario_spec).targets.items)
+            monitoring = threading.Event()
+            monitoring.set()
+            monitor_thread = threading.Thread(
+                target=lambda: asyncio.run(monitor.run(time.monotonic(), monitoring.is_set)), daemon=True)
+            monitor_thread.start()
+        results = coordinator.run()
+        if monitor:
+            monitoring.clear()
+            monitor_thread.join()
+        print_worker_summary(results)
+        
+        if scenario_spec:
+            test = LoadTestScenario(Scenario(scenario_spec), monitor_failover=False)
+            test.failover = monitor
+            test.phase_stats = list(zip(test.scenario.phases, merge_phases(results)))
+            test.stop_reason = next((r["stop_reason"] for r in results if r.get("stop_reason")), None)
+            test.report()
+            if args.json:
+                test.write_json(args.json)
+        else:
+            stats = merge_stats(results)
+            print_report(f"TEST RAPORU ({args.mode.upper()} MODE, {len(results)} WORKER)",
+                         stats, coordinator.requests_to_finish)
+            if args.json:
+                stats.write_json(args.json, mode=args.mode, target=args.target, rate=args.rate,
+                                 workers=len(results), recorded_at=datetime.now().isoformat())
+        if args.json:
+            logger.info(f"💾 Sonuçlar yazıldı: {args.json}")
+        raise SystemExit(0)
+    
+    if args.scenario:
+        test = LoadTestScenario(Scenario.load(args.scenario))
+        try:
+            test.start()
+        except KeyboardInterrupt:
+            logger.info("⌨️  Kullanıcı tarafından durduruldu")
+        finally:
+            test.report()
+            if args.json:
+                test.write_json(args.json)
+                logger.info(f"💾 Sonuçlar yazıldı: {args.json}")
+        raise SystemExit(0)
     
     # Mode'a göre test oluştur
     if args.mode == "async":
-        test = LoadTestAsync(request_rate=args.rate, concurrent=args.concurrent)
+        test = LoadTestAsync(attack_target=args.target, finish_detector=args.finish_detector,
+                             request_rate=args.rate, concurrent=args.concurrent)
     else:
-        test = LoadTestThread(request_rate=args.rate, workers=args.workers)
+        test = LoadTestThread(attack_target=args.target, finish_detector=args.finish_detector,
+                              request_rate=args.rate, workers=args.workers)
+    
+    # Sabit süreli test (ör. dev sunucu vs gunicorn throughput karşılaştırması)
+    if args.duration > 0:
+        timer = threading.Timer(args.duration, lambda: setattr(test, "running", False))
+        timer.daemon = True
+        timer.start()
     
     try:
         test.start()
@@ -305,4 +597,10 @@ if __name__ == "__main__":
     finally:
         if args.mode == "thread":
             test.stop()
+        elif test.stats.elapsed == 0:
+            test.stats.finish()
         test.report()
+        if args.json:
+            test.stats.write_json(args.json, mode=args.mode, target=args.target, rate=args.rate,
+                                  recorded_at=datetime.now().isoformat())
+            logger.info(f"💾 Sonuçlar yazıldı: {args.json}")
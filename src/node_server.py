@@ -3,89 +3,282 @@ src/node_server.py - Yan sunucu (Node).
 Merkezi sunucuya kendisini kaydeder, diğer sunucuları keşfeder ve yönlendirir.
 Registry düştüğünde A_M_R (Attack Mode Request) P2P ağına geçer.
 """
-from flask import Flask, render_template, jsonify, redirect, request
-import psutil
+from flask import Flask, Response, render_template, jsonify, redirect, request
 import socket
+import time
 import logging
 import sys
+import os
 import argparse
+import math
+import hashlib
+import tempfile
+import threading
+import multiprocessing
 
 # Proje modüllerini içe aktar
 sys.path.insert(0, "/home/javav12/Belgeler/DiNC/src")
-from utils import State, Heartbeat, Discovery, AMRClient, register_a_m_r_routes
+from utils import (State, Scheduler, Heartbeat, Discovery, CPUSampler, Forwarder, AMRClient, POLICIES, make_policy,
+                   PeerViewPublisher, PeerViewSubscriber, register_a_m_r_routes, register_a_m_r_proxy_routes,
+                   serve_a_m_r_control, METRICS, AdmissionController,
+                   LIMITS, make_limit, PeerBreakers, ScoreWeights, SnapshotWriter, load_snapshot, restore_snapshot,
+                   RegistryFailover, StatusCache)
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.failover import MODE_P2P
+from utils import codec
 
 # Logging ayarları
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Flask uygulaması
-app = Flask(__name__, 
-    template_folder="/home/javav12/Belgeler/DiNC/src/node_server/templates",
-    static_folder="/home/javav12/Belgeler/DiNC/src/node_server/static")
+NODE_SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_server")
+app = Flask(__name__,
+    template_folder=os.path.join(NODE_SERVER_DIR, "templates"),
+    static_folder=os.path.join(NODE_SERVER_DIR, "static"))
+# Statik dosyalar içerik özetiyle adreslenir (static_url); değişmedikçe tarayıcı bir yıl önbellekte tutar
+STATIC_MAX_AGE = 365 * 24 * 3600
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = STATIC_MAX_AGE
 
 # Global durum ve konfigürasyon
 state = None
+scheduler = None  # Tüm periyodik arka plan görevleri
 heartbeat = None
 discovery = None
+cpu_sampler = None
+forwarder = None  # Sadece --forward-mode proxy iken kullanılır
+forward_mode = "redirect"
+peer_poll_mode = "off"
+peer_view_path = None  # Sadece çok worker'lı modda kullanılır
 my_addr = None
 a_m_r = None  # Attack Mode Request P2P client
+admission = None  # Eşzamanlılık sınırı ve istemci başına token bucket
+breakers = None  # Peer ve registry başına devre kesiciler (Heartbeat, Discovery, A_M_R ortak)
+snapshot_writer = None  # Peer ve A_M_R üyeliğinin db/ altındaki anlık görüntüsü (warm start)
+failover = None  # Registry kaybında A_M_R'a otomatik geçiş (None = sadece /a_m_r/activate ile)
+peer_view_subscriber = None  # Sadece gunicorn worker'larında
+status_cache = None  # State sürümüne göre önbelleklenen durum sayfası, /status.json ve SSE akışı
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db")
+SHED_RETRY_AFTER = 1  # Yük atıldığında istemciye önerilen bekleme (saniye)
+
+# Metrikler; sıcak yoldaki etiketli sayaçlar önceden bağlanır (istek başına sözlük araması yok)
+REQUESTS = METRICS.counter("dinc_requests_total", "İşlenen istekler (handler ve sonuca göre)", ("handler", "outcome"))
+REQUEST_DURATION = METRICS.histogram("dinc_request_duration_seconds", "WSGI uygulamasında geçen süre (path'e göre)",
+                                     ("path",))
+_INDEX_SERVED = REQUESTS.labels("index", "served")
+_INDEX_REDIRECTED = REQUESTS.labels("index", "redirected")
+_INDEX_PROXIED = REQUESTS.labels("index", "proxied")
+_INDEX_LOOP_GUARD = REQUESTS.labels("index", "loop_guard")  # redirect_count >= 3: kendimiz hizmet verdik
+_INDEX_SHED = REQUESTS.labels("index", "shed")  # Node ve peer'lar dolu: 503
+_INDEX_RATE_LIMITED = REQUESTS.labels("index", "rate_limited")  # İstemcinin token'ı bitti: 429
+_BEST_REDIRECTED = REQUESTS.labels("redirect", "redirected")
+_BEST_SELF = REQUESTS.labels("redirect", "self")
+_BEST_NO_PEERS = REQUESTS.labels("redirect", "no_peers")
+
+
+_static_versions = {}
+
+
+@app.template_global()
+def static_url(filename):
+    """Statik dosyanın içerik özetli adresi; dosya değişince adres de değişir."""
+    version = _static_versions.get(filename)
+    if version is None:
+        with open(os.path.join(app.static_folder, filename), "rb") as f:
+            version = _static_versions[filename] = hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+    return f"{app.static_url_path}/{filename}?v={version}"
+
+
+def _render_status(view):
+    """Durum görünümünden sayfayı işler (StatusCache sürüm başına bir kez çağırır)."""
+    return render_template("status.html",
+        my_addr=view["address"],
+        my_load=view["cpuLoad"],
+        peers=view["peers"],
+        best_peer=view["best"],
+        is_overloaded=view["overloaded"],
+        threshold=view["threshold"]
+    )
+
+
+def _cached(body, etag, content_type):
+    """ETag'li cevap; istemcideki kopya güncelse gövdesiz 304 döner."""
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        response = Response(status=304)
+    else:
+        response = Response(body, content_type=content_type)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"  # Her seferinde doğrula, gövdeyi sadece değişince al
+    return response
 
 
 def get_cpu_load():
-    """Anlık CPU yükünü yüzde olarak döndürür."""
-    return psutil.cpu_percent(interval=0.5)
+    """
+    CPU yükünü yüzde olarak döndürür.
+    Değer CPUSampler tarafından arka planda güncellenir (EWMA), burada beklenmez.
+    """
+    return state.my_cpu_load
+
+
+@app.before_request
+def _track_request_start():
+    """İşlenmekte olan istek sayacını artır (heartbeat ile yayınlanır)."""
+    state.begin_request()
+
+
+@app.teardown_request
+def _track_request_end(exc=None):
+    """İşlenmekte olan istek sayacını azalt."""
+    state.end_request()
+
+
+def _timed_wsgi_app(wsgi_app):
+    """
+    İstek süresini WSGI katmanında ölçer. Flask'ın request/g proxy'leri istek
+    başına birkaç µs tuttuğu için etiket doğrudan PATH_INFO'dan alınır; sadece
+    parametresiz route'lar kendi etiketini alır, gerisi "other" olur.
+    """
+    durations = {}
+    
+    def timed(environ, start_response):
+        started = time.perf_counter()
+        try:
+            return wsgi_app(environ, start_response)
+        finally:
+            if not durations:
+                # İlk istekte route'lar (A_M_R dahil) kayıtlı olur
+                durations.update({rule.rule: REQUEST_DURATION.labels(rule.rule)
+                                  for rule in app.url_map.iter_rules() if not rule.arguments})
+                durations[None] = REQUEST_DURATION.labels("other")
+            child = durations.get(environ.get("PATH_INFO")) or durations[None]
+            child.observe(time.perf_counter() - started)
+    
+    return timed
+
+
+app.wsgi_app = _timed_wsgi_app(app.wsgi_app)
+
+
+def _reject(status, retry_after, message):
+    """Yük atma cevabı: gövde küçük, Retry-After ile istemci ne zaman deneyeceğini bilir."""
+    response = jsonify({"error": message, "address": my_addr})
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def _relief_peer():
+    """
+    Yönlendirilebilecek doymamış peer. Politikanın seçtiği peer doluysa en iyi
+    peer denenir; o da doluysa None (isteği başka yere itmek sadece gecikme ekler).
+    """
+    # Seçim, sadece gerçekten kullanılan peer için kaydedilir (reddedilen hedef sayılmaz)
+    target = state.choose_peer(record=False)
+    if not (target and target.address != my_addr and target.effective_load < state.cpu_threshold):
+        best = state.best_peer()
+        if not (best and best is not target and best.address != my_addr
+                and best.effective_load < state.cpu_threshold):
+            return None
+        target = best
+    state.record_redirect(target)
+    return target
 
 
 @app.route("/", methods=["GET"])
 def index():
     """Ana durum sayfası."""
+    started = time.perf_counter()
     # Redirect döngüsünü önle: redirect_count header'ını kontrol et
     redirect_count = int(request.headers.get("X-Redirect-Count", 0))
     
+    # İstemci başına hız sınırı (yönlendirilen istekler ilk node'da sayıldı)
+    if redirect_count == 0:
+        retry_after = admission.check_client(request.remote_addr)
+        if retry_after:
+            _INDEX_RATE_LIMITED.inc()
+            return _reject(429, retry_after, "İstek hızı sınırı aşıldı")
+    
+    token = admission.try_acquire()
+    
     # Çok fazla yönlendirme = döngü, durdurun!
     if redirect_count >= 3:
         logger.warning(f"⚠️  Redirect döngüsü algılandı ({redirect_count} redirects)! Kendime hizmet veriyorum.")
-        # Kendisine hizmet ver
-    else:
-        cpu_load = get_cpu_load()
-        
-        # State'i güncelle
-        state.set_my_cpu_load(cpu_load)
-        
-        # Eğer bu node aşırı yüklüyse, en iyi peer'a yönlendir
-        if state.is_overloaded():
-            best_peer = state.best_peer()
-            if best_peer and best_peer.address != my_addr:
-                logger.info(f"Aşırı yüklü node ({cpu_load:.2f}%), {best_peer.address} adresine yönlendiriliyor (count={redirect_count})")
-                
-                # Redirect header'ını increment et
-                response = redirect(f"{best_peer.address}/", code=307)
-                response.headers["X-Redirect-Count"] = str(redirect_count + 1)
-                return response
-    
-    cpu_load = get_cpu_load()
-    peers = [p.to_dict() for p in state.all_peers()]
-    best = state.best_peer()
-    best_peer_info = best.to_dict() if best else None
+    elif state.is_overloaded() or token is None:
+        # Aşırı yüklü ya da eşzamanlılık sınırı dolu: doymamış bir peer'a yönlendir
+        target = _relief_peer()
+        if target:
+            if token is not None:
+                admission.release(token)
+            logger.info(f"Aşırı yüklü node ({get_cpu_load():.2f}%), {target.address} adresine yönlendiriliyor "
+                        f"(count={redirect_count})")
+            
+            # Proxy modunda isteği peer'a ilet; limit doluysa 307'ye geri düş
+            if forward_mode == "proxy":
+                response = forwarder.forward(target.address, request, redirect_count + 1)
+                if response is not None:
+                    _INDEX_PROXIED.inc()
+                    return response
+            
+            # Redirect header'ını increment et
+            response = redirect(f"{target.address}/", code=307)
+            response.headers["X-Redirect-Count"] = str(redirect_count + 1)
+            _INDEX_REDIRECTED.inc()
+            return response
     
-    return render_template("status.html",
-        my_addr=my_addr,
-        my_load=cpu_load,
-        peers=peers,
-        best_peer=best_peer_info,
-        is_overloaded=state.is_overloaded(),
-        threshold=state.cpu_threshold
-    )
+    # Sınır dolu ve gidecek peer yok: kuyruğa almak yerine hemen reddet
+    if token is None:
+        _INDEX_SHED.inc()
+        return _reject(503, SHED_RETRY_AFTER, "Node ve peer'lar dolu")
+    (_INDEX_LOOP_GUARD if redirect_count >= 3 else _INDEX_SERVED).inc()
+    
+    try:
+        # Sayfa sadece State sürümü değişince yeniden işlenir
+        body, etag = status_cache.page()
+        response = _cached(body, etag, "text/html; charset=utf-8")
+    except Exception:
+        admission.release(token, (time.perf_counter() - started) * 1000, dropped=True)
+        raise
+    # Sadece burada karşılanan isteklerin süresi gecikme sinyaline ve eşzamanlılık sınırına girer
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    admission.release(token, elapsed_ms)
+    state.record_latency(elapsed_ms)
+    return response
+
+
+@app.route("/status.json", methods=["GET"])
+def status_json():
+    """Durum sayfasının verisi: kendi yükümüz, en iyi peer ve tüm peer'lar (önbellekli)."""
+    view = status_cache.view()
+    return _cached(view.json, view.json_etag, "application/json")
+
+
+@app.route("/status/stream", methods=["GET"])
+def status_stream():
+    """Server-Sent Events: önce tam durum, sonra sadece değişen peer metrikleri."""
+    stream = status_cache.open_stream()
+    if stream is None:
+        return _reject(503, 5, "Çok fazla durum akışı açık")
+    return Response(stream, content_type="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @app.route("/load", methods=["GET"])
 def load():
-    """JSON formatında CPU yükünü döndürür."""
-    cpu_load = get_cpu_load()
-    return jsonify({
+    """CPU yükünü ve diğer yük sinyallerini döndürür (Accept'e göre JSON ya da msgpack)."""
+    window = state.cpu_window_stats()
+    signals = state.load_signals()
+    return codec.respond({
         "address": my_addr,
-        "cpuLoad": round(cpu_load, 2)
-    }), 200
+        "cpuLoad": round(signals["cpuLoad"], 2),
+        "cpuAvg": round(window["avg"], 2),
+        "cpuMax": round(window["max"], 2),
+        "inFlight": signals["inFlight"],
+        "latencyMs": round(signals["latencyMs"], 2),
+        "acceptQueue": signals["acceptQueue"],
+        "effectiveLoad": round(signals["effectiveLoad"], 2),
+        "overloaded": signals["overloaded"],
+        "overloadReason": signals["overloadReason"],
+    })
 
 
 @app.route("/redirect", methods=["GET"])
@@ -94,16 +287,19 @@ def redirect_to_best():
     İsteği en sağlıklı peer'a yönlendirir.
     Hiç peer yoksa kendisine hizmet ver.
     """
-    best_peer = state.best_peer()
+    best_peer = state.choose_peer()
     if best_peer:
         # Eğer kendisi en iyiyse, kendisine servis ver
         if best_peer.address == my_addr:
+            _BEST_SELF.inc()
             return jsonify({"redirected_to": my_addr, "message": "Ben en iyiyim!"}), 200
         else:
             # Diğer peer'a yönlendir
+            _BEST_REDIRECTED.inc()
             return redirect(f"{best_peer.address}/", code=307)
     else:
         # Hiç peer yoksa kendisini döndür
+        _BEST_NO_PEERS.inc()
         return jsonify({"redirected_to": my_addr, "message": "Başka sunucu yok."}), 200
 
 
@@ -113,15 +309,54 @@ def health():
     return jsonify({"status": "healthy"}), 200
 
 
+@app.route("/scheduler", methods=["GET"])
+def scheduler_stats():
+    """Periyodik görevlerin zamanlama istatistiklerini döndürür."""
+    return jsonify(scheduler.stats()), 200
+
+
+@app.route("/breakers", methods=["GET"])
+def breaker_stats():
+    """Açık, denemede ya da hata saymaya başlamış devre kesiciler."""
+    return jsonify(breakers.snapshot()), 200
+
+
+@app.route("/failover", methods=["GET"])
+def failover_status():
+    """Yönlendirmenin kaynağı: registry ya da A_M_R (p2p) ve geçiş sayıları."""
+    if peer_view_subscriber is not None:
+        # Worker'da geçişi yapan arbiter'ın durumu peer görünümüyle gelir
+        return jsonify(peer_view_subscriber.data.get("failover", {})), 200
+    if failover is None:
+        return jsonify({"mode": "manual", "a_m_r_running": a_m_r.running}), 200
+    return jsonify(failover.status()), 200
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus metin formatında metrikler (çok worker'lı modda cevap veren worker'ınkiler)."""
+    return Response(METRICS.render(), content_type=METRICS_CONTENT_TYPE)
+
+
 @app.route("/ping", methods=["GET"])
 def ping():
     """Load test tarafından istekleri algılamak için kullanılan endpoint."""
     return jsonify({"status": "pong", "address": my_addr}), 200
 
 
-def initialize(port, main_server, cpu_threshold=70.0):
-    """Node'u başlat ve arka plan görevlerini tetikle."""
-    global state, heartbeat, discovery, my_addr, a_m_r
+def initialize(port, main_server, cpu_threshold=70.0, cpu_interval=0.5, peer_poll="off", policy="p2c",
+               mode="redirect", proxy_limit=32, server="dev", discovery_mode="watch", max_inflight=64,
+               latency_threshold_ms=250.0, queue_limit=16, concurrency_limit="aimd", client_rate=0.0,
+               client_burst=0.0, score_weights=None, stale_after=15.0, expire_after=45.0,
+               snapshot_dir=DEFAULT_SNAPSHOT_DIR, snapshot_interval=10.0, failover_mode="auto",
+               max_status_streams=4):
+    """
+    Node bileşenlerini oluştur.
+    dev modunda arka plan görevleri hemen başlar; gunicorn modunda arbiter
+    process'i hazır olduğunda start_control_plane() ile başlatılır.
+    """
+    global state, scheduler, heartbeat, discovery, cpu_sampler, forwarder, forward_mode, my_addr, a_m_r
+    global peer_poll_mode, peer_view_path, admission, breakers, snapshot_writer, failover, status_cache
     
     # Konfigürasyonu ayarla
     hostname = socket.gethostname()
@@ -130,18 +365,109 @@ def initialize(port, main_server, cpu_threshold=70.0):
     logger.info(f"Node başlatılıyor: {my_addr}")
     logger.info(f"Ana Sunucu: {main_server}")
     logger.info(f"CPU Eşiği: {cpu_threshold}%")
+    logger.info(f"Diğer eşikler: in-flight={max_inflight or '-'}, gecikme={latency_threshold_ms or '-'} ms, "
+                f"accept kuyruğu={queue_limit or '-'}")
+    logger.info(f"Kabul kontrolü: eşzamanlılık={concurrency_limit}, "
+                f"istemci hızı={f'{client_rate:g} req/s' if client_rate else '-'}")
+    logger.info(f"Seçim Politikası: {policy}")
+    logger.info(f"Yönlendirme Modu: {mode}")
+    
+    # Çok worker'lı modda in-flight sayacı tüm worker'lar arasında paylaşılır
+    shared_inflight = multiprocessing.Value("i", 0) if server != "dev" else None
     
     # State, Heartbeat ve Discovery'i oluştur
-    state = State(cpu_threshold=cpu_threshold)
-    heartbeat = Heartbeat(main_server, my_addr, interval=5)
-    discovery = Discovery(state, main_server, my_addr, interval=10)
+    state = State(cpu_threshold=cpu_threshold, policy=make_policy(policy), shared_inflight=shared_inflight,
+                  inflight_limit=max_inflight or None, latency_threshold_ms=latency_threshold_ms or None,
+                  queue_limit=queue_limit or None, score_weights=score_weights, stale_after=stale_after,
+                  expire_after=expire_after)
+    status_cache = StatusCache(state, my_addr, render=_render_status, max_streams=max_status_streams)
+    scheduler = Scheduler()
+    # Devresi açılan peer seçilebilir peer'lar arasından hemen çıkar
+    breakers = PeerBreakers()
+    breakers.subscribe(state.set_peer_circuit)
+    heartbeat = Heartbeat(main_server, my_addr, interval=5, state=state, scheduler=scheduler, breakers=breakers)
+    discovery = Discovery(state, main_server, my_addr, interval=10, poll_mode=peer_poll, scheduler=scheduler,
+                          watch=(discovery_mode == "watch"), breakers=breakers)
+    cpu_sampler = CPUSampler(state, interval=cpu_interval, scheduler=scheduler,
+                             port=int(port) if queue_limit else None)
+    peer_poll_mode = peer_poll
+    forward_mode = mode
+    if forward_mode == "proxy":
+        forwarder = Forwarder(max_concurrent_per_peer=proxy_limit)
+        # Cluster'dan çıkan peer'ın keep-alive oturumu ve semaforu bırakılır
+        state.subscribe_removals(forwarder.forget)
+    admission = AdmissionController(
+        make_limit(concurrency_limit, latency_target_ms=latency_threshold_ms or 250.0),
+        client_rate=client_rate, client_burst=client_burst)
+    if server != "dev":
+        peer_view_path = os.path.join(tempfile.gettempdir(), f"dinc-peer-view-{port}.json")
     
     # A_M_R (Attack Mode Request) P2P client'ı oluştur
-    a_m_r = AMRClient(my_addr, known_peers=[])
-    register_a_m_r_routes(app, a_m_r)
+    a_m_r = AMRClient(my_addr, known_peers=[], scheduler=scheduler, breakers=breakers)
+    if server == "dev":
+        register_a_m_r_routes(app, a_m_r)
+    else:
+        # Gossip ve probe'lar arbiter'da çalışır; worker'ların fork ile aldığı kopya
+        # ayrı bir üyelik olurdu. Worker'lar A_M_R isteklerini arbiter'a aktarır.
+        register_a_m_r_proxy_routes(app, serve_a_m_r_control(a_m_r))
     logger.info("✓ A_M_R (P2P fallback) kuruldu")
+    if failover_mode == "auto":
+        failover = RegistryFailover(discovery.replicas, state, a_m_r, discovery, breakers, scheduler=scheduler)
+    
+    # Önceki çalışmanın anlık görüntüsü: keşif turu beklemeden yönlendirme ve P2P'ye geri katılma
+    if snapshot_dir and snapshot_interval > 0:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        snapshot_path = os.path.join(snapshot_dir, f"snapshot-{port}.json")
+        data = load_snapshot(snapshot_path)
+        if data:
+            restored = restore_snapshot(state, data, a_m_r)
+            logger.info(f"♻️  Anlık görüntü yüklendi: {restored} peer, "
+                        f"{len(a_m_r.get_active_peers())} A_M_R üyesi ({snapshot_path})")
+        snapshot_writer = SnapshotWriter(state, snapshot_path, a_m_r, interval=snapshot_interval,
+                                         scheduler=scheduler)
+    
+    register_gauges()
+    
+    if server == "dev":
+        start_control_plane()
+
+
+def register_gauges():
+    """/metrics okunurken hesaplanan göstergeler."""
+    METRICS.gauge("dinc_cpu_load_percent", "Bu node'un CPU yükü (EWMA)", lambda: state.my_cpu_load)
+    METRICS.gauge("dinc_inflight_requests", "İşlenmekte olan istekler", lambda: state.inflight_count())
+    METRICS.gauge("dinc_overloaded", "Node aşırı yüklü mü (1/0, histerezisli karar)",
+                  lambda: int(state.overload.overloaded))
+    METRICS.gauge("dinc_effective_load_percent", "Yük sinyallerinin en büyüğü (CPU yüzdesi biriminde)",
+                  lambda: state.effective_load())
+    METRICS.gauge("dinc_handler_latency_ms", "Yerel karşılanan isteklerin handler süresi (EWMA)",
+                  lambda: state.latency_ms)
+    METRICS.gauge("dinc_accept_queue", "Accept kuyruğunda bekleyen bağlantılar", lambda: state.accept_queue)
+    METRICS.gauge("dinc_concurrency_limit", "Uyarlanabilir eşzamanlılık sınırı (worker başına)",
+                  lambda: admission.current_limit or float("inf"))
+    METRICS.gauge("dinc_peers", "Bilinen peer sayısı", lambda: len(state.peers))
+    METRICS.gauge("dinc_breakers_open", "Devresi açık (ya da denemede) peer/registry sayısı",
+                  lambda: breakers.open_count())
+    METRICS.gauge("dinc_amr_members", "A_M_R üyelik tablosu (duruma göre)", _amr_member_counts, ("status",))
+    METRICS.gauge("dinc_status_streams", "Açık durum akışı (SSE) bağlantıları", lambda: status_cache.streams)
+    METRICS.gauge("dinc_p2p_mode", "Yönlendirme A_M_R üyeliğinden mi (1) registry'den mi (0)",
+                  lambda: int(bool(failover) and failover.mode == MODE_P2P))
+
+
+def _amr_member_counts():
+    if peer_view_subscriber is not None:
+        # Üyelik arbiter'da; worker yayınlanan sayıları gösterir
+        counts = peer_view_subscriber.data.get("a_m_r_members", {})
+    else:
+        counts = a_m_r.member_counts()
+    return {(status,): counts.get(status, 0) for status in ("alive", "suspect", "dead")}
+
+
+def start_control_plane():
+    """Heartbeat, keşif, peer sorgulama ve CPU örneklemesini başlat (host başına bir kez)."""
+    cpu_sampler.start()
+    logger.info("✓ CPU örnekleyici başlatıldı")
     
-    # Arka plan görevlerini başlat
     heartbeat.start()
     logger.info("✓ Heartbeat başlatıldı")
     
@@ -149,19 +475,135 @@ def initialize(port, main_server, cpu_threshold=70.0):
     logger.info("✓ Peer keşfi başlatıldı")
     
     discovery.poll_peer_loads(interval=7)
-    logger.info("✓ Peer yükü sorgulaması başlatıldı")
+    logger.info(f"✓ Peer sorgulama modu: {peer_poll_mode}")
+    
+    if failover:
+        failover.start()
+        logger.info("✓ Registry kaybında A_M_R'a otomatik geçiş açık")
+    
+    if peer_view_path:
+        def extras():
+            data = {"a_m_r_members": a_m_r.member_counts()}
+            if failover:
+                data["failover"] = failover.status()
+            return data
+        PeerViewPublisher(state, peer_view_path, scheduler=scheduler, extras=extras).start()
+        logger.info(f"✓ Peer görünümü yayınlanıyor: {peer_view_path}")
+    
+    if snapshot_writer:
+        snapshot_writer.start()
+        logger.info(f"✓ Anlık görüntü yazılıyor: {snapshot_writer.path}")
+
+
+def start_worker():
+    """Fork sonrası worker'da peer görünümünü okumaya başla."""
+    global scheduler, peer_view_subscriber
+    
+    # Fork anında arbiter'da başka bir thread'in tuttuğu lock worker'a kilitli geçebilir;
+    # fork'tan gelen her nesnenin lock'u yeniden oluşturulur
+    state.lock = threading.RLock()
+    admission.lock = threading.Lock()
+    breakers.lock = threading.Lock()
+    a_m_r.lock = threading.RLock()
+    discovery._lock = threading.Lock()
+    status_cache._lock = threading.Lock()
+    status_cache._page_lock = threading.Lock()
+    METRICS._lock = threading.Lock()
+    if forwarder:
+        forwarder._lock = threading.Lock()
+    if failover:
+        failover._lock = threading.Lock()
+    
+    # Arbiter'ın zamanlayıcı thread'i fork ile gelmez; worker kendi zamanlayıcısını kurar
+    scheduler = Scheduler(max_workers=1)
+    peer_view_subscriber = PeerViewSubscriber(state, peer_view_path, scheduler=scheduler)
+    peer_view_subscriber.refresh()
+    peer_view_subscriber.start()
+
+
+def run_gunicorn(port, workers, threads):
+    """Node'u gunicorn altında çok worker'lı çalıştır."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise ImportError("Gunicorn modu için 'pip install gunicorn' çalıştırın")
+    
+    class NodeApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"0.0.0.0:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("threads", threads)
+            # Kontrol düzlemi arbiter'da bir kez, okuyucular her worker'da
+            self.cfg.set("when_ready", lambda server: start_control_plane())
+            self.cfg.set("post_fork", lambda server, worker: start_worker())
+            self.cfg.set("on_exit", lambda server: scheduler.stop())
+        
+        def load(self):
+            return app
+    
+    NodeApplication().run()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="DiNC - Yan Sunucu (Node)")
     parser.add_argument("--port", type=str, default="8081", help="Sunucunun portu")
-    parser.add_argument("--main-server", type=str, default="http://localhost:8000", help="Merkezi sunucunun adresi")
+    parser.add_argument("--main-server", type=str, default="http://localhost:8000",
+                        help="Merkezi sunucunun adresi (replikalar için virgülle ayrılmış liste: http://a:8000,http://b:8001)")
     parser.add_argument("--cpu-threshold", type=float, default=70.0, help="CPU eşiği (%)")
+    parser.add_argument("--cpu-interval", type=float, default=0.5, help="CPU örnekleme aralığı (saniye)")
+    parser.add_argument("--max-inflight", type=int, default=64,
+                        help="Bu kadar eşzamanlı istekte aşırı yüklü say (0 = kapalı)")
+    parser.add_argument("--latency-threshold", type=float, default=250.0,
+                        help="Handler gecikmesi EWMA eşiği, ms (0 = kapalı)")
+    parser.add_argument("--queue-limit", type=int, default=16,
+                        help="Accept kuyruğunda bu kadar bekleyen bağlantıda aşırı yüklü say (0 = kapalı, sadece Linux)")
+    parser.add_argument("--concurrency-limit", type=str, choices=["off", *LIMITS], default="aimd",
+                        help="Uyarlanabilir eşzamanlılık sınırı: aimd (hedef = --latency-threshold), gradient, off. "
+                             "Sınır doluyken doymamış peer yoksa 503 + Retry-After")
+    parser.add_argument("--client-rate", type=float, default=0.0,
+                        help="İstemci (IP) başına saniyede izin verilen istek; aşılırsa 429 (0 = kapalı)")
+    parser.add_argument("--client-burst", type=float, default=0.0,
+                        help="İstemcinin art arda gönderebileceği istek (0 = --client-rate)")
+    parser.add_argument("--score-weights", type=ScoreWeights.parse, default=None,
+                        help="Peer skoru ağırlıkları, ör. load=0.7,latency=0.3,jitter=0.1,staleness=2 "
+                             "(staleness: bayat örneğin her saniyesi için ceza)")
+    parser.add_argument("--stale-after", type=float, default=15.0,
+                        help="Bu kadar saniyeden eski peer örneği bayat sayılır ve skoru cezalandırılır")
+    parser.add_argument("--expire-after", type=float, default=45.0,
+                        help="Bu kadar saniyedir örneği gelmeyen peer seçilmez (0 = kapalı)")
+    parser.add_argument("--snapshot-dir", type=str, default=DEFAULT_SNAPSHOT_DIR,
+                        help="Peer/A_M_R anlık görüntüsünün yazılacağı dizin (yeniden başlatmada yüklenir)")
+    parser.add_argument("--snapshot-interval", type=float, default=10.0,
+                        help="Anlık görüntü yazma aralığı (saniye, 0 = kapalı)")
+    parser.add_argument("--failover", type=str, choices=["auto", "manual"], default="auto",
+                        help="Registry kaybında A_M_R'a geçiş: auto (art arda heartbeat/keşif hatasıyla) "
+                             "ya da manual (sadece POST /a_m_r/activate)")
+    parser.add_argument("--max-status-streams", type=int, default=4,
+                        help="Eşzamanlı /status/stream (SSE) bağlantısı sınırı; her biri bir thread tutar "
+                             "(gunicorn modunda worker başına)")
+    parser.add_argument("--discovery", type=str, choices=["watch", "poll"], default="watch",
+                        help="Peer keşfi: watch (registry long-poll, sadece değişiklikler) ya da poll (10 sn'de bir tam liste)")
+    parser.add_argument("--peer-poll", type=str, choices=["off", "rtt", "full"], default="off",
+                        help="Peer sorgulama: off (sadece registry metrikleri), rtt (sadece gecikme), full (/load)")
+    parser.add_argument("--policy", type=str, choices=list(POLICIES), default="p2c",
+                        help="Yönlendirme hedefi seçimi: best, p2c, weighted, lrc")
+    parser.add_argument("--forward-mode", type=str, choices=["redirect", "proxy"], default="redirect",
+                        help="Aşırı yükte: redirect (307) ya da proxy (isteği peer'a ilet)")
+    parser.add_argument("--proxy-limit", type=int, default=32, help="Proxy modunda peer başına eşzamanlı istek limiti")
+    parser.add_argument("--server", type=str, choices=["dev", "gunicorn"], default="dev",
+                        help="Sunucu: dev (Flask geliştirme sunucusu) ya da gunicorn (çok worker'lı)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="Gunicorn worker sayısı")
+    parser.add_argument("--threads", type=int, default=8, help="Gunicorn worker başına thread sayısı")
     
     args = parser.parse_args()
     
     # Node'u başlat
-    initialize(args.port, args.main_server, args.cpu_threshold)
+    initialize(args.port, args.main_server, args.cpu_threshold, args.cpu_interval, args.peer_poll, args.policy,
+               args.forward_mode, args.proxy_limit, args.server, args.discovery, args.max_inflight,
+               args.latency_threshold, args.queue_limit, args.concurrency_limit, args.client_rate,
+               args.client_burst, args.score_weights, args.stale_after, args.expire_after,
+               args.snapshot_dir, args.snapshot_interval, args.failover, args.max_status_streams)
     
     print()
     print("=" * 60)
@@ -174,4 +616,13 @@ if __name__ == "__main__":
     print()
     
     # Flask uygulamasını başlat
-    app.run(host="0.0.0.0", port=int(args.port), debug=False)
+    try:
+        if args.server == "gunicorn":
+            run_gunicorn(args.port, args.workers, args.threads)
+        else:
+            app.run(host="0.0.0.0", port=int(args.port), debug=False)
+    finally:
+        scheduler.stop()
+        if snapshot_writer:
+            # Kapanırken son durumu kaydet; bir sonraki açılış en güncel görüntüyle başlasın
+            snapshot_writer.save()
@@ -0,0 +1,64 @@
+// Durum sayfasını /status/stream (Server-Sent Events) ile günceller.
+// Metrikler ve en iyi peer yerinde güncellenir; peer eklenip çıkınca ya da aşırı
+// yük durumu değişince önbellekli sayfa yeniden yüklenir.
+(function () {
+    if (!window.EventSource) {
+        return;
+    }
+
+    function fmt(value) {
+        return Number(value).toFixed(2);
+    }
+
+    function fill(element, peer) {
+        ["load", "latency", "score"].forEach(function (field) {
+            var span = element.querySelector('[data-field="' + field + '"]');
+            if (span) {
+                span.textContent = fmt(peer[field]);
+            }
+        });
+    }
+
+    function peerElement(address) {
+        var items = document.querySelectorAll("li[data-address]");
+        for (var i = 0; i < items.length; i++) {
+            if (items[i].getAttribute("data-address") === address) {
+                return items[i];
+            }
+        }
+        return null;
+    }
+
+    var source = new EventSource("/status/stream");
+    source.addEventListener("status", function (message) {
+        var status = JSON.parse(message.data);
+        var best = document.getElementById("best-peer");
+        var overloaded = document.body.getAttribute("data-overloaded") === "true";
+
+        var structural = status.overloaded !== overloaded ||
+            Boolean(status.best) !== Boolean(best) ||
+            status.removed.length > 0;
+        for (var i = 0; !structural && i < status.changed.length; i++) {
+            structural = peerElement(status.changed[i].address) === null;
+        }
+        if (structural) {
+            source.close();
+            window.location.reload();
+            return;
+        }
+
+        document.getElementById("my-load").textContent = fmt(status.cpuLoad);
+        status.changed.forEach(function (peer) {
+            fill(peerElement(peer.address), peer);
+        });
+        if (best && status.best) {
+            if (best.getAttribute("data-address") !== status.best.address) {
+                best.setAttribute("data-address", status.best.address);
+                var link = best.querySelector("a[target]");
+                link.href = status.best.address + "/";
+                link.textContent = status.best.address;
+            }
+            fill(best, status.best);
+        }
+    });
+})();
@@ -2,26 +2,285 @@
 package main
 
 import (
+	"bytes"
+	"compress/gzip"
 	"encoding/json"
+	"flag"
+	"fmt"
+	"hash/fnv"
 	"log"
 	"net/http"
+	"sort"
+	"strconv"
+	"strings"
 	"sync"
 	"time"
 )
 
 // NodeInfo, bir yan sunucunun bilgilerini tutar.
+// CPULoad, EffectiveLoad, InFlight ve Timestamp heartbeat ile gelir; node'lar
+// birbirini ayrıca sorgulamak zorunda kalmaz.
 type NodeInfo struct {
-	Address   string    `json:"address"`
-	LastSeen  time.Time `json:"lastSeen"`
-	IsHealthy bool      `json:"isHealthy"`
+	Address       string    `json:"address"`
+	LastSeen      time.Time `json:"lastSeen"`
+	IsHealthy     bool      `json:"isHealthy"`
+	CPULoad       float64   `json:"cpuLoad"`
+	EffectiveLoad *float64  `json:"effectiveLoad,omitempty"` // CPU + in-flight/gecikme/kuyruk (eski node'larda yok)
+	InFlight      int       `json:"inFlight"`
+	Timestamp     float64   `json:"timestamp"` // Node'un örnek zamanı (epoch saniye)
+	Version       uint64    `json:"version"`   // Kaydın son değiştiği registry sürümü
+	joined        uint64    // Node'un (yeniden) sağlıklı olarak katıldığı sürüm
+	replicated    bool      // Kayıt başka bir replikadan geldi (LastSeen publishInterval kadar gecikebilir)
 }
 
-// registry, tüm yan sunucuların kaydını tutan thread-safe bir yapıdır.
-var registry = struct {
-	sync.RWMutex
-	nodes map[string]NodeInfo
+// change, değişiklik günlüğündeki bir kayıttır.
+type change struct {
+	version uint64
+	address string
+}
+
+// NodesDelta, /nodes?since=... cevabıdır.
+type NodesDelta struct {
+	Epoch   int64      `json:"epoch"` // Registry örneği; yeniden başlatınca değişir
+	Version uint64     `json:"version"`
+	Full    bool       `json:"full"` // true ise Added tüm sağlıklı node'ları içerir
+	Added   []NodeInfo `json:"added"`
+	Changed []NodeInfo `json:"changed"`
+	Removed []string   `json:"removed"`
+}
+
+const (
+	maxChanges     = 4096             // Saklanan en fazla değişiklik kaydı
+	maxWait        = 60 * time.Second // Long-poll için üst sınır
+	unhealthyAfter = 15 * time.Second // Bu kadar heartbeat gelmeyen node sağlıksız sayılır
+	wheelSlots     = 64               // Zamanlayıcı çarkının saniyelik dilim sayısı (> unhealthyAfter + publishInterval)
+
+	replicaWait        = 20 * time.Second       // Replika izleme long-poll süresi
+	replicaMinInterval = 200 * time.Millisecond // Değişiklikleri toplamak için izleme turları arası bekleme
+	replicaRetry       = 2 * time.Second        // Replikaya ulaşılamazsa tekrar deneme
+
+	gzipMinSize = 1024 // Bundan küçük cevaplar sıkıştırılmaz
+)
+
+// publishInterval, sadece metrik/LastSeen taşıyan heartbeat'lerin toplanıp
+// değişiklik günlüğüne yazıldığı aralıktır (-publish-interval).
+var publishInterval = 10 * time.Second
+
+// epoch, bu registry örneğinin başlangıç zamanıdır; istemciler sürüm
+// numaralarının hâlâ geçerli olup olmadığını bununla anlar.
+var epoch = time.Now().UnixNano()
+
+// changeLog, sürüm sayacını, değişiklik günlüğünü ve long-poll bildirim kanallarını tutar.
+// Üyelik değişiklikleri (katılma, sağlıksız olma) hemen yayınlanır ve izleyicileri
+// uyandırır. Sadece metrik taşıyan heartbeat'ler shard'ların pending kümesinde
+// toplanır ve publishInterval'da bir toplu yayınlanır: sağlıklı node'un heartbeat'i
+// changeLog kilidini hiç almaz, izleyiciler de en fazla aralık başına bir kez, o da
+// metrik gerçekten değiştiyse uyanır. Kilit sırası önce shard, sonra changeLog.
+var changeLog = struct {
+	sync.Mutex
+	version uint64
+	woken   uint64 // İzleyicileri uyandıran son yayının sürümü
+	changes []change
+	notify  chan struct{} // Üyelik veya metrik değişikliği yayınlanınca kapanır (node'lar)
+	refresh chan struct{} // Her yayında kapanır; sadece LastSeen yenilemeleri dahil (replikalar)
 }{
-	nodes: make(map[string]NodeInfo),
+	notify:  make(chan struct{}),
+	refresh: make(chan struct{}),
+}
+
+// shard, node kayıtlarının bir dilimidir. Heartbeat'ler sadece adreslerinin
+// düştüğü shard'ı kilitler; binlerce node tek bir kilitte sıraya girmez.
+//
+// wheel, saniyelik dilimlerden oluşan zamanlayıcı çarkıdır: her sağlıklı node
+// LastSeen+unhealthyAfter saniyesinin diliminde tam bir kez bulunur. Süpürme her
+// saniye sadece o saniyenin dilimine bakar; heartbeat gönderen node'lar yeni
+// son tarihlerine taşınır, göndermeyenler sağlıksız işaretlenir.
+type shard struct {
+	sync.RWMutex
+	nodes   map[string]NodeInfo
+	wheel   [wheelSlots][]string
+	pending map[string]bool // Yayın bekleyen heartbeat'ler; true = metrik değişti
+}
+
+var shards []*shard
+
+// peers, durumu izlenen diğer registry replikalarıdır.
+var peers []string
+
+func initShards(n int) {
+	shards = make([]*shard, n)
+	for i := range shards {
+		shards[i] = &shard{nodes: make(map[string]NodeInfo), pending: make(map[string]bool)}
+	}
+}
+
+func shardFor(address string) *shard {
+	h := fnv.New32a()
+	h.Write([]byte(address))
+	return shards[h.Sum32()%uint32(len(shards))]
+}
+
+// recordChange, sürümü artırıp değişikliği günlüğe ekler; bekleyenleri uyandırmak
+// için ardından publish çağrılmalıdır. Adresin shard kilidi tutulurken çağrılmalıdır.
+func recordChange(address string) uint64 {
+	return recordChanges([]string{address})
+}
+
+// recordChanges, adreslere tek kilit altında ardışık sürümler verir.
+// Dönüş: İlk adresin sürümü (i. adres ilk+i alır).
+func recordChanges(addresses []string) uint64 {
+	changeLog.Lock()
+	defer changeLog.Unlock()
+	first := changeLog.version + 1
+	for _, addr := range addresses {
+		changeLog.version++
+		changeLog.changes = append(changeLog.changes, change{changeLog.version, addr})
+	}
+	if len(changeLog.changes) > maxChanges {
+		changeLog.changes = changeLog.changes[len(changeLog.changes)-maxChanges:]
+	}
+	return first
+}
+
+// publish, bekleyen long-poll isteklerini uyandırır. wake false ise sadece
+// replikalar (refresh) uyanır; node'lar bu değişiklikleri bir sonraki cevapta alır.
+func publish(wake bool) {
+	changeLog.Lock()
+	defer changeLog.Unlock()
+	if wake {
+		changeLog.woken = changeLog.version
+		close(changeLog.notify)
+		changeLog.notify = make(chan struct{})
+	}
+	close(changeLog.refresh)
+	changeLog.refresh = make(chan struct{})
+}
+
+// metricsEqual, heartbeat'in yük metriklerinin kayıttakiyle aynı olup olmadığını söyler.
+func metricsEqual(a, b NodeInfo) bool {
+	if a.CPULoad != b.CPULoad || a.InFlight != b.InFlight {
+		return false
+	}
+	if a.EffectiveLoad == nil || b.EffectiveLoad == nil {
+		return a.EffectiveLoad == b.EffectiveLoad
+	}
+	return *a.EffectiveLoad == *b.EffectiveLoad
+}
+
+// flush, shard'ın bekleyen heartbeat'lerine sürüm verir.
+// Dönüş: (yayınlanan kayıt var mı, metriği değişen var mı)
+func (s *shard) flush() (bool, bool) {
+	s.Lock()
+	defer s.Unlock()
+	if len(s.pending) == 0 {
+		return false, false
+	}
+	addrs := make([]string, 0, len(s.pending))
+	changed := false
+	for addr, metricsChanged := range s.pending {
+		if info, ok := s.nodes[addr]; ok && info.IsHealthy {
+			addrs = append(addrs, addr)
+			changed = changed || metricsChanged
+		}
+	}
+	s.pending = make(map[string]bool, len(s.pending))
+	if len(addrs) == 0 {
+		return false, false
+	}
+	first := recordChanges(addrs)
+	for i, addr := range addrs {
+		info := s.nodes[addr]
+		info.Version = first + uint64(i)
+		s.nodes[addr] = info
+	}
+	return true, changed
+}
+
+// publishPending, publishInterval'da bir bekleyen heartbeat'leri sürümleyip yayınlar.
+// Sadece LastSeen'i yenilenen node'lar için node izleyicileri uyandırılmaz.
+func publishPending() {
+	ticker := time.NewTicker(publishInterval)
+	defer ticker.Stop()
+	for range ticker.C {
+		recorded, wake := false, false
+		for _, s := range shards {
+			r, w := s.flush()
+			recorded, wake = recorded || r, wake || w
+		}
+		if recorded {
+			publish(wake)
+		}
+	}
+}
+
+// expiry, heartbeat gelmeyen node'un sağlıksız sayılacağı süredir. Replikadan
+// gelen kayıtların LastSeen'i toplu yayın yüzünden geride kalabilir; onlara
+// publishInterval kadar pay verilir.
+func expiry(info NodeInfo) time.Duration {
+	if info.replicated {
+		return unhealthyAfter + publishInterval
+	}
+	return unhealthyAfter
+}
+
+// arm, node'u son tarihinin saniyesine ait çark dilimine koyar.
+// Geçmişteki son tarih bir sonraki süpürmeye kalır. Shard kilidi tutulurken çağrılmalıdır.
+func (s *shard) arm(info NodeInfo) {
+	deadline := info.LastSeen.Add(expiry(info)).Unix()
+	if now := time.Now().Unix(); deadline <= now {
+		deadline = now + 1
+	}
+	slot := deadline % wheelSlots
+	s.wheel[slot] = append(s.wheel[slot], info.Address)
+}
+
+// upsert, node kaydını yazar. Sağlıksızken (ya da yeni) gelen node yeniden
+// katılmış sayılır, çarka eklenir ve hemen yayınlanır; zaten sağlıklı olan
+// node'un heartbeat'i toplu yayına kalır. Dönüş: Üyelik değişti mi.
+// Shard kilidi tutulurken çağrılmalıdır.
+func (s *shard) upsert(info NodeInfo) bool {
+	prev, known := s.nodes[info.Address]
+	info.IsHealthy = true
+	if known && prev.IsHealthy {
+		info.Version = prev.Version
+		info.joined = prev.joined
+		s.nodes[info.Address] = info
+		s.pending[info.Address] = s.pending[info.Address] || !metricsEqual(prev, info)
+		return false
+	}
+	info.Version = recordChange(info.Address)
+	info.joined = info.Version
+	s.arm(info)
+	s.nodes[info.Address] = info
+	return true
+}
+
+// sweep, second saniyesinin çark dilimini işler.
+// Dönüş: Sağlıksız işaretlenen node var mı.
+func (s *shard) sweep(second int64, now time.Time) bool {
+	s.Lock()
+	defer s.Unlock()
+	expired := false
+	slot := second % wheelSlots
+	due := s.wheel[slot]
+	s.wheel[slot] = nil
+	for _, addr := range due {
+		info, ok := s.nodes[addr]
+		if !ok || !info.IsHealthy {
+			continue
+		}
+		if now.Sub(info.LastSeen) <= expiry(info) {
+			// Bu arada heartbeat gelmiş: yeni son tarihine taşı
+			s.arm(info)
+			continue
+		}
+		info.IsHealthy = false
+		info.Version = recordChange(addr)
+		s.nodes[addr] = info
+		expired = true
+		log.Printf("Node is unhealthy: %s", addr)
+	}
+	return expired
 }
 
 // registerHandler, bir yan sunucunun kendini kaydetmesini sağlar.
@@ -32,62 +291,328 @@ func registerHandler(w http.ResponseWriter, r *http.Request) {
 		return
 	}
 
-	registry.Lock()
 	info.LastSeen = time.Now()
-	info.IsHealthy = true
-	registry.nodes[info.Address] = info
-	registry.Unlock()
+	s := shardFor(info.Address)
+	s.Lock()
+	joined := s.upsert(info)
+	s.Unlock()
 
-	log.Printf("Node registered/updated: %s", info.Address)
+	if joined {
+		publish(true)
+		log.Printf("Node registered: %s", info.Address)
+	}
 	w.WriteHeader(http.StatusOK)
 	json.NewEncoder(w).Encode(map[string]string{"status": "ok"})
 }
 
 // listNodesHandler, tüm aktif sunucuların listesini döndürür.
+// ?since=<sürüm> verilirse sadece o sürümden sonraki değişiklikler döner;
+// &wait=<saniye> ile değişiklik olana kadar beklenir (long-poll).
 func listNodesHandler(w http.ResponseWriter, r *http.Request) {
-	registry.RLock()
-	defer registry.RUnlock()
+	sinceParam := r.URL.Query().Get("since")
+	if sinceParam == "" {
+		listAllNodes(w, r)
+		return
+	}
 
-	// Sadece sağlıklı olanları kopyala
-	healthyNodes := make([]NodeInfo, 0, len(registry.nodes))
-	for _, node := range registry.nodes {
-		if node.IsHealthy {
-			healthyNodes = append(healthyNodes, node)
+	since, err := strconv.ParseUint(sinceParam, 10, 64)
+	if err != nil {
+		http.Error(w, "Invalid since", http.StatusBadRequest)
+		return
+	}
+	wait := time.Duration(0)
+	if waitParam := r.URL.Query().Get("wait"); waitParam != "" {
+		seconds, err := strconv.ParseFloat(waitParam, 64)
+		if err != nil || seconds < 0 {
+			http.Error(w, "Invalid wait", http.StatusBadRequest)
+			return
+		}
+		wait = time.Duration(seconds * float64(time.Second))
+		if wait > maxWait {
+			wait = maxWait
 		}
 	}
 
+	// liveness=1 (replikalar): sadece LastSeen yenilemelerinde de uyan
+	liveness := r.URL.Query().Get("liveness") == "1"
+	changeLog.Lock()
+	current, woken, notify := changeLog.version, changeLog.woken, changeLog.notify
+	if liveness {
+		woken, notify = current, changeLog.refresh
+	}
+	expired := len(changeLog.changes) > 0 && since+1 < changeLog.changes[0].version
+	changeLog.Unlock()
+
+	// since'ten sonra uyandıran bir değişiklik yoksa bir sonrakini, zaman aşımını
+	// veya istemcinin kopmasını bekle. Arada sessizce yayınlanan metrik/LastSeen
+	// kayıtları cevapta yine de gelir; tam liste gerekiyorsa beklenmez.
+	idle := since == current || (since > 0 && since >= woken && since < current && !expired)
+	if idle && wait > 0 {
+		timer := time.NewTimer(wait)
+		select {
+		case <-notify:
+		case <-timer.C:
+		case <-r.Context().Done():
+		}
+		timer.Stop()
+	}
+
+	writeJSON(w, r, buildDelta(since))
+}
+
+// gzipWriters, sıkıştırıcıları istekler arasında yeniden kullanır (her biri ~1 MB ayırır).
+var gzipWriters = sync.Pool{New: func() interface{} {
+	zw, _ := gzip.NewWriterLevel(nil, gzip.BestSpeed)
+	return zw
+}}
+
+// writeJSON, v'yi JSON olarak yazar; istemci kabul ediyorsa ve gövde büyükse gzip ile sıkıştırır.
+// 1000 node'luk tam liste ~200 KB'tan ~16 KB'a iner.
+func writeJSON(w http.ResponseWriter, r *http.Request, v interface{}) {
+	var buf bytes.Buffer
+	if err := json.NewEncoder(&buf).Encode(v); err != nil {
+		http.Error(w, err.Error(), http.StatusInternalServerError)
+		return
+	}
 	w.Header().Set("Content-Type", "application/json")
-	json.NewEncoder(w).Encode(healthyNodes)
+	w.Header().Set("Vary", "Accept-Encoding")
+	if buf.Len() < gzipMinSize || !strings.Contains(r.Header.Get("Accept-Encoding"), "gzip") {
+		w.Write(buf.Bytes())
+		return
+	}
+	w.Header().Set("Content-Encoding", "gzip")
+	zw := gzipWriters.Get().(*gzip.Writer)
+	zw.Reset(w)
+	zw.Write(buf.Bytes())
+	zw.Close()
+	gzipWriters.Put(zw)
 }
 
-// healthCheck, periyodik olarak sunucuların durumunu kontrol eder.
+// healthyNodes, tüm shard'lardaki sağlıklı node'ları toplar.
+func healthyNodes() []NodeInfo {
+	nodes := []NodeInfo{}
+	for _, s := range shards {
+		s.RLock()
+		for _, node := range s.nodes {
+			if node.IsHealthy {
+				nodes = append(nodes, node)
+			}
+		}
+		s.RUnlock()
+	}
+	return nodes
+}
+
+// listAllNodes, sağlıklı node'ların tam listesini yazar (eski format).
+func listAllNodes(w http.ResponseWriter, r *http.Request) {
+	// Sürüm listeden önce okunur; arada olan değişiklikler bir sonraki delta'da tekrar gelir
+	changeLog.Lock()
+	version := changeLog.version
+	changeLog.Unlock()
+
+	w.Header().Set("X-Registry-Version", strconv.FormatUint(version, 10))
+	writeJSON(w, r, healthyNodes())
+}
+
+// buildDelta, since sürümünden bu yana değişen kayıtları toplar.
+// Günlük yeterince geriye gitmiyorsa (veya registry yeniden başladıysa) tam liste döner.
+func buildDelta(since uint64) NodesDelta {
+	changeLog.Lock()
+	version := changeLog.version
+	oldest := version + 1
+	if len(changeLog.changes) > 0 {
+		oldest = changeLog.changes[0].version
+	}
+	full := since == 0 || since > version || since+1 < oldest
+	var pending []change
+	if !full {
+		// Değişiklik günlüğünde since'ten sonraki ilk kaydı bul (sürümler artan sırada)
+		start := sort.Search(len(changeLog.changes), func(i int) bool {
+			return changeLog.changes[i].version > since
+		})
+		pending = append(pending, changeLog.changes[start:]...)
+	}
+	changeLog.Unlock()
+
+	delta := NodesDelta{
+		Epoch:   epoch,
+		Version: version,
+		Full:    full,
+		Added:   []NodeInfo{},
+		Changed: []NodeInfo{},
+		Removed: []string{},
+	}
+	if full {
+		delta.Added = healthyNodes()
+		return delta
+	}
+
+	seen := make(map[string]bool)
+	for _, c := range pending {
+		if seen[c.address] {
+			continue
+		}
+		seen[c.address] = true
+
+		s := shardFor(c.address)
+		s.RLock()
+		node, ok := s.nodes[c.address]
+		s.RUnlock()
+		switch {
+		case !ok || !node.IsHealthy:
+			delta.Removed = append(delta.Removed, c.address)
+		case node.joined > since:
+			delta.Added = append(delta.Added, node)
+		default:
+			delta.Changed = append(delta.Changed, node)
+		}
+	}
+	return delta
+}
+
+// healthHandler, registry'nin durumunu döndürür.
+func healthHandler(w http.ResponseWriter, r *http.Request) {
+	changeLog.Lock()
+	version := changeLog.version
+	changeLog.Unlock()
+
+	w.Header().Set("Content-Type", "application/json")
+	json.NewEncoder(w).Encode(map[string]interface{}{
+		"status":  "healthy",
+		"epoch":   epoch,
+		"version": version,
+		"nodes":   len(healthyNodes()),
+		"shards":  len(shards),
+		"peers":   peers,
+	})
+}
+
+// healthCheck, zamanlayıcı çarkını saniyede bir ilerletir.
+// Her turda sadece son tarihi o saniyeye düşen node'lara bakılır ve her
+// shard ayrı kilitlenir; heartbeat'ler tüm tablonun taranmasını beklemez.
 func healthCheck() {
-	for {
-		time.Sleep(10 * time.Second) // Her 10 saniyede bir kontrol et
-		registry.Lock()
-		for addr, info := range registry.nodes {
-			// Eğer bir sunucu 15 saniyeden uzun süredir heartbeat göndermediyse,
-			// onu sağlıksız olarak işaretle.
-			if time.Since(info.LastSeen) > 15*time.Second {
-				info.IsHealthy = false
-				registry.nodes[addr] = info
-				log.Printf("Node is unhealthy: %s", addr)
+	last := time.Now().Unix()
+	ticker := time.NewTicker(time.Second)
+	defer ticker.Stop()
+	for now := range ticker.C {
+		// Gecikmiş tikte atlanan saniyeler de işlenir (en fazla bir tam tur)
+		current := now.Unix()
+		if current-last > wheelSlots {
+			last = current - wheelSlots
+		}
+		expired := false
+		for second := last + 1; second <= current; second++ {
+			for _, s := range shards {
+				if s.sweep(second, now) {
+					expired = true
+				}
 			}
 		}
-		registry.Unlock()
+		if expired {
+			publish(true)
+		}
+		last = current
+	}
+}
+
+// applyReplica, başka bir replikadan gelen kaydı uygular.
+// Daha yeni LastSeen kazanır; kendi kayıtlarımız bize geri geldiğinde eşit
+// olduğu için uygulanmaz ve replikalar arasında döngü oluşmaz. Node'u sağlıksız
+// işaretlemek replikaya bırakılmaz: her replika aynı LastSeen ile kendi çarkında eler.
+func applyReplica(info NodeInfo) {
+	info.replicated = true
+	if !info.IsHealthy || time.Since(info.LastSeen) > expiry(info) {
+		return
+	}
+	s := shardFor(info.Address)
+	s.Lock()
+	joined := false
+	if prev, known := s.nodes[info.Address]; !known || info.LastSeen.After(prev.LastSeen) {
+		joined = s.upsert(info)
+	}
+	s.Unlock()
+	if joined {
+		publish(true)
+	}
+}
+
+// replicate, bir replikanın değişikliklerini /nodes?since=&wait= ile izler
+// (node'ların kullandığı long-poll ile aynı) ve kayıtlarını uygular.
+func replicate(peer string) {
+	client := &http.Client{Timeout: replicaWait + 10*time.Second}
+	var since uint64
+	var peerEpoch int64
+	for {
+		url := fmt.Sprintf("%s/nodes?since=%d&wait=%g&liveness=1", peer, since, replicaWait.Seconds())
+		resp, err := client.Get(url)
+		if err != nil {
+			log.Printf("Replika izlenemedi (%s): %v", peer, err)
+			time.Sleep(replicaRetry)
+			continue
+		}
+		var delta NodesDelta
+		err = json.NewDecoder(resp.Body).Decode(&delta)
+		resp.Body.Close()
+		if err != nil || resp.StatusCode != http.StatusOK {
+			log.Printf("Replika geçersiz cevap verdi (%s): %d %v", peer, resp.StatusCode, err)
+			time.Sleep(replicaRetry)
+			continue
+		}
+		if !delta.Full && delta.Epoch != peerEpoch {
+			// Replika yeniden başlamış: sürümler karşılaştırılamaz, tam liste iste
+			since = 0
+			continue
+		}
+		if delta.Full && delta.Epoch != peerEpoch {
+			log.Printf("Replika senkronize ediliyor: %s (%d node)", peer, len(delta.Added))
+		}
+		peerEpoch = delta.Epoch
+		for _, node := range delta.Added {
+			applyReplica(node)
+		}
+		for _, node := range delta.Changed {
+			applyReplica(node)
+		}
+		since = delta.Version
+		time.Sleep(replicaMinInterval)
 	}
 }
 
 func main() {
-	// Arka planda sağlık kontrolünü başlat
+	addr := flag.String("addr", ":8000", "Dinlenecek adres")
+	shardCount := flag.Int("shards", 64, "Node tablosunun shard sayısı")
+	peerList := flag.String("peers", "", "Durumu senkronize edilecek diğer registry replikaları (http://host:port,...)")
+	flag.DurationVar(&publishInterval, "publish-interval", publishInterval,
+		"Metrik heartbeat'lerinin toplanıp izleyicilere yayınlandığı aralık")
+	flag.Parse()
+
+	if *shardCount < 1 {
+		log.Fatalf("Geçersiz shard sayısı: %d", *shardCount)
+	}
+	if publishInterval <= 0 || unhealthyAfter+publishInterval >= wheelSlots*time.Second {
+		log.Fatalf("Geçersiz yayın aralığı: %v", publishInterval)
+	}
+	initShards(*shardCount)
+	for _, peer := range strings.Split(*peerList, ",") {
+		if peer = strings.TrimRight(strings.TrimSpace(peer), "/"); peer != "" {
+			peers = append(peers, peer)
+		}
+	}
+
+	// Arka planda sağlık kontrolünü ve replika senkronizasyonunu başlat
 	go healthCheck()
+	go publishPending()
+	for _, peer := range peers {
+		go replicate(peer)
+	}
 
 	http.HandleFunc("/register", registerHandler)
 	http.HandleFunc("/nodes", listNodesHandler)
+	http.HandleFunc("/health", healthHandler)
 
-	port := ":8000"
-	log.Printf("Registry Server http://localhost%s adresinde başlatılıyor...", port)
-	if err := http.ListenAndServe(port, nil); err != nil {
+	log.Printf("Registry Server http://localhost%s adresinde başlatılıyor (%d shard, replikalar: %v)...",
+		*addr, len(shards), peers)
+	if err := http.ListenAndServe(*addr, nil); err != nil {
 		log.Fatalf("Registry sunucusu başlatılamadı: %v", err)
 	}
 }
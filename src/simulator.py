@@ -0,0 +1,538 @@
+"""
+src/simulator.py - Tek process'te deterministik DiNC cluster simülasyonu.
+N sanal node'u sanal saat, gecikmeli/kayıplı simüle ağ ve sentetik CPU eğrileriyle
+çalıştırır. Node'lar gerçek State (skorlama, seçim politikaları), Heartbeat gövdesi,
+Discovery delta uygulaması ve isteğe bağlı AMRClient (gossip + SWIM) kullanır;
+HTTP yerine simüle transport kullanılır. Registry, Go registry'nin sürüm/delta
+davranışının Python kopyasıdır.
+
+Rapor: üyelik yakınsama süresi, yönlendirme hop dağılımı, yük dengesizliği
+(max/ortalama CPU) ve kontrol düzlemi mesaj sayıları. Aynı seed ile farklı
+seçim politikaları karşılaştırılabilir.
+
+Kullanım:
+  python3 src/simulator.py --nodes 100 --rate 3000 --duration 60
+  python3 src/simulator.py --nodes 500 --policies best p2c weighted lrc --hot-fraction 0.1 --hot-share 0.6
+  python3 src/simulator.py --nodes 200 --kill 10 --kill-at 30 --amr
+"""
+import argparse
+import heapq
+import itertools
+import logging
+import math
+import random
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from utils import State, Heartbeat, Discovery, AMRClient, make_policy
+
+logging.basicConfig(level=logging.ERROR)
+
+REGISTRY_ADDR = "sim://registry"
+MAX_HOPS = 3  # node_server.index ile aynı döngü sınırı
+
+
+# ============================================================================
+# Sanal saat ve ağ
+# ============================================================================
+
+class VirtualClock:
+    """Olay kuyruğu tabanlı sanal saat."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._heap = []
+        self._seq = itertools.count()
+
+    def schedule(self, delay: float, func: Callable, *args):
+        heapq.heappush(self._heap, (self.now + max(0.0, delay), next(self._seq), func, args))
+
+    def every(self, interval: float, func: Callable, initial_delay: Optional[float] = None):
+        """func'ı interval'da bir çalıştırır; func False döndürürse durur."""
+        def tick():
+            if func() is not False:
+                self.schedule(interval, tick)
+        self.schedule(interval if initial_delay is None else initial_delay, tick)
+
+    def run_until(self, end: float):
+        while self._heap and self._heap[0][0] <= end:
+            when, _, func, args = heapq.heappop(self._heap)
+            self.now = when
+            func(*args)
+        self.now = end
+
+
+class SimNetwork:
+    """Mesajları gecikme ve kayıpla iletir; türe göre sayar."""
+
+    def __init__(self, clock: VirtualClock, rng: random.Random, latency_ms: float = 2.0,
+                 jitter_ms: float = 1.0, loss: float = 0.0):
+        self.clock = clock
+        self.rng = rng
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.messages = Counter()
+        self.dropped = Counter()
+
+    def delay(self, rng: Optional[random.Random] = None) -> float:
+        """Tek yön gecikme; veri düzlemi kendi rng'sini verir ki kontrol düzlemi politikadan etkilenmesin."""
+        rng = rng or self.rng
+        return max(0.0, self.latency_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+
+    def lost(self, kind: str) -> bool:
+        """Mesajı sayar; kaybolduysa True döner."""
+        self.messages[kind] += 1
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped[kind] += 1
+            return True
+        return False
+
+    def send(self, kind: str, func: Callable, *args):
+        """Kontrol düzlemi mesajını tek yönlü gecikmeyle iletir."""
+        if not self.lost(kind):
+            self.clock.schedule(self.delay(), func, *args)
+
+
+class SimTransport:
+    """AMRClient için transport: handler'ı senkron çağırır, mesajı sayar, kayıp/ölü node'da hata verir."""
+
+    def __init__(self, network: SimNetwork, nodes: Dict[str, "SimNode"]):
+        self.network = network
+        self.nodes = nodes
+
+    def post(self, peer_addr: str, path: str, payload: Dict, timeout: float) -> Dict:
+        node = self.nodes.get(peer_addr)
+        if self.network.lost(f"a_m_r{path[len('/a_m_r'):]}") or node is None or not node.alive:
+            raise TimeoutError(peer_addr)
+        client = node.a_m_r
+        handler = {
+            "/a_m_r/sync": client.handle_sync,
+            "/a_m_r/ping": client.handle_ping,
+            "/a_m_r/ping-req": client.handle_ping_req,
+        }[path]
+        return handler(payload)
+
+
+# ============================================================================
+# Registry (src/registry_server/main.go davranışının kopyası)
+# ============================================================================
+
+class SimRegistry:
+    """Sürümlü kayıt, değişiklik günlüğü, sağlık zaman aşımı ve long-poll."""
+
+    MAX_CHANGES = 4096
+
+    def __init__(self, clock: VirtualClock, network: SimNetwork, unhealthy_after: float = 15.0,
+                 publish_interval: float = 10.0):
+        self.clock = clock
+        self.network = network
+        self.unhealthy_after = unhealthy_after
+        self.publish_interval = publish_interval
+        self.epoch = 1
+        self.nodes: Dict[str, Dict] = {}
+        self.version = 0
+        self.woken = 0                   # İzleyicileri uyandıran son yayının sürümü
+        self.changes: List = []          # [(version, address)]
+        self.pending: Dict[str, bool] = {}  # Toplu yayın bekleyen heartbeat'ler (True = metrik değişti)
+        self._waiters: List = []         # [(since, reply)]
+
+    def _record_change(self, address: str) -> int:
+        """Sürümü artırır ve günlüğe ekler; bekleyenleri uyandırmak için _notify çağrılmalı."""
+        self.version += 1
+        self.changes.append((self.version, address))
+        if len(self.changes) > self.MAX_CHANGES:
+            del self.changes[:len(self.changes) - self.MAX_CHANGES]
+        return self.version
+
+    def _notify(self):
+        self.woken = self.version
+        waiters, self._waiters = self._waiters, []
+        for since, reply in waiters:
+            reply(self.build_delta(since))
+
+    def register(self, payload: Dict):
+        address = payload["address"]
+        prev = self.nodes.get(address)
+        if prev and prev["isHealthy"]:
+            # Üyelik değişmedi: kayıt güncellenir, yayın bir sonraki publish'e kalır
+            changed = any(prev.get(k) != payload.get(k) for k in ("cpuLoad", "effectiveLoad", "inFlight"))
+            self.nodes[address] = {**prev, **payload, "lastSeen": self.clock.now}
+            self.pending[address] = self.pending.get(address, False) or changed
+            return
+        version = self._record_change(address)
+        self.nodes[address] = {
+            **payload, "lastSeen": self.clock.now, "isHealthy": True, "version": version, "joined": version,
+        }
+        self._notify()
+
+    def publish(self):
+        """publish_interval'da bir bekleyen heartbeat'leri yayınlar; metrik değiştiyse izleyicileri uyandırır."""
+        pending, self.pending = self.pending, {}
+        wake = False
+        for address, changed in pending.items():
+            info = self.nodes.get(address)
+            if info is not None and info["isHealthy"]:
+                info["version"] = self._record_change(address)
+                wake = wake or changed
+        if wake:
+            self._notify()
+
+    def health_check(self):
+        changed = False
+        for address, info in self.nodes.items():
+            if info["isHealthy"] and self.clock.now - info["lastSeen"] > self.unhealthy_after:
+                info["isHealthy"] = False
+                info["version"] = self._record_change(address)
+                changed = True
+        if changed:
+            self._notify()
+
+    def build_delta(self, since: int) -> Dict:
+        delta = {"epoch": self.epoch, "version": self.version, "full": False,
+                 "added": [], "changed": [], "removed": []}
+        oldest = self.changes[0][0] if self.changes else self.version + 1
+        if since == 0 or since > self.version or since + 1 < oldest:
+            delta["full"] = True
+            delta["added"] = [n for n in self.nodes.values() if n["isHealthy"]]
+            return delta
+
+        # Günlükteki sürümler ardışık: since'ten sonraki ilk kaydın yeri doğrudan hesaplanır
+        start = since + 1 - oldest
+        seen = set()
+        for _, address in self.changes[start:]:
+            if address in seen:
+                continue
+            seen.add(address)
+            node = self.nodes.get(address)
+            if node is None or not node["isHealthy"]:
+                delta["removed"].append(address)
+            elif node["joined"] > since:
+                delta["added"].append(node)
+            else:
+                delta["changed"].append(node)
+        return delta
+
+    def watch(self, since: int, wait: float, reply: Callable[[Dict], None]):
+        """/nodes?since=&wait= : uyandıran değişiklik varsa hemen, yoksa ilk yayında veya wait sonunda cevap."""
+        oldest = self.changes[0][0] if self.changes else self.version + 1
+        idle = since == self.version or (0 < since < self.version and since >= self.woken and since + 1 >= oldest)
+        if not idle or wait <= 0:
+            reply(self.build_delta(since))
+            return
+        entry = (since, reply)
+        self._waiters.append(entry)
+
+        def timeout():
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                reply(self.build_delta(since))
+        self.clock.schedule(wait, timeout)
+
+
+# ============================================================================
+# Sanal node
+# ============================================================================
+
+class SimNode:
+    """Gerçek State/Heartbeat/Discovery (ve AMRClient) nesnelerini sanal saatle süren node."""
+
+    def __init__(self, sim: "Simulation", index: int, capacity: float, base_cpu: float, phase: float):
+        self.sim = sim
+        self.address = f"http://sim-node-{index}:8081"
+        self.capacity = capacity      # %100 CPU'da saniyede işlenebilen istek
+        self.base_cpu = base_cpu
+        self.phase = phase
+        self.alive = True
+        self.served_window = 0
+        self.cpu = base_cpu           # Son ham CPU örneği
+
+        cfg = sim.config
+        self.state = State(cpu_threshold=cfg.cpu_threshold, time_fn=lambda: sim.clock.now,
+                           policy=make_policy(sim.policy, random.Random(sim.rng.random())))
+        self.heartbeat = Heartbeat(REGISTRY_ADDR, self.address, interval=cfg.heartbeat_interval, state=self.state)
+        self.discovery = Discovery(self.state, REGISTRY_ADDR, self.address, watch=True,
+                                   watch_wait=cfg.watch_wait, watch_min_interval=cfg.watch_min_interval)
+        self._watch_token = 0
+        self.a_m_r: Optional[AMRClient] = None
+
+    def start(self):
+        clock, cfg, rng = self.sim.clock, self.sim.config, self.sim.rng
+        self.send_heartbeat()
+        clock.every(cfg.heartbeat_interval, self.send_heartbeat, initial_delay=rng.uniform(0, cfg.heartbeat_interval))
+        clock.every(cfg.cpu_interval, self.sample_cpu, initial_delay=rng.uniform(0, cfg.cpu_interval))
+        clock.schedule(rng.uniform(0, 0.5), self.watch)
+        clock.every(1.0, self.state.refresh_scores, initial_delay=rng.uniform(0, 1.0))
+        if self.a_m_r:
+            self.a_m_r.running = True
+            clock.every(cfg.gossip_interval, self._gossip, initial_delay=rng.uniform(0, cfg.gossip_interval))
+            clock.every(self.a_m_r.probe_interval, self._probe, initial_delay=rng.uniform(0, self.a_m_r.probe_interval))
+
+    def kill(self):
+        self.alive = False
+
+    # --- CPU -----------------------------------------------------------------
+
+    def cpu_at(self, t: float) -> float:
+        """Sentetik CPU: taban + dalga + işlenen istek yükü."""
+        cfg = self.sim.config
+        wave = cfg.cpu_wave * math.sin(2 * math.pi * t / cfg.cpu_period + self.phase)
+        work = 100.0 * self.served_window / (self.capacity * cfg.cpu_interval)
+        return min(100.0, max(0.0, self.base_cpu + wave + work))
+
+    def sample_cpu(self):
+        if not self.alive:
+            return False
+        self.cpu = self.cpu_at(self.sim.clock.now)
+        self.served_window = 0
+        self.state.record_cpu_sample(self.cpu)
+
+    # --- Kontrol düzlemi -------------------------------------------------------
+
+    def send_heartbeat(self):
+        if not self.alive:
+            return False
+        payload = self.heartbeat._payload()
+        payload["timestamp"] = self.sim.clock.now
+        self.sim.network.send("heartbeat", self.sim.registry.register, payload)
+
+    def watch(self):
+        """Discovery.watch_once'ın sanal karşılığı; kayıp istekte zaman aşımıyla yeniden dener."""
+        if not self.alive:
+            return
+        self._watch_token += 1
+        token = self._watch_token
+        cfg = self.sim.config
+        network = self.sim.network
+
+        def reply(delta):
+            network.send("watch-reply", self.on_delta, token, delta)
+
+        network.send("watch", self.sim.registry.watch, self.discovery.version, cfg.watch_wait, reply)
+        self.sim.clock.schedule(cfg.watch_wait + 5, self._watch_timeout, token)
+
+    def _watch_timeout(self, token: int):
+        if token == self._watch_token and self.alive:
+            self.watch()
+
+    def on_delta(self, token: int, delta: Dict):
+        if token != self._watch_token or not self.alive:
+            return
+        self._watch_token += 1  # Bekleyen zaman aşımını geçersiz kıl
+        self.discovery.apply_delta(delta)
+        self.sim.clock.schedule(self.sim.config.watch_min_interval, self.watch)
+
+    def _gossip(self):
+        if not self.alive:
+            return False
+        self.a_m_r.gossip_round()
+
+    def _probe(self):
+        if not self.alive:
+            return False
+        self.a_m_r.probe_round()
+
+    # --- Veri düzlemi ----------------------------------------------------------
+
+    def handle_request(self, hops: int):
+        """node_server.index ile aynı karar: aşırı yüklüyse politikanın seçtiği peer'a 307."""
+        if not self.alive:
+            self.sim.failed += 1
+            return
+        if hops < MAX_HOPS and self.state.is_overloaded():
+            target = self.state.choose_peer()
+            if target and target.address != self.address:
+                node = self.sim.nodes.get(target.address)
+                # İstemci yönlendirmeyi izler: bir RTT sonra hedefe gelir
+                self.sim.clock.schedule(2 * self.sim.network.delay(self.sim.rng), node.handle_request, hops + 1)
+                return
+        self.served_window += 1
+        self.sim.hops[hops] += 1
+
+
+# ============================================================================
+# Simülasyon
+# ============================================================================
+
+class Simulation:
+    """Tek bir politika için simülasyon koşusu."""
+
+    def __init__(self, config, policy: str):
+        self.config = config
+        self.policy = policy
+        self.rng = random.Random(config.seed)
+        self.clock = VirtualClock()
+        self.network = SimNetwork(self.clock, random.Random(config.seed + 1), config.latency_ms,
+                                  config.jitter_ms, config.loss)
+        self.registry = SimRegistry(self.clock, self.network)
+        self.hops = Counter()
+        self.failed = 0
+        self.imbalance: List[float] = []
+        self.converged_at: Optional[float] = None
+        self.purged_at: Optional[float] = None
+        self.a_m_r_converged_at: Optional[float] = None
+        self.killed: List[SimNode] = []
+
+        self.nodes: Dict[str, SimNode] = {}
+        for i in range(config.nodes):
+            capacity = config.capacity * self.rng.choice(config.capacity_spread)
+            node = SimNode(self, i, capacity, config.base_cpu, self.rng.uniform(0, 2 * math.pi))
+            self.nodes[node.address] = node
+        self.node_list = list(self.nodes.values())
+        self.entry_nodes = self.node_list  # İstemcilerin ilk geldiği (canlı) node'lar
+
+        # Sıcak node'lar: trafiğin hot_share kadarı node'ların hot_fraction kadarına girer
+        hot_count = max(1, int(config.nodes * config.hot_fraction)) if config.hot_share > 0 else 0
+        self.hot_nodes = self.node_list[:hot_count]
+
+        if config.amr:
+            transport = SimTransport(self.network, self.nodes)
+            addresses = list(self.nodes)
+            for i, node in enumerate(self.node_list):
+                seeds = [addresses[(i + 1) % len(addresses)]]
+                node.a_m_r = AMRClient(node.address, seeds, transport=transport,
+                                       rng=random.Random(self.rng.random()), parallel_probes=False,
+                                       time_fn=lambda: self.clock.now)
+
+    def _entry_node(self) -> SimNode:
+        if self.hot_nodes and self.rng.random() < self.config.hot_share:
+            return self.rng.choice(self.hot_nodes)
+        return self.rng.choice(self.entry_nodes)
+
+    def _arrival(self):
+        self._entry_node().handle_request(0)
+        self.clock.schedule(self.rng.expovariate(self.config.rate), self._arrival)
+
+    def _kill_nodes(self):
+        alive = [n for n in self.node_list if n.alive and n not in self.hot_nodes]
+        # Ayrı rng: öldürülen node'lar politikadan (trafiğin tükettiği rastgelelikten) bağımsız
+        rng = random.Random(self.config.seed + 2)
+        self.killed = rng.sample(alive, min(self.config.kill, len(alive)))
+        for node in self.killed:
+            node.kill()
+        self.entry_nodes = [n for n in self.node_list if n.alive]
+
+    def _observe(self):
+        """Saniyede bir: yakınsama, temizlenme ve dengesizlik ölçümü."""
+        now = self.clock.now
+        alive = [n for n in self.node_list if n.alive]
+        alive_addrs = {n.address for n in alive}
+
+        if self.converged_at is None:
+            if all(alive_addrs - {n.address} <= n.state.peers.keys() for n in alive):
+                self.converged_at = now
+        if self.killed and self.purged_at is None:
+            dead = {n.address for n in self.killed}
+            if all(not (dead & set(n.state.peers)) for n in alive):
+                self.purged_at = now
+        if self.config.amr and self.a_m_r_converged_at is None:
+            if all(set(n.a_m_r.get_active_peers()) == alive_addrs - {n.address} for n in alive):
+                self.a_m_r_converged_at = now
+
+        if now >= self.config.warmup and alive:
+            cpus = [n.cpu for n in alive]
+            mean = sum(cpus) / len(cpus)
+            if mean > 0:
+                self.imbalance.append(max(cpus) / mean)
+
+    def run(self) -> Dict:
+        cfg = self.config
+        self.clock.every(10.0, lambda: self.registry.health_check())
+        self.clock.every(self.registry.publish_interval, self.registry.publish)
+        for node in self.node_list:
+            node.start()
+        self.clock.schedule(cfg.traffic_start, self._arrival)
+        self.clock.every(1.0, self._observe)
+        if cfg.kill:
+            self.clock.schedule(cfg.kill_at, self._kill_nodes)
+        self.clock.run_until(cfg.duration)
+        return self.report()
+
+    def report(self) -> Dict:
+        served = sum(self.hops.values())
+        redirected = served - self.hops[0]
+        imbalance = sorted(self.imbalance)
+        control = {k: v for k, v in self.network.messages.items()}
+        return {
+            "policy": self.policy,
+            "converged_at": self.converged_at,
+            "purged_after": (self.purged_at - self.config.kill_at) if self.purged_at is not None else None,
+            "a_m_r_converged_at": self.a_m_r_converged_at,
+            "served": served,
+            "failed": self.failed,
+            "redirected_pct": redirected / served * 100 if served else 0.0,
+            "hops": dict(sorted(self.hops.items())),
+            "imbalance_mean": sum(imbalance) / len(imbalance) if imbalance else 0.0,
+            "imbalance_p95": imbalance[int(0.95 * (len(imbalance) - 1))] if imbalance else 0.0,
+            "messages": control,
+            "messages_per_node_s": sum(control.values()) / self.config.nodes / self.config.duration,
+            "dropped": dict(self.network.dropped),
+        }
+
+
+def _fmt(value, suffix="s"):
+    return "-" if value is None else f"{value:.0f}{suffix}"
+
+
+def print_results(config, results: List[Dict]):
+    print()
+    print("=" * 100)
+    print(f"SİMÜLASYON: {config.nodes} node, {config.rate:g} req/s, {config.duration:g}s sanal süre, "
+          f"ağ {config.latency_ms:g}±{config.jitter_ms:g} ms, kayıp %{config.loss * 100:g}, seed={config.seed}")
+    print("=" * 100)
+    print(f"{'politika':<10} {'yakınsama':>10} {'temizlenme':>11} {'yönl.%':>7} {'hop dağılımı (0/1/2/3)':>26} "
+          f"{'max/ort CPU':>12} {'p95':>6} {'başarısız':>10}")
+    for r in results:
+        hops = "/".join(str(r["hops"].get(h, 0)) for h in range(MAX_HOPS + 1))
+        print(f"{r['policy']:<10} {_fmt(r['converged_at']):>10} {_fmt(r['purged_after']):>11} "
+              f"{r['redirected_pct']:>7.1f} {hops:>26} {r['imbalance_mean']:>12.2f} "
+              f"{r['imbalance_p95']:>6.2f} {r['failed']:>10}")
+    print("-" * 100)
+    r = results[0]
+    print("📨 Kontrol düzlemi mesajları: " + ", ".join(f"{k}={v}" for k, v in sorted(r["messages"].items()))
+          + f"  ({r['messages_per_node_s']:.2f} mesaj/node/s)")
+    if r["dropped"]:
+        print("🕳️  Kaybolan: " + ", ".join(f"{k}={v}" for k, v in sorted(r["dropped"].items())))
+    if config.amr:
+        print(f"🔴 A_M_R üyelik yakınsaması: {_fmt(r['a_m_r_converged_at'])}")
+    print("=" * 100)
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DiNC deterministik cluster simülatörü")
+    parser.add_argument("--nodes", type=int, default=100, help="Sanal node sayısı")
+    parser.add_argument("--duration", type=float, default=60.0, help="Sanal süre (saniye)")
+    parser.add_argument("--seed", type=int, default=1, help="Rastgelelik tohumu")
+    parser.add_argument("--policies", nargs="+", default=["p2c"], help="Karşılaştırılacak seçim politikaları")
+    # Trafik
+    parser.add_argument("--rate", type=float, default=3000.0, help="Toplam istek/saniye (Poisson)")
+    parser.add_argument("--traffic-start", type=float, default=5.0, help="Trafiğin başladığı an")
+    parser.add_argument("--hot-fraction", type=float, default=0.1, help="Sıcak node oranı")
+    parser.add_argument("--hot-share", type=float, default=0.5, help="Sıcak node'lara giren trafik oranı")
+    parser.add_argument("--warmup", type=float, default=15.0, help="Dengesizlik ölçümü başlangıcı")
+    # Node/CPU
+    parser.add_argument("--capacity", type=float, default=100.0, help="%%100 CPU'da node başı req/s")
+    parser.add_argument("--capacity-spread", type=float, nargs="+", default=[0.5, 1.0, 2.0],
+                        help="Kapasite çarpanları (node başına rastgele seçilir)")
+    parser.add_argument("--base-cpu", type=float, default=5.0, help="Boşta CPU (%%)")
+    parser.add_argument("--cpu-wave", type=float, default=0.0, help="Sinüs dalga genliği (%%)")
+    parser.add_argument("--cpu-period", type=float, default=30.0, help="Sinüs dalga periyodu (s)")
+    parser.add_argument("--cpu-threshold", type=float, default=70.0, help="Aşırı yük eşiği")
+    parser.add_argument("--cpu-interval", type=float, default=0.5, help="CPU örnekleme aralığı")
+    # Kontrol düzlemi
+    parser.add_argument("--heartbeat-interval", type=float, default=5.0)
+    parser.add_argument("--watch-wait", type=float, default=20.0)
+    parser.add_argument("--watch-min-interval", type=float, default=0.2)
+    parser.add_argument("--amr", action="store_true", help="A_M_R gossip + SWIM'i de çalıştır")
+    parser.add_argument("--gossip-interval", type=float, default=5.0)
+    # Ağ ve arızalar
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Tek yön ağ gecikmesi")
+    parser.add_argument("--jitter-ms", type=float, default=1.0, help="Gecikme sapması (±)")
+    parser.add_argument("--loss", type=float, default=0.0, help="Kontrol mesajı kayıp olasılığı")
+    parser.add_argument("--kill", type=int, default=0, help="kill-at anında öldürülecek node sayısı")
+    parser.add_argument("--kill-at", type=float, default=30.0)
+    args = parser.parse_args()
+
+    results = [Simulation(args, policy).run() for policy in args.policies]
+    print_results(args, results)
@@ -1,9 +1,21 @@
 """
 src/utils - DiNC projesinin yardımcı modülleri.
 """
-from .state import State, Peer
+from .state import State, Peer, ScoreWeights
+from .scheduler import Scheduler
 from .heartbeat import Heartbeat
 from .discovery import Discovery
-from .a_m_r import AMRClient, register_a_m_r_routes
+from .cpu_sampler import CPUSampler
+from .selection import POLICIES, make_policy
+from .forwarder import Forwarder
+from .peer_view import PeerViewPublisher, PeerViewSubscriber
+from .a_m_r import AMRClient, register_a_m_r_routes, register_a_m_r_proxy_routes, serve_a_m_r_control
+from .metrics import METRICS, MetricsRegistry
+from .admission import AdmissionController, LIMITS, make_limit
+from .breaker import PeerBreakers, CircuitOpenError
+from .snapshot import SnapshotWriter, load_snapshot, restore_snapshot
+from .failover import RegistryFailover
+from .replicas import RegistryReplicas
+from .status import StatusCache
 
-__all__ = ["State", "Peer", "Heartbeat", "Discovery", "AMRClient", "register_a_m_r_routes"]
+__all__ = ["State", "Peer", "ScoreWeights", "Scheduler", "Heartbeat", "Discovery", "CPUSampler", "POLICIES", "make_policy", "Forwarder", "PeerViewPublisher", "PeerViewSubscriber", "AMRClient", "register_a_m_r_routes", "register_a_m_r_proxy_routes", "serve_a_m_r_control", "METRICS", "MetricsRegistry", "AdmissionController", "LIMITS", "make_limit", "PeerBreakers", "CircuitOpenError", "SnapshotWriter", "load_snapshot", "restore_snapshot", "RegistryFailover", "RegistryReplicas", "StatusCache"]
@@ -8,31 +8,140 @@ Modülü:
 - state_sync: Durumları senkronize et
 """
 import threading
+import random
+import hashlib
+import heapq
+import math
 import time
 import requests
 import logging
-from typing import List, Dict, Set, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
+from .scheduler import Scheduler
+from .metrics import METRICS
+from .breaker import PeerBreakers, CircuitOpenError
+from . import codec
 
 logger = logging.getLogger(__name__)
 
+# Üyelik durumları; aynı incarnation'da sağdaki soldakini ezer
+ALIVE = "alive"
+SUSPECT = "suspect"
+DEAD = "dead"
+STATUS_RANK = {ALIVE: 0, SUSPECT: 1, DEAD: 2}
+
+MESSAGES = METRICS.counter("dinc_amr_messages_total", "Gönderilen A_M_R mesajları (tür ve sonuca göre)",
+                            ("kind", "result"))
+PROBES = METRICS.counter("dinc_amr_probes_total", "SWIM probe sonuçları", ("result",))
+TRANSITIONS = METRICS.counter("dinc_amr_member_transitions_total", "Üyelik durum geçişleri", ("status",))
+_PROBE_ACK = PROBES.labels("ack")
+_PROBE_INDIRECT = PROBES.labels("indirect_ack")
+_PROBE_SUSPECT = PROBES.labels("suspect")
+
+
+def _entry_hash(address: str, incarnation: int, status: str) -> int:
+    """Üyelik kaydının 64-bit özeti (process'ler arasında aynı; hash() değil)."""
+    digest = hashlib.blake2b(f"{address}|{incarnation}|{status}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HttpTransport:
+    """
+    A_M_R mesajlarını HTTP POST ile gönderir (keep-alive oturum).
+    Cevaplar msgpack/gzip ile istenir; bir kez msgpack ile cevap veren peer'a
+    istek gövdeleri de msgpack (büyükse gzip'li) gönderilir, diğerlerine JSON.
+    """
+    
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers["Accept"] = codec.ACCEPT
+        self._binary_peers = set()  # msgpack konuştuğu görülen peer'lar
+    
+    def post(self, peer_addr: str, path: str, payload: Dict, timeout: float) -> Dict:
+        """Peer'a mesajı gönderir ve çözülmüş cevabı döndürür; hata durumunda exception fırlatır."""
+        binary = peer_addr in self._binary_peers
+        body, headers = codec.encode(payload, binary=binary, compress=binary)
+        response = self.session.post(f"{peer_addr}{path}", data=body, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        if not binary and codec.is_binary(response.headers.get("Content-Type")):
+            self._binary_peers.add(peer_addr)
+        return codec.decode_response(response)
+
 
 class AMRClient:
-    """Attack Mode Request - P2P node iletişimi"""
+    """
+    Attack Mode Request - P2P node iletişimi
+    
+    Üyelik listesi delta tabanlı gossip ile yayılır: her tur birkaç rastgele
+    peer seçilir ve sadece karşı tarafın henüz görmediği kayıtlar gönderilir.
+    Her yerel değişiklik mantıksal saati (clock) artırır ve kayda damgalanır;
+    her peer için "onun saatinden ne kadarını gördüm" ve "benim saatimden ne
+    kadarını o gördü" tutulur. Tablonun XOR özeti (digest) aynı olan iki
+    node kayıt göndermez.
+    
+    Hata tespiti SWIM benzeridir: her probe turunda tek bir peer'a ping atılır
+    (karıştırılmış sırayla), cevap gelmezse k başka peer üzerinden dolaylı
+    ping (ping-req) denenir. O da başarısızsa peer önce "suspect" olur ve
+    zaman aşımı dolana kadar kendini yalanlamazsa "dead" ilan edilir.
+    Son değişen kayıtlar ping mesajlarına da eklenir (piggyback).
+    """
     
-    def __init__(self, my_address: str, known_peers: List[str] = None):
+    def __init__(self, my_address: str, known_peers: List[str] = None,
+                 scheduler: Optional[Scheduler] = None, transport=None,
+                 fanout: int = 3, rng: Optional[random.Random] = None,
+                 probe_interval: float = 1.0, probe_timeout: float = 0.5,
+                 indirect_probes: int = 3, suspicion_mult: float = 4.0,
+                 piggyback: int = 6, time_fn: Callable[[], float] = time.monotonic,
+                 parallel_probes: bool = True, breakers: Optional[PeerBreakers] = None):
         """
         Args:
             my_address: Bu node'un adresi (http://host:port)
             known_peers: Bilinen peer'ların adresleri
+            scheduler: Periyodik görevlerin ekleneceği zamanlayıcı
+            transport: post(peer, path, payload, timeout) sağlayan nesne (varsayılan HTTP)
+            fanout: Her gossip turunda iletişime geçilen peer sayısı
+            probe_interval: Probe turu aralığı (saniye)
+            probe_timeout: Doğrudan ping için zaman aşımı
+            indirect_probes: Doğrudan ping başarısızsa ping-req gönderilecek peer sayısı (k)
+            suspicion_mult: Suspect zaman aşımı = mult * log10(N) * probe_interval
+            piggyback: Ping mesajlarına eklenecek en son değişmiş kayıt sayısı
+            time_fn: Suspect zamanlayıcıları için saat
+            parallel_probes: ping-req'leri paralel gönder (False: sırayla; deterministik simülasyon için)
+            breakers: Peer başına devre kesiciler (Discovery ile ortak); açık peer'a mesaj gönderilmez
         """
         self.my_address = my_address
-        self.active_peers: Set[str] = set(known_peers or [])
-        self.active_peers.discard(my_address)  # Kendisini çıkar
+        self.transport = transport or HttpTransport()
+        self.breakers = breakers
+        self.fanout = fanout
+        self.rng = rng or random.Random()
+        
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.indirect_probes = indirect_probes
+        self.suspicion_mult = suspicion_mult
+        self.piggyback = piggyback
+        self.time_fn = time_fn
+        self._probe_order: List[str] = []
+        self._suspect_since: Dict[str, float] = {}
+        self._probe_pool = ThreadPoolExecutor(max_workers=max(1, indirect_probes),
+                                              thread_name_prefix="a_m_r-probe") if parallel_probes else None
         
         self.lock = threading.RLock()
         self.running = False
-        self.threads: List[threading.Thread] = []
+        self.scheduler = scheduler or Scheduler()
+        
+        # address -> {"incarnation", "status", "version"}
+        self.clock = 0
+        self.members: Dict[str, Dict] = {}
+        self.digest = 0
+        self.incarnation = 0
+        self._set_member(my_address, 0, ALIVE)
+        for peer in known_peers or []:
+            self.add_peer(peer)
+        
+        self._seen_clock: Dict[str, int] = {}  # peer -> onun saatinden gördüğümüz son değer
+        self._acked_clock: Dict[str, int] = {}  # peer -> bizim saatimizden onun gördüğü son değer
         
         logger.info(f"🔴 A_M_R initialized for {my_address}")
     
@@ -45,130 +154,339 @@ class AMRClient:
         self.running = True
         logger.info(f"🔴 A_M_R mode ACTIVATED (interval={interval}s)")
         
-        # P2P botlist polling thread'i
-        thread = threading.Thread(
-            target=self._botlist_sync_loop,
-            args=(interval,),
-            daemon=True
-        )
-        thread.start()
-        self.threads.append(thread)
-        
-        # P2P health check thread'i
-        health_thread = threading.Thread(
-            target=self._peer_health_loop,
-            args=(interval * 2,),
-            daemon=True
-        )
-        health_thread.start()
-        self.threads.append(health_thread)
+        # P2P gossip ve hata tespiti görevleri
+        self.scheduler.add("a_m_r-gossip", self.gossip_round, interval)
+        self.scheduler.add("a_m_r-probe", self.probe_round, self.probe_interval)
+        self.scheduler.start()
     
     def stop(self):
         """P2P modunu durdur"""
         self.running = False
-        for thread in self.threads:
-            thread.join(timeout=2)
+        self.scheduler.cancel("a_m_r-gossip")
+        self.scheduler.cancel("a_m_r-probe")
         logger.info("🟢 A_M_R mode DEACTIVATED")
     
+    def _set_member(self, address: str, incarnation: int, status: str):
+        """Üyelik kaydını yazar, özeti günceller ve saati ilerletir. Lock altında çağrılmalı."""
+        old = self.members.get(address)
+        if old:
+            self.digest ^= _entry_hash(address, old["incarnation"], old["status"])
+        if old is None or old["status"] != status:
+            TRANSITIONS.labels(status).inc()
+        self.digest ^= _entry_hash(address, incarnation, status)
+        self.clock += 1
+        self.members[address] = {"incarnation": incarnation, "status": status, "version": self.clock}
+        if status == SUSPECT:
+            self._suspect_since.setdefault(address, self.time_fn())
+        else:
+            self._suspect_since.pop(address, None)
+    
     def add_peer(self, peer_address: str):
         """Yeni peer ekle"""
-        if peer_address != self.my_address:
-            with self.lock:
-                self.active_peers.add(peer_address)
-            logger.info(f"➕ Peer eklendi: {peer_address}")
+        if peer_address == self.my_address:
+            return
+        with self.lock:
+            if peer_address in self.members:
+                return
+            self._set_member(peer_address, 0, ALIVE)
+        logger.info(f"➕ Peer eklendi: {peer_address}")
+    
+    def mark_suspect(self, peer_address: str):
+        """Peer'ı şüpheli olarak işaretle; zaman aşımına kadar yalanlamazsa ölü sayılır."""
+        with self.lock:
+            member = self.members.get(peer_address)
+            if member and member["status"] == ALIVE:
+                self._set_member(peer_address, member["incarnation"], SUSPECT)
+                logger.info(f"❓ Peer suspect: {peer_address}")
+    
+    def mark_dead(self, peer_address: str):
+        """Peer'ı ölü olarak işaretle (kayıt gossip ile yayılır)."""
+        with self.lock:
+            member = self.members.get(peer_address)
+            if member and member["status"] != DEAD:
+                self._set_member(peer_address, member["incarnation"], DEAD)
+                logger.warning(f"💀 Dead peer removed: {peer_address}")
+    
+    def suspicion_timeout(self) -> float:
+        """Suspect durumundan dead'e geçiş süresi; üye sayısıyla logaritmik büyür."""
+        with self.lock:
+            size = len(self.members)
+        return self.suspicion_mult * max(1.0, math.log10(max(size, 1))) * self.probe_interval
+    
+    def expire_suspects(self) -> List[str]:
+        """Zaman aşımı dolan suspect peer'ları dead ilan eder. Dönüş: ölen peer'lar."""
+        deadline = self.time_fn() - self.suspicion_timeout()
+        with self.lock:
+            expired = [addr for addr, since in self._suspect_since.items() if since <= deadline]
+        for addr in expired:
+            self.mark_dead(addr)
+        return expired
     
     def get_active_peers(self) -> List[str]:
         """Aktif peer'ları döndür"""
         with self.lock:
-            return list(self.active_peers)
+            return [addr for addr, m in self.members.items()
+                    if m["status"] != DEAD and addr != self.my_address]
     
-    def _botlist_sync_loop(self, interval: int):
+    def merge(self, entries: List[Dict]) -> int:
         """
-        Periyodik olarak peer'lardan botlist (aktif node listesi) al.
-        Her peer'ın bildiği node'ları toplayıp birleştir.
+        Gelen üyelik kayıtlarını birleştirir.
+        Yüksek incarnation kazanır; eşitse daha kötü durum (dead) kazanır.
+        Dönüş: Değişen kayıt sayısı
         """
-        logger.info("🤖 Botlist sync loop başladı")
-        
-        while self.running:
-            try:
-                peers = self.get_active_peers()
+        changed = 0
+        with self.lock:
+            for entry in entries:
+                address = entry["address"]
+                incarnation = entry.get("incarnation", 0)
+                status = entry.get("status", ALIVE)
                 
-                for peer_addr in peers[:]:  # Copy üzerinde iterate et
-                    if not self.running:
-                        break
-                    
-                    try:
-                        # Peer'ın botlist'ini iste
-                        response = requests.get(
-                            f"{peer_addr}/a_m_r/botlist",
-                            timeout=3
-                        )
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            botlist = data.get("peers", [])
-                            
-                            # Yeni peer'ları ekle
-                            for new_peer in botlist:
-                                if new_peer not in self.active_peers:
-                                    self.add_peer(new_peer)
-                            
-                            logger.debug(f"📋 {peer_addr} -> {len(botlist)} peer")
-                    except Exception as e:
-                        logger.debug(f"❌ Botlist error ({peer_addr}): {e}")
+                if address == self.my_address:
+                    # Hakkımızda yanlış bilgi: incarnation'ı artırıp canlı olduğumuzu duyur
+                    if status != ALIVE and incarnation >= self.incarnation:
+                        self.incarnation = incarnation + 1
+                        self._set_member(address, self.incarnation, ALIVE)
+                        changed += 1
+                    continue
                 
-                time.sleep(interval)
-            
-            except Exception as e:
-                logger.error(f"Botlist sync error: {e}")
-                time.sleep(interval)
+                current = self.members.get(address)
+                if (current is None
+                        or incarnation > current["incarnation"]
+                        or (incarnation == current["incarnation"]
+                            and STATUS_RANK.get(status, 0) > STATUS_RANK.get(current["status"], 0))):
+                    self._set_member(address, incarnation, status)
+                    changed += 1
+        return changed
     
-    def _peer_health_loop(self, interval: int):
+    def restore(self, entries: List[Dict], incarnation: int = 0) -> int:
+        """
+        Önceki çalışmadan kalan üyelik tablosunu yükler (warm start).
+        Diğerleri bizi bu arada suspect/dead ilan etmiş olabilir; eski
+        incarnation'ı bir artırarak canlı olduğumuzu baştan duyururuz.
+        Dönüş: Eklenen/değişen kayıt sayısı
         """
-        Periyodik olarak peer'ların sağlığını kontrol et.
-        Ölü peer'ları listeden çıkar.
+        with self.lock:
+            if incarnation >= self.incarnation:
+                self.incarnation = incarnation + 1
+                self._set_member(self.my_address, self.incarnation, ALIVE)
+        return self.merge(entries)
+    
+    def recent_updates(self) -> List[Dict]:
+        """Ping mesajlarına eklenecek en son değişmiş kayıtlar."""
+        with self.lock:
+            latest = heapq.nlargest(self.piggyback, self.members.items(), key=lambda item: item[1]["version"])
+            return [{"address": addr, "incarnation": m["incarnation"], "status": m["status"]}
+                    for addr, m in latest]
+    
+    def delta_since(self, version: int) -> List[Dict]:
+        """Yerel saatte version'dan sonra değişen kayıtları döndürür."""
+        with self.lock:
+            return [
+                {"address": addr, "incarnation": m["incarnation"], "status": m["status"]}
+                for addr, m in self.members.items()
+                if m["version"] > version
+            ]
+    
+    def handle_sync(self, payload: Dict) -> Dict:
         """
-        logger.info("❤️  Peer health check loop başladı")
+        /a_m_r/sync gossip mesajını işler.
+        Özetler aynıysa boş cevap döner; değilse cevap, gönderenin bizden
+        henüz görmediği kayıtları içerir. probe=True mesajlarında kayıt yoktur.
+        """
+        sender = payload["from"]
+        sender_clock = payload.get("clock", 0)
+        with self.lock:
+            if payload.get("digest") == self.digest:
+                # Tablolar aynı: iki taraf da birbirinin şimdiki saatine kadar her şeyi görmüş
+                self._seen_clock[sender] = max(self._seen_clock.get(sender, 0), sender_clock)
+                return {"from": self.my_address, "clock": self.clock, "ack": sender_clock,
+                        "digest": self.digest, "in_sync": True, "entries": []}
+            
+            # Cevabı birleştirmeden önce hazırla; gönderenin kayıtlarını ona geri yollama
+            reply = {"from": self.my_address, "clock": self.clock, "ack": 0,
+                     "digest": self.digest, "in_sync": False,
+                     "entries": self.delta_since(payload.get("since", 0))}
+            if not payload.get("probe"):
+                self.merge(payload.get("entries", []))
+                self._seen_clock[sender] = max(self._seen_clock.get(sender, 0), sender_clock)
+                reply["ack"] = sender_clock
+        return reply
+    
+    def _post(self, peer_addr: str, path: str, payload: Dict, timeout: float) -> Dict:
+        """Transport üzerinden mesaj gönderir ve sonucu metriklere sayar."""
+        kind = path.rsplit("/", 1)[-1]
+        breakers = self.breakers
+        if breakers is not None and not breakers.allow(peer_addr):
+            MESSAGES.labels(kind, "open").inc()
+            raise CircuitOpenError(peer_addr)
+        try:
+            reply = self.transport.post(peer_addr, path, payload, timeout=timeout)
+        except Exception:
+            MESSAGES.labels(kind, "error").inc()
+            if breakers is not None:
+                breakers.record_failure(peer_addr)
+            raise
+        MESSAGES.labels(kind, "ok").inc()
+        if breakers is not None:
+            breakers.record_success(peer_addr)
+        return reply
+    
+    def _exchange(self, peer_addr: str, probe: bool) -> Dict:
+        """Peer'a özet ve (probe değilse) onun görmediği kayıtları gönderir; cevabı uygular."""
+        with self.lock:
+            payload = {
+                "from": self.my_address,
+                "clock": self.clock,
+                "since": self._seen_clock.get(peer_addr, 0),
+                "digest": self.digest,
+                "probe": probe,
+                "entries": [] if probe else self.delta_since(self._acked_clock.get(peer_addr, 0)),
+            }
+        reply = self._post(peer_addr, "/a_m_r/sync", payload, timeout=3)
         
-        while self.running:
-            try:
-                peers = self.get_active_peers()
-                dead_peers = []
-                
-                for peer_addr in peers:
-                    try:
-                        response = requests.get(
-                            f"{peer_addr}/health",
-                            timeout=2
-                        )
-                        
-                        if response.status_code != 200:
-                            dead_peers.append(peer_addr)
-                    except:
-                        dead_peers.append(peer_addr)
-                
-                # Ölü peer'ları çıkar
+        self.merge(reply.get("entries", []))
+        with self.lock:
+            ack = payload["clock"] if reply.get("in_sync") else reply.get("ack", 0)
+            self._acked_clock[peer_addr] = max(self._acked_clock.get(peer_addr, 0), ack)
+            self._seen_clock[peer_addr] = max(self._seen_clock.get(peer_addr, 0), reply.get("clock", 0))
+        return reply
+    
+    def gossip_with(self, peer_addr: str) -> bool:
+        """
+        Tek bir peer ile push-pull delta değişimi yapar.
+        Önce özet ve "bende senden şu saate kadar var" gider; peer eksiklerimizi
+        döndürür. Tablolar hâlâ farklıysa ikinci mesajla onun eksikleri gönderilir.
+        Değişiklik yokken tur başına tek küçük mesaj gider.
+        """
+        try:
+            reply = self._exchange(peer_addr, probe=True)
+            if not reply.get("in_sync"):
                 with self.lock:
-                    for dead_peer in dead_peers:
-                        if dead_peer in self.active_peers:
-                            self.active_peers.discard(dead_peer)
-                            logger.warning(f"💀 Dead peer removed: {dead_peer}")
-                
-                time.sleep(interval)
-            
-            except Exception as e:
-                logger.error(f"Health check error: {e}")
-                time.sleep(interval)
+                    in_sync = self.digest == reply.get("digest")
+                if not in_sync:
+                    self._exchange(peer_addr, probe=False)
+        except Exception as e:
+            logger.debug(f"❌ Gossip error ({peer_addr}): {e}")
+            return False
+        return True
+    
+    def gossip_round(self):
+        """Rastgele fanout kadar peer ile gossip yapar."""
+        peers = self.get_active_peers()
+        targets = self.rng.sample(peers, min(self.fanout, len(peers)))
+        for peer_addr in targets:
+            if not self.running:
+                break
+            self.gossip_with(peer_addr)
+    
+    # ------------------------------------------------------------------
+    # SWIM hata tespiti
+    # ------------------------------------------------------------------
+    
+    def handle_ping(self, payload: Dict) -> Dict:
+        """/a_m_r/ping: piggyback kayıtları birleştirir ve ack döner."""
+        self.merge(payload.get("entries", []))
+        sender = payload.get("from")
+        if sender:
+            self.add_peer(sender)
+        return {"from": self.my_address, "ack": True, "entries": self.recent_updates()}
+    
+    def handle_ping_req(self, payload: Dict) -> Dict:
+        """/a_m_r/ping-req: hedefi gönderen adına pingler."""
+        self.merge(payload.get("entries", []))
+        return {"from": self.my_address, "ack": self.ping(payload["target"]),
+                "entries": self.recent_updates()}
+    
+    def ping(self, target: str) -> bool:
+        """Hedefe doğrudan ping atar. Dönüş: ack alındı mı?"""
+        payload = {"from": self.my_address, "entries": self.recent_updates()}
+        try:
+            reply = self._post(target, "/a_m_r/ping", payload, timeout=self.probe_timeout)
+        except Exception:
+            return False
+        self.merge(reply.get("entries", []))
+        return bool(reply.get("ack"))
+    
+    def _ping_via(self, helper: str, target: str) -> bool:
+        """helper üzerinden hedefe dolaylı ping atar."""
+        payload = {"from": self.my_address, "target": target, "entries": self.recent_updates()}
+        try:
+            # Yardımcının kendi ping'inin süresi de bu zaman aşımına dahil
+            reply = self._post(helper, "/a_m_r/ping-req", payload, timeout=self.probe_timeout * 2)
+        except Exception:
+            return False
+        self.merge(reply.get("entries", []))
+        return bool(reply.get("ack"))
+    
+    def probe(self, target: str) -> bool:
+        """
+        Hedefi doğrudan, olmazsa k rastgele peer üzerinden dolaylı pingler.
+        Hiç ack gelmezse hedef suspect olur. Dönüş: hedef canlı mı?
+        """
+        if self.ping(target):
+            _PROBE_ACK.inc()
+            return True
+        
+        helpers = [p for p in self.get_active_peers() if p != target]
+        helpers = self.rng.sample(helpers, min(self.indirect_probes, len(helpers)))
+        if helpers and self._probe_pool is None:
+            if any([self._ping_via(helper, target) for helper in helpers]):
+                _PROBE_INDIRECT.inc()
+                return True
+        elif helpers:
+            futures = [self._probe_pool.submit(self._ping_via, helper, target) for helper in helpers]
+            if any(future.result() for future in futures):
+                _PROBE_INDIRECT.inc()
+                return True
+        
+        _PROBE_SUSPECT.inc()
+        self.mark_suspect(target)
+        return False
+    
+    def _next_probe_target(self) -> Optional[str]:
+        """Karıştırılmış sıradaki bir sonraki hedef; her peer N turda en az bir kez seçilir."""
+        with self.lock:
+            while self._probe_order:
+                target = self._probe_order.pop()
+                member = self.members.get(target)
+                if member and member["status"] != DEAD:
+                    return target
+        
+        peers = self.get_active_peers()
+        if not peers:
+            return None
+        self.rng.shuffle(peers)
+        with self.lock:
+            self._probe_order = peers
+            return self._probe_order.pop()
+    
+    def probe_round(self):
+        """Tek bir peer'ı probe eder ve süresi dolan suspect'leri dead ilan eder."""
+        target = self._next_probe_target()
+        if target and self.running:
+            self.probe(target)
+        self.expire_suspects()
+    
+    def member_counts(self) -> Dict[str, int]:
+        """Üyelik tablosundaki kayıt sayıları (duruma göre)."""
+        counts = {ALIVE: 0, SUSPECT: 0, DEAD: 0}
+        with self.lock:
+            for member in self.members.values():
+                counts[member["status"]] += 1
+        return counts
     
     def get_stats(self) -> Dict:
         """A_M_R durumunu rapor et"""
         peers = self.get_active_peers()
+        with self.lock:
+            suspects = sorted(self._suspect_since)
         return {
             "mode": "A_M_R",
             "status": "active" if self.running else "inactive",
             "my_address": self.my_address,
             "active_peers_count": len(peers),
             "active_peers": peers,
+            "suspect_peers": suspects,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -195,22 +513,26 @@ def register_a_m_r_routes(app, a_m_r_client: AMRClient):
     @app.route("/a_m_r/botlist", methods=["GET"])
     def a_m_r_botlist():
         """Bu node'un bildiği aktif peer'ları döndür"""
-        from flask import jsonify
         peers = a_m_r_client.get_active_peers()
-        return jsonify({
+        return codec.respond({
             "address": a_m_r_client.my_address,
             "peers": peers,
             "count": len(peers),
             "timestamp": datetime.now().isoformat()
-        }), 200
+        })
     
     @app.route("/a_m_r/sync", methods=["POST"])
     def a_m_r_sync():
-        """Dış kaynaktan peer'ları senkronize et"""
-        from flask import request, jsonify
+        """Gossip delta değişimi ya da dış kaynaktan peer listesi senkronizasyonu"""
+        from flask import jsonify
         
         try:
-            data = request.get_json()
+            data = codec.request_body()
+            
+            # Gossip mesajı: delta al, delta döndür
+            if "from" in data:
+                return codec.respond(a_m_r_client.handle_sync(data))
+            
             new_peers = data.get("peers", [])
             
             added = 0
@@ -227,6 +549,19 @@ def register_a_m_r_routes(app, a_m_r_client: AMRClient):
         except Exception as e:
             return jsonify({"error": str(e)}), 400
     
+    @app.route("/a_m_r/ping", methods=["POST"])
+    def a_m_r_ping():
+        """SWIM doğrudan probe"""
+        return codec.respond(a_m_r_client.handle_ping(codec.request_body() or {}))
+    
+    @app.route("/a_m_r/ping-req", methods=["POST"])
+    def a_m_r_ping_req():
+        """SWIM dolaylı probe: hedefi gönderen adına pingle"""
+        data = codec.request_body() or {}
+        if "target" not in data:
+            return codec.respond({"error": "target gerekli"}, 400)
+        return codec.respond(a_m_r_client.handle_ping_req(data))
+    
     @app.route("/a_m_r/activate", methods=["POST"])
     def a_m_r_activate():
         """A_M_R modunu manuel başlat (registry düştüğünde otomatik olur)"""
@@ -251,6 +586,56 @@ def register_a_m_r_routes(app, a_m_r_client: AMRClient):
         }), 200
 
 
+# İstek ve cevapta kontrol düzlemi process'ine olduğu gibi taşınan başlıklar
+CONTROL_HEADERS = ("Content-Type", "Content-Encoding", "Accept", "Accept-Encoding")
+
+
+def serve_a_m_r_control(a_m_r_client: AMRClient, host: str = "127.0.0.1") -> str:
+    """
+    A_M_R route'larını bu process'te, sadece yerelden erişilen ayrı bir
+    sunucuda çalıştırır ve adresini döndürür. Çok worker'lı modda üyelik
+    tablosu, gossip ve probe'ların çalıştığı kontrol düzlemi process'inde
+    tek kopya kalır; worker'lar gelen A_M_R isteklerini buraya aktarır.
+    """
+    from flask import Flask
+    from werkzeug.serving import make_server
+    
+    control_app = Flask("a_m_r_control")
+    register_a_m_r_routes(control_app, a_m_r_client)
+    server = make_server(host, 0, control_app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True, name="a_m_r-control").start()
+    url = f"http://{host}:{server.server_port}"
+    logger.info(f"🔗 A_M_R kontrol sunucusu: {url}")
+    return url
+
+
+def register_a_m_r_proxy_routes(app, control_url: str, timeout: float = 5.0):
+    """
+    /a_m_r/* isteklerini serve_a_m_r_control() sunucusuna aktaran route'lar
+    (gunicorn worker'ları için). Gövde sıkıştırılmış olsa da açılmadan taşınır.
+    """
+    from flask import Response, jsonify, request
+    
+    sessions = threading.local()  # Worker'da thread başına keep-alive bağlantı
+    
+    @app.route("/a_m_r/<path:path>", methods=["GET", "POST"])
+    def a_m_r_proxy(path):
+        session = getattr(sessions, "session", None)
+        if session is None:
+            session = sessions.session = requests.Session()
+        try:
+            upstream = session.request(
+                request.method, f"{control_url}/a_m_r/{path}", data=request.get_data(),
+                headers={h: request.headers[h] for h in CONTROL_HEADERS if h in request.headers},
+                timeout=timeout, stream=True)
+            body = upstream.raw.read(decode_content=False)
+        except requests.RequestException as e:
+            logger.warning(f"⚠️  A_M_R kontrol sunucusuna ulaşılamadı: {e}")
+            return jsonify({"error": "A_M_R kontrol düzlemi cevap vermiyor"}), 503
+        headers = {h: upstream.headers[h] for h in (*CONTROL_HEADERS, "Vary") if h in upstream.headers}
+        return Response(body, status=upstream.status_code, headers=headers)
+
+
 if __name__ == "__main__":
     # Test
     logging.basicConfig(level=logging.INFO)
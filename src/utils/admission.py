@@ -0,0 +1,201 @@
+"""
+src/utils/admission.py - Kabul kontrolü (admission control) ve yük atma.
+Aşırı yüklü node isteği sıraya alıp yavaşça cevaplamak yerine sınırın üstünü
+hemen reddeder: kuyrukta bekleyen istekler zaman aşımına uğrayıp yeniden
+denendiğinde iş hacmi çöker (goodput collapse). Sınır sabit değil, gözlenen
+gecikmeye göre uyarlanır (AIMD ya da gradyan); istemci başına token bucket tek
+bir istemcinin kapasitenin tamamını tüketmesini önler.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+class ConcurrencyLimit:
+    """Eşzamanlı istek sınırı; her tamamlanan istekle güncellenir."""
+
+    name = "base"
+
+    def __init__(self, initial: int = 20, min_limit: int = 1, max_limit: int = 200):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial)
+
+    def _clamp(self, value: float) -> float:
+        return max(self.min_limit, min(self.max_limit, value))
+
+    def update(self, rtt_ms: float, inflight: int, dropped: bool):
+        """
+        Args:
+            rtt_ms: Tamamlanan isteğin süresi
+            inflight: İstek başladığında işlenmekte olan istek sayısı
+            dropped: İstek başarısız oldu mu (hata/zaman aşımı)
+        """
+        raise NotImplementedError
+
+
+class AIMDLimit(ConcurrencyLimit):
+    """
+    Toplamsal artış, çarpımsal azalış (TCP gibi). Gecikme hedefi aşılır ya da
+    istek düşerse sınır backoff ile çarpılır; aksi halde sınır doluyken her
+    istekte 1/limit artar (yaklaşık her "tur"da +1).
+    """
+
+    name = "aimd"
+
+    def __init__(self, initial: int = 20, min_limit: int = 1, max_limit: int = 200,
+                 latency_target_ms: float = 250.0, backoff: float = 0.9):
+        super().__init__(initial, min_limit, max_limit)
+        self.latency_target_ms = latency_target_ms
+        self.backoff = backoff
+
+    def update(self, rtt_ms, inflight, dropped):
+        if dropped or rtt_ms > self.latency_target_ms:
+            self.limit = self._clamp(self.limit * self.backoff)
+        elif inflight * 2 >= self.limit:
+            # Sınırın yarısı bile kullanılmıyorsa artırmak için kanıt yok (app-limited)
+            self.limit = self._clamp(self.limit + 1.0 / self.limit)
+
+
+class GradientLimit(ConcurrencyLimit):
+    """
+    Kısa ve uzun vadeli gecikme ortalamalarının oranıyla sınırı ayarlar
+    (Netflix concurrency-limits Gradient2 yaklaşımı). Kısa vadeli gecikme uzun
+    vadelinin tolerance katını aştıkça gradyan 1'in altına düşer ve sınır
+    küçülür; sqrt(limit) kadar pay kuyruk için bırakılır.
+    """
+
+    name = "gradient"
+
+    def __init__(self, initial: int = 20, min_limit: int = 1, max_limit: int = 200,
+                 tolerance: float = 1.5, smoothing: float = 0.2, short_window: int = 10,
+                 long_window: int = 600):
+        super().__init__(initial, min_limit, max_limit)
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.short_alpha = 2.0 / (short_window + 1)
+        self.long_alpha = 2.0 / (long_window + 1)
+        self.short_rtt = 0.0
+        self.long_rtt = 0.0
+
+    def update(self, rtt_ms, inflight, dropped):
+        if self.long_rtt == 0.0:
+            self.short_rtt = self.long_rtt = rtt_ms
+        self.short_rtt += self.short_alpha * (rtt_ms - self.short_rtt)
+        self.long_rtt += self.long_alpha * (rtt_ms - self.long_rtt)
+        # Uzun süreli yükten sonra uzun vadeli ortalama yüksekte kalır; hızla geri çek
+        if self.long_rtt / max(self.short_rtt, 1e-6) > 2:
+            self.long_rtt *= 0.95
+
+        # Sınır kullanılmıyorsa gecikme sınır hakkında bilgi vermez
+        if inflight * 2 < self.limit and not dropped:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / max(self.short_rtt, 1e-6)))
+        if dropped:
+            gradient = 0.5
+        target = self.limit * gradient + math.sqrt(self.limit)
+        self.limit = self._clamp(self.limit * (1 - self.smoothing) + target * self.smoothing)
+
+
+LIMITS = {cls.name: cls for cls in (AIMDLimit, GradientLimit)}
+
+
+def make_limit(name: str, **kwargs) -> Optional[ConcurrencyLimit]:
+    """İsme göre sınır algoritması oluşturur ("off" = sınırsız, None)."""
+    if name == "off":
+        return None
+    if name not in LIMITS:
+        raise ValueError(f"Bilinmeyen eşzamanlılık sınırı: {name} (seçenekler: off, {', '.join(LIMITS)})")
+    if name != "aimd":
+        kwargs.pop("latency_target_ms", None)
+    return LIMITS[name](**kwargs)
+
+
+class TokenBucket:
+    """Saniyede rate token dolan, en fazla burst token biriktiren kova."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Bir token harcar. Dönüş: 0 (izin verildi) ya da token dolana kadar beklenecek saniye."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    İstemci başına hız sınırı ve uyarlanabilir eşzamanlılık sınırı.
+    Sınırlar worker başınadır (gunicorn modunda her worker kendi sınırını öğrenir).
+    """
+
+    def __init__(self, limit: Optional[ConcurrencyLimit] = None, client_rate: float = 0.0,
+                 client_burst: float = 0.0, max_clients: int = 10000,
+                 time_fn: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            limit: Eşzamanlılık sınırı algoritması (None = sınırsız)
+            client_rate: İstemci başına saniyede izin verilen istek (0 = kapalı)
+            client_burst: İstemcinin art arda gönderebileceği istek (0 = rate ile aynı)
+            max_clients: Takip edilen en fazla istemci; en uzun süredir görülmeyen atılır
+        """
+        self.limit = limit
+        self.client_rate = client_rate
+        self.client_burst = client_burst or max(1.0, client_rate)
+        self.max_clients = max_clients
+        self.time_fn = time_fn
+        self.inflight = 0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def current_limit(self) -> Optional[int]:
+        return int(self.limit.limit) if self.limit else None
+
+    def check_client(self, client: str) -> float:
+        """İstemcinin kovasından bir token harcar. Dönüş: 0 ya da Retry-After (saniye)."""
+        if not self.client_rate:
+            return 0.0
+        now = self.time_fn()
+        with self.lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.client_rate, self.client_burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket.take(now)
+
+    def try_acquire(self) -> Optional[int]:
+        """
+        Sınır doluysa None, değilse başlangıçtaki in-flight sayısını döndürür
+        (release()'e geri verilir).
+        """
+        with self.lock:
+            if self.limit and self.inflight >= self.limit.limit:
+                return None
+            self.inflight += 1
+            return self.inflight
+
+    def release(self, token: int, rtt_ms: Optional[float] = None, dropped: bool = False):
+        """
+        Kabul edilen istek bitti; sınırı gözlenen süreyle günceller.
+        rtt_ms None ise (istek yönlendirildi) sınır güncellenmez.
+        """
+        with self.lock:
+            self.inflight -= 1
+            if self.limit and rtt_ms is not None:
+                self.limit.update(rtt_ms, token, dropped)
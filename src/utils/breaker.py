@@ -0,0 +1,189 @@
+"""
+src/utils/breaker.py - Peer başına devre kesici (circuit breaker).
+Cevap vermeyen bir peer her turda tam zaman aşımı kadar bekletir ve son (belki
+çok iyi) skoruyla yönlendirme hedefi olarak kalmaya devam eder. Art arda
+hatalardan sonra devre açılır: peer'a istek gönderilmez ve seçilebilir peer'lar
+arasından hemen çıkarılır. Bekleme süresi her açılışta ikiye katlanır (jitter'lı);
+süre dolunca tek bir deneme isteğine izin verilir (half-open), başarılıysa devre
+kapanır. Discovery, Heartbeat ve AMRClient aynı PeerBreakers nesnesini paylaşır.
+"""
+import random
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+TRANSITIONS = METRICS.counter("dinc_breaker_transitions_total", "Devre kesici durum geçişleri", ("state",))
+REJECTED = METRICS.counter("dinc_breaker_rejected_total", "Açık devre yüzünden gönderilmeyen istekler")
+
+
+class CircuitOpenError(Exception):
+    """Peer'ın devresi açık; istek gönderilmedi."""
+
+
+class CircuitBreaker:
+    """Tek bir peer'ın devre durumu. PeerBreakers lock'u altında kullanılır."""
+
+    __slots__ = ("state", "failures", "opens", "retry_at", "trial_inflight")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0        # Art arda hata sayısı
+        self.opens = 0           # Son kapanıştan beri art arda açılma (backoff üssü)
+        self.retry_at = 0.0      # Açık devrede deneme isteğine izin verilecek zaman
+        self.trial_inflight = False
+
+    def to_dict(self) -> Dict:
+        return {"state": self.state, "failures": self.failures, "opens": self.opens,
+                "retry_at": round(self.retry_at, 3)}
+
+
+class PeerBreakers:
+    """
+    Adres başına devre kesiciler.
+    Durum değiştiğinde (açıldı/kapandı) abonelere (address, open) bildirilir;
+    State bununla açık peer'ları seçimden çıkarır.
+    """
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 1.0, max_backoff: float = 60.0,
+                 jitter: float = 0.2, time_fn: Callable[[], float] = time.monotonic,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            failure_threshold: Devreyi açan art arda hata sayısı
+            base_backoff: İlk açılışta bekleme (saniye); her açılışta ikiye katlanır
+            max_backoff: Bekleme üst sınırı
+            jitter: Beklemeye eklenen rastgele pay (±oran); peer'lar aynı anda denenmesin
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.time_fn = time_fn
+        self.rng = rng or random.Random()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+        self._listeners: List[Callable[[str, bool], None]] = []
+
+    def subscribe(self, listener: Callable[[str, bool], None]):
+        """Devre açılıp kapandığında listener(address, open) çağrılır."""
+        self._listeners.append(listener)
+
+    def _notify(self, address: str, is_open: bool):
+        for listener in self._listeners:
+            try:
+                listener(address, is_open)
+            except Exception as e:
+                logger.error(f"Devre kesici dinleyicisi hata verdi: {e}")
+
+    def backoff(self, opens: int) -> float:
+        """opens. açılıştaki bekleme süresi (jitter'lı)."""
+        delay = min(self.max_backoff, self.base_backoff * (2 ** (opens - 1)))
+        return delay * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def allow(self, address: str) -> bool:
+        """
+        Peer'a istek gönderilebilir mi? Açık devrede bekleme dolduysa tek bir
+        deneme isteğine izin verir (half-open); sonucu record_* ile bildirilmelidir.
+        """
+        breaker = self.breakers.get(address)
+        if breaker is None or breaker.state == CLOSED:
+            return True
+        with self.lock:
+            if breaker.state == OPEN and self.time_fn() >= breaker.retry_at:
+                breaker.state = HALF_OPEN
+                breaker.trial_inflight = False
+                TRANSITIONS.labels(HALF_OPEN).inc()
+            if breaker.state == HALF_OPEN and not breaker.trial_inflight:
+                breaker.trial_inflight = True
+                return True
+            if breaker.state == CLOSED:
+                return True
+        REJECTED.inc()
+        return False
+
+    def ready(self, address: str) -> bool:
+        """allow() True döner mi? Durumu değiştirmez (iş kuyruğa alınmadan önce elemek için)."""
+        breaker = self.breakers.get(address)
+        if breaker is None or breaker.state == CLOSED:
+            return True
+        if breaker.state == OPEN:
+            return self.time_fn() >= breaker.retry_at
+        return not breaker.trial_inflight
+
+    def is_open(self, address: str) -> bool:
+        """Devre açık ya da deneme aşamasında mı (peer seçilebilir değil)?"""
+        breaker = self.breakers.get(address)
+        return breaker is not None and breaker.state != CLOSED
+
+    def record_success(self, address: str):
+        breaker = self.breakers.get(address)
+        if breaker is None or (breaker.state == CLOSED and not breaker.failures):
+            return
+        with self.lock:
+            was_open = breaker.state != CLOSED
+            breaker.state = CLOSED
+            breaker.failures = 0
+            breaker.opens = 0
+            breaker.trial_inflight = False
+        if was_open:
+            TRANSITIONS.labels(CLOSED).inc()
+            logger.info(f"🟢 Devre kapandı: {address}")
+            self._notify(address, False)
+
+    def record_failure(self, address: str):
+        with self.lock:
+            breaker = self.breakers.get(address)
+            if breaker is None:
+                breaker = self.breakers[address] = CircuitBreaker()
+            breaker.failures += 1
+            # Açılmadan önce gönderilmiş isteklerin hataları beklemeyi uzatmaz
+            if breaker.state == OPEN or (breaker.state == CLOSED and breaker.failures < self.failure_threshold):
+                return
+            newly_opened = breaker.state == CLOSED
+            breaker.opens += 1
+            breaker.state = OPEN
+            breaker.trial_inflight = False
+            delay = self.backoff(breaker.opens)
+            breaker.retry_at = self.time_fn() + delay
+        TRANSITIONS.labels(OPEN).inc()
+        if newly_opened:
+            logger.warning(f"🔌 Devre açıldı: {address} ({breaker.failures} hata, {delay:.1f}s sonra denenecek)")
+            self._notify(address, True)
+        else:
+            logger.debug(f"Deneme başarısız: {address} ({delay:.1f}s sonra tekrar)")
+
+    def call(self, address: str, func: Callable, *args, **kwargs):
+        """func'ı devre kontrolüyle çağırır; exception hata, dönüş başarı sayılır."""
+        if not self.allow(address):
+            raise CircuitOpenError(address)
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure(address)
+            raise
+        self.record_success(address)
+        return result
+
+    def forget(self, addresses):
+        """Artık bilinmeyen peer'ların kayıtlarını siler."""
+        with self.lock:
+            for address in addresses:
+                self.breakers.pop(address, None)
+
+    def open_count(self) -> int:
+        return sum(1 for b in list(self.breakers.values()) if b.state != CLOSED)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Kapalı olmayan ya da hata sayan devreler (teşhis için)."""
+        with self.lock:
+            return {addr: b.to_dict() for addr, b in self.breakers.items()
+                    if b.state != CLOSED or b.failures}
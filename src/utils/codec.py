@@ -0,0 +1,97 @@
+"""
+src/utils/codec.py - Kontrol düzlemi mesajları için içerik anlaşması.
+/load, /a_m_r/sync, /a_m_r/ping ve /a_m_r/botlist cevapları istemcinin Accept
+başlığına göre msgpack ya da JSON olarak kodlanır; büyük gövdeler (üyelik
+listeleri) Accept-Encoding izin veriyorsa gzip ile sıkıştırılır. msgpack
+kurulu değilse her şey JSON'dur. Eski node'larla uyum için istek gövdeleri,
+karşı taraf bir kez msgpack ile cevap verene kadar JSON gönderilir.
+"""
+import gzip
+import json
+import logging
+from typing import Any, Dict, Tuple
+
+from .metrics import METRICS
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+JSON_TYPE = "application/json"
+MSGPACK_TYPE = "application/msgpack"
+# İstemcilerin gönderdiği Accept başlığı: msgpack varsa tercih edilir, JSON her zaman kabul
+ACCEPT = f"{MSGPACK_TYPE}, {JSON_TYPE};q=0.9" if msgpack is not None else JSON_TYPE
+GZIP_MIN_SIZE = 1024  # Bundan küçük gövdeler sıkıştırılmaz (başlık ve CPU maliyeti kazancı aşar)
+GZIP_LEVEL = 1        # Üyelik listelerinde 6 ile arasındaki boyut farkı küçük, CPU farkı büyük
+
+ENCODED_BYTES = METRICS.counter("dinc_codec_bytes_total", "Kodlanan kontrol düzlemi gövdeleri (bayt)",
+                                 ("format", "compressed"))
+
+
+def is_binary(content_type: str) -> bool:
+    """Content-Type msgpack mi?"""
+    return MSGPACK_TYPE in (content_type or "")
+
+
+def dumps(obj: Any, binary: bool = False) -> bytes:
+    """Nesneyi msgpack (binary=True ve kuruluysa) ya da kompakt JSON olarak kodlar."""
+    if binary and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(body: bytes, content_type: str = JSON_TYPE) -> Any:
+    """Gövdeyi Content-Type'a göre çözer."""
+    if is_binary(content_type):
+        if msgpack is None:
+            raise ValueError("msgpack gövdesi alındı ama msgpack kurulu değil")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+def encode(obj: Any, binary: bool = False, compress: bool = False,
+           gzip_min_size: int = GZIP_MIN_SIZE) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Nesneyi kodlar ve gerekirse sıkıştırır.
+    Dönüş: (gövde, başlıklar); başlıklar Content-Type ve varsa Content-Encoding içerir
+    """
+    binary = binary and msgpack is not None
+    body = dumps(obj, binary)
+    headers = {"Content-Type": MSGPACK_TYPE if binary else JSON_TYPE}
+    compressed = compress and len(body) >= gzip_min_size
+    if compressed:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    ENCODED_BYTES.labels("msgpack" if binary else "json", "gzip" if compressed else "none").inc(len(body))
+    return body, headers
+
+
+def respond(obj: Any, status: int = 200):
+    """İsteğin Accept / Accept-Encoding başlıklarına göre Flask cevabı oluşturur."""
+    from flask import Response, request
+
+    body, headers = encode(obj,
+                           binary=MSGPACK_TYPE in request.headers.get("Accept", ""),
+                           compress="gzip" in request.headers.get("Accept-Encoding", ""))
+    headers["Vary"] = "Accept, Accept-Encoding"
+    return Response(body, status=status, headers=headers)
+
+
+def request_body() -> Any:
+    """Flask isteğinin gövdesini Content-Type ve Content-Encoding'e göre çözer (boşsa None)."""
+    from flask import request
+
+    body = request.get_data()
+    if not body:
+        return None
+    if request.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return loads(body, request.headers.get("Content-Type", JSON_TYPE))
+
+
+def decode_response(response) -> Any:
+    """requests cevabını çözer (gzip'i requests zaten açar)."""
+    return loads(response.content, response.headers.get("Content-Type", JSON_TYPE))
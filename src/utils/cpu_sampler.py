@@ -0,0 +1,51 @@
+"""
+src/utils/cpu_sampler.py - Arka planda CPU yükünü (ve accept kuyruğunu) örnekler.
+İstek handler'ları psutil'i beklemeden State'teki önbelleklenmiş değeri okur.
+"""
+import logging
+from typing import Optional
+import psutil
+from .state import State
+from .scheduler import Scheduler
+from .overload import accept_queue_depth
+
+logger = logging.getLogger(__name__)
+
+
+class CPUSampler:
+    """CPU yükünü periyodik olarak ölçer ve State'e yazar."""
+
+    def __init__(self, state: State, interval: float = 0.5, scheduler: Optional[Scheduler] = None,
+                 port: Optional[int] = None):
+        """
+        Args:
+            port: Verilirse bu portu dinleyen soketin accept kuyruğu da örneklenir (Linux)
+        """
+        self.state = state
+        self.interval = interval
+        self.scheduler = scheduler or Scheduler()
+        self.port = port
+
+    def start(self):
+        """Örnekleme görevini zamanlayıcıya ekler."""
+        # İlk ölçüm için referans noktası oluştur (interval=None bloklamaz)
+        psutil.cpu_percent(interval=None)
+
+        # Aşırı yük kararı bu örneklere dayanır: yavaş peer/registry görevlerinin arkasında beklemesin
+        self.scheduler.add("cpu-sampler", self.sample, self.interval, initial_delay=self.interval, jitter=0.0,
+                           pool="sampler")
+        self.scheduler.start()
+
+    def sample(self):
+        """Son çağrıdan bu yana geçen sürenin CPU yükünü ölçer (bloklamaz)."""
+        self.state.record_cpu_sample(psutil.cpu_percent(interval=None))
+        if self.port:
+            try:
+                depth = accept_queue_depth(self.port)
+            except OSError as e:
+                logger.info(f"Accept kuyruğu okunamıyor; sinyal kapatıldı ({e})")
+                self.port = None
+                return
+            # Sunucu portu henüz bind etmediyse bu örnek atlanır, sonraki turda tekrar denenir
+            if depth is not None:
+                self.state.set_accept_queue(depth)
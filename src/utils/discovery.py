@@ -5,72 +5,338 @@ import requests
 import threading
 import time
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Set, Optional
 from .state import State
+from .scheduler import Scheduler
+from .metrics import METRICS
+from .breaker import PeerBreakers
+from .replicas import RegistryReplicas
+from . import codec
 
 logger = logging.getLogger(__name__)
 
+ROUNDS = METRICS.counter("dinc_discovery_rounds_total", "Registry'den peer listesi alma turları",
+                          ("mode", "result"))
+PEER_CHANGES = METRICS.counter("dinc_peer_changes_total", "Registry'den gelen peer ekleme/çıkarmaları",
+                                ("change",))
+POLL_ROUND_DURATION = METRICS.histogram("dinc_peer_poll_round_seconds", "Peer sorgu turu süresi")
+POLL_RESULTS = METRICS.counter("dinc_peer_polls_total", "Tamamlanan peer sorguları (sonuca göre)", ("result",))
+POLL_LATE = METRICS.counter("dinc_peer_poll_late_total", "Tur süresine yetişmeyen peer sorguları")
+PEER_RTT = METRICS.histogram("dinc_peer_rtt_seconds", "Peer başına /load veya /health gidiş-dönüş süresi",
+                              ("peer",), buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+
+# Peer sorgulama modları
+POLL_OFF = "off"    # Metrikler sadece registry'den (/nodes) gelir
+POLL_RTT = "rtt"    # Yük registry'den gelir, /health ile sadece RTT ölçülür
+POLL_FULL = "full"  # Her peer'ın /load endpoint'i sorgulanır (eski davranış)
+POLL_MODES = (POLL_OFF, POLL_RTT, POLL_FULL)
+
 
 class Discovery:
-    """Ana sunucudan peer listesi alır ve onlarla haberleşir."""
+    """
+    Ana sunucudan peer listesi alır ve onlarla haberleşir.
+    main_server_addr virgülle ayrılmış replika listesi olabilir (bkz. RegistryReplicas).
+    """
     
-    def __init__(self, state: State, main_server_addr: str, my_addr: str, interval: int = 10):
+    def __init__(self, state: State, main_server_addr: str, my_addr: str, interval: int = 10,
+                 poll_timeout: float = 3.0, poll_workers: int = 32, poll_mode: str = POLL_OFF,
+                 scheduler: Optional[Scheduler] = None, watch: bool = False,
+                 watch_wait: float = 20.0, watch_min_interval: float = 0.2,
+                 breakers: Optional[PeerBreakers] = None):
+        if poll_mode not in POLL_MODES:
+            raise ValueError(f"Geçersiz poll_mode: {poll_mode}")
+        
         self.state = state
         self.main_server_addr = main_server_addr
         self.my_addr = my_addr
         self.interval = interval
+        self.poll_mode = poll_mode
+        self.scheduler = scheduler or Scheduler()
+        # Peer ve registry başına devre kesiciler (Heartbeat ve AMRClient ile ortak); None = kapalı
+        self.breakers = breakers
+        self.replicas = RegistryReplicas(main_server_addr, my_addr, breakers)
+        self._watched: Optional[str] = None  # Sürümü takip edilen replika
+        
+        # Watch modu: /nodes?since=<sürüm>&wait=<s> ile sadece değişiklikleri al
+        self.watch = watch
+        self.watch_wait = watch_wait
+        self.watch_min_interval = watch_min_interval  # Değişiklikleri toplamak için turlar arası en az bekleme
+        self.version = 0      # Registry'den alınan son sürüm
+        self.epoch = None     # Registry örneği (yeniden başlarsa değişir)
+        self._registry_session = requests.Session()
+        self.poll_timeout = poll_timeout  # Tek bir /load isteği ve tüm tur için üst sınır
+        self.poll_workers = poll_workers  # Eşzamanlı sorgu sayısı
+        
+        # Peer başına keep-alive oturumları (TCP bağlantısı turlar arasında tekrar kullanılır)
+        self._sessions: Dict[str, requests.Session] = {}
+        self._inflight: Set[str] = set()  # Önceki turdan hâlâ süren sorgular
+        self._lock = threading.Lock()
+        self._poll_executor: Optional[ThreadPoolExecutor] = None
     
     def start(self):
-        """Peer keşfi döngüsünü arka planda başlatır."""
-        thread = threading.Thread(target=self._discovery_loop, daemon=True)
-        thread.start()
-    
-    def _discovery_loop(self):
-        """Periyodik olarak ana sunucudan peer listesini alır."""
-        while True:
-            try:
-                response = requests.get(f"{self.main_server_addr}/nodes", timeout=5)
-                if response.status_code == 200:
-                    nodes = response.json()
-                    # Kendi adresimizi hariç tut
-                    peer_addrs = [n.get("address") for n in nodes if n.get("address") != self.my_addr]
-                    self.state.set_peers(peer_addrs)
-                    logger.info(f"Keşfedilen peer'lar: {peer_addrs}")
-            except Exception as e:
-                logger.error(f"Peer keşfi başarısız: {e}")
-            
-            time.sleep(self.interval)
+        """Peer keşfi görevini zamanlayıcıya ekler."""
+        if self.watch:
+            # Long-poll 20 sn'ye kadar bloklar: ortak havuzdan bir thread'i sürekli tutmasın
+            self.scheduler.add("discovery", self.watch_once, self.interval, initial_delay=0, fixed_delay=True,
+                               pool="watch")
+        else:
+            self.scheduler.add("discovery", self.discover, self.interval, initial_delay=0)
+        # Yeni örnek gelmese de bayatlık cezası ve süre aşımı skora yansısın
+        self.scheduler.add("peer-scores", self.state.refresh_scores, 1.0)
+        self.scheduler.start()
     
-    def fetch_peer_load(self, peer_addr: str) -> tuple[float, float]:
+    def watch_once(self) -> float:
         """
-        Bir peer'dan CPU yükünü ve gecikmesini alır.
-        Dönüş: (load, latency_ms)
+        Registry'den son sürümden bu yana olan değişiklikleri bekler ve uygular.
+        Dönüş: Bir sonraki isteğe kadar beklenecek süre (saniye)
         """
+        registry = self.replicas.pick()
+        if not self._allow(registry):
+            ROUNDS.labels("watch", "skipped").inc()
+            return self.interval
+        if registry != self._watched:
+            # Sürümler replikaya özgüdür: yeni replikadan tam liste iste
+            if self._watched is not None:
+                logger.info(f"Peer izleme replikası değişti: {self._watched} -> {registry}")
+            self._watched = registry
+            self.version = 0
+        try:
+            response = self._registry_session.get(
+                f"{registry}/nodes",
+                params={"since": self.version, "wait": self.watch_wait},
+                timeout=self.watch_wait + 5
+            )
+            # 5xx registry'nin sağlıksız olduğunu gösterir; 4xx cevap veriyor demektir
+            self._record(registry, response.status_code < 500)
+            if response.status_code != 200:
+                ROUNDS.labels("watch", "error").inc()
+                logger.warning(f"Peer izleme registry'den hata aldı: {response.status_code}")
+                return self._retry_delay()
+            self.apply_delta(response.json())
+            ROUNDS.labels("watch", "ok").inc()
+            return self.watch_min_interval
+        except Exception as e:
+            self._record(registry, False)
+            ROUNDS.labels("watch", "error").inc()
+            logger.error(f"Peer izleme başarısız ({registry}): {e}")
+            return self._retry_delay()
+    
+    def _retry_delay(self) -> float:
+        """
+        Başarısız izlemeden sonra bekleme. Replika varsa hemen tekrar denenir:
+        devre birkaç hatada açılır ve izleme sıradaki replikaya geçer; tüm
+        devreler açıkken istek zaten gönderilmez.
+        """
+        return self.watch_min_interval if len(self.replicas) > 1 else self.interval
+    
+    def apply_delta(self, delta: dict):
+        """/nodes?since=... cevabını State'e uygular."""
+        epoch = delta.get("epoch")
+        if not delta.get("full") and epoch != self.epoch:
+            # Registry yeniden başlamış: sürümler artık karşılaştırılamaz, tam liste iste
+            self.version = 0
+            return
+        self.epoch = epoch
+        
+        # Kendi adresimizi hariç tut
+        added = [n for n in delta.get("added", []) if n.get("address") != self.my_addr]
+        changed = [n for n in delta.get("changed", []) if n.get("address") != self.my_addr]
+        removed = [a for a in delta.get("removed", []) if a != self.my_addr]
+        
+        if delta.get("full"):
+            self.state.set_peers([n["address"] for n in added])
+        else:
+            self.state.upsert_peers([n["address"] for n in added])
+            self.state.remove_peers(removed)
+        self.apply_node_metrics(added + changed)
+        self.version = delta.get("version", self.version)
+        if added:
+            PEER_CHANGES.labels("added").inc(len(added))
+        if removed:
+            PEER_CHANGES.labels("removed").inc(len(removed))
+        
+        if added or removed:
+            logger.info(f"Peer değişiklikleri (v{self.version}): +{[n['address'] for n in added]} -{removed}")
+    
+    def discover(self):
+        """Ana sunucudan peer listesini bir kez alır."""
+        registry = self.replicas.pick()
+        if not self._allow(registry):
+            ROUNDS.labels("full", "skipped").inc()
+            return
+        try:
+            response = requests.get(f"{registry}/nodes", timeout=5)
+            self._record(registry, response.status_code < 500)
+            if response.status_code == 200:
+                nodes = response.json()
+                # Kendi adresimizi hariç tut
+                peers = [n for n in nodes if n.get("address") != self.my_addr]
+                peer_addrs = [n.get("address") for n in peers]
+                self.state.set_peers(peer_addrs)
+                self.apply_node_metrics(peers)
+                ROUNDS.labels("full", "ok").inc()
+                logger.info(f"Keşfedilen peer'lar: {peer_addrs}")
+            else:
+                ROUNDS.labels("full", "error").inc()
+        except Exception as e:
+            self._record(registry, False)
+            ROUNDS.labels("full", "error").inc()
+            logger.error(f"Peer keşfi başarısız: {e}")
+    
+    def apply_node_metrics(self, nodes: List[dict]):
+        """
+        Registry'nin /nodes cevabındaki heartbeat metriklerini State'e yazar.
+        Metrik taşımayan (eski) kayıtlar atlanır.
+        """
+        samples = [
+            (node["address"], float(node["cpuLoad"]), float(node["timestamp"]),
+             float(node["effectiveLoad"]) if node.get("effectiveLoad") is not None else None)
+            for node in nodes
+            if "cpuLoad" in node and node.get("timestamp")
+        ]
+        if samples:
+            self.state.update_peer_loads(samples)
+    
+    def _allow(self, addr: str) -> bool:
+        """Devre kesici kapalıysa (ya da deneme sırası geldiyse) istek gönderilebilir."""
+        return self.breakers is None or self.breakers.allow(addr)
+    
+    def _record(self, addr: str, ok: bool):
+        """İsteğin sonucunu devre kesiciye bildirir."""
+        if self.breakers is not None:
+            if ok:
+                self.breakers.record_success(addr)
+            else:
+                self.breakers.record_failure(addr)
+    
+    def _session_for(self, peer_addr: str) -> requests.Session:
+        """Peer için keep-alive oturumunu döndürür (yoksa oluşturur)."""
+        with self._lock:
+            session = self._sessions.get(peer_addr)
+            if session is None:
+                session = requests.Session()
+                session.headers["Accept"] = codec.ACCEPT
+                self._sessions[peer_addr] = session
+            return session
+    
+    def _prune_sessions(self, peer_addrs: Set[str]):
+        """Artık bilinmeyen peer'ların oturumlarını kapatır."""
+        with self._lock:
+            stale = [addr for addr in self._sessions if addr not in peer_addrs]
+            for addr in stale:
+                self._sessions.pop(addr).close()
+                PEER_RTT.remove(addr)
+        if stale and self.breakers is not None:
+            self.breakers.forget(stale)
+    
+    def fetch_peer_load(self, peer_addr: str) -> tuple[float, float, Optional[float]]:
+        """
+        Bir peer'dan CPU yükünü, efektif yükünü ve gecikmesini alır.
+        Dönüş: (load, latency_ms, effective_load veya None); başarısızsa ya da
+        devre açıksa (0.0, 0.0, None)
+        """
+        if not self._allow(peer_addr):
+            return 0.0, 0.0, None
         try:
             start_time = time.time()
-            response = requests.get(f"{peer_addr}/load", timeout=3)
+            response = self._session_for(peer_addr).get(f"{peer_addr}/load", timeout=self.poll_timeout)
             latency_ms = (time.time() - start_time) * 1000
             
             if response.status_code == 200:
-                data = response.json()
+                data = codec.decode_response(response)
+                self._record(peer_addr, True)
+                PEER_RTT.labels(peer_addr).observe(latency_ms / 1000)
                 load = data.get("cpuLoad", 0.0)
-                return load, latency_ms
+                return load, latency_ms, data.get("effectiveLoad")
         except Exception as e:
             logger.debug(f"Peer yükü alınamadı ({peer_addr}): {e}")
         
-        return 0.0, 0.0
+        self._record(peer_addr, False)
+        return 0.0, 0.0, None
+    
+    def fetch_peer_rtt(self, peer_addr: str) -> float:
+        """
+        Bir peer'ın /health endpoint'ine gidiş-dönüş süresini ölçer.
+        Dönüş: latency_ms (başarısızsa ya da devre açıksa 0.0)
+        """
+        if not self._allow(peer_addr):
+            return 0.0
+        try:
+            start_time = time.time()
+            response = self._session_for(peer_addr).get(f"{peer_addr}/health", timeout=self.poll_timeout)
+            if response.status_code == 200:
+                latency_ms = (time.time() - start_time) * 1000
+                self._record(peer_addr, True)
+                PEER_RTT.labels(peer_addr).observe(latency_ms / 1000)
+                return latency_ms
+        except Exception as e:
+            logger.debug(f"Peer RTT ölçülemedi ({peer_addr}): {e}")
+        
+        self._record(peer_addr, False)
+        return 0.0
+    
+    def _poll_one(self, peer_addr: str):
+        """Tek bir peer'ı sorgular ve sonucu State'e yazar."""
+        try:
+            if self.poll_mode == POLL_RTT:
+                latency = self.fetch_peer_rtt(peer_addr)
+                ok = latency > 0
+                if ok:
+                    self.state.update_peer_latency(peer_addr, latency)
+            else:
+                load, latency, effective_load = self.fetch_peer_load(peer_addr)
+                ok = load > 0 or latency > 0
+                if ok:
+                    # Doğrudan sorgu: örnek yerel alım zamanıyla damgalanır
+                    self.state.update_peer_metrics(peer_addr, load, latency, effective_load=effective_load)
+            POLL_RESULTS.labels("ok" if ok else "error").inc()
+        finally:
+            with self._lock:
+                self._inflight.discard(peer_addr)
+    
+    def poll_round(self, executor: ThreadPoolExecutor) -> int:
+        """
+        Tüm peer'ları eşzamanlı olarak sorgular.
+        Tur en fazla poll_timeout kadar sürer; yetişemeyen sorgular bir sonraki tura kalır.
+        Dönüş: Zamanında tamamlanan sorgu sayısı
+        """
+        started = time.perf_counter()
+        peer_addrs = {p.address for p in self.state.all_peers()}
+        self._prune_sessions(peer_addrs)
+        
+        futures = {}
+        for addr in peer_addrs:
+            if self.breakers is not None and not self.breakers.ready(addr):
+                # Açık devre: iş parçacığı ve zaman aşımı harcama
+                POLL_RESULTS.labels("skipped").inc()
+                continue
+            with self._lock:
+                if addr in self._inflight:
+                    continue
+                self._inflight.add(addr)
+            futures[executor.submit(self._poll_one, addr)] = addr
+        
+        done, not_done = wait(futures, timeout=self.poll_timeout)
+        for future in not_done:
+            # Henüz başlamamış sorguları iptal et; _inflight kaydını da temizle
+            if future.cancel():
+                with self._lock:
+                    self._inflight.discard(futures[future])
+        if not_done:
+            POLL_LATE.inc(len(not_done))
+            logger.debug(f"Peer sorgu turu zaman aşımı: {len(not_done)}/{len(futures)} yetişmedi")
+        POLL_ROUND_DURATION.observe(time.perf_counter() - started)
+        return len(done)
     
     def poll_peer_loads(self, interval: int = 7):
-        """Periyodik olarak tüm peer'ların yüklerini sorgulamaya başlar."""
-        def _poll_loop():
-            while True:
-                peers = self.state.all_peers()
-                for peer in peers:
-                    load, latency = self.fetch_peer_load(peer.address)
-                    if load > 0 or latency > 0:
-                        self.state.update_peer_metrics(peer.address, load, latency)
-                
-                time.sleep(interval)
+        """Periyodik olarak tüm peer'ların yüklerini (veya RTT'lerini) sorgulamaya başlar."""
+        if self.poll_mode == POLL_OFF:
+            logger.info("Peer sorgulaması kapalı; metrikler registry heartbeat'lerinden alınıyor")
+            return
         
-        thread = threading.Thread(target=_poll_loop, daemon=True)
-        thread.start()
+        if self._poll_executor is None:
+            self._poll_executor = ThreadPoolExecutor(max_workers=self.poll_workers, thread_name_prefix="peer-poll")
+        self.scheduler.add("peer-poll", lambda: self.poll_round(self._poll_executor), interval)
+        self.scheduler.start()
@@ -0,0 +1,148 @@
+"""
+src/utils/failover.py - Registry kaybında A_M_R'a otomatik geçiş ve geri dönüş.
+Registry'ye ulaşılamadığında Discovery son peer listesini tutmaya devam eder;
+metrikler de heartbeat'lerle geldiği için bir süre sonra bayatlar ve yönlendirme
+durur. Kayıp registry'nin devre kesicisinden algılanır: Heartbeat ve Discovery
+art arda hata aldığında devre açılır (failover), bekleme süresi dolduğunda giden
+deneme isteği başarılı olursa kapanır (failback). Registry replikalıysa failover
+ancak tüm replikaların devresi açıkken yapılır; biri kapanınca geri dönülür.
+"""
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+from .state import State
+from .scheduler import Scheduler
+from .metrics import METRICS
+from .breaker import PeerBreakers
+from .discovery import Discovery, POLL_OFF, POLL_FULL
+from .replicas import RegistryReplicas
+
+logger = logging.getLogger(__name__)
+
+MODE_REGISTRY = "registry"  # Peer listesi ve metrikler registry'den
+MODE_P2P = "p2p"            # Peer listesi A_M_R üyeliğinden, metrikler doğrudan peer'lardan
+
+SWITCHES = METRICS.counter("dinc_registry_failovers_total", "Registry kaybı/dönüşüyle yapılan mod geçişleri",
+                            ("mode",))
+
+
+class RegistryFailover:
+    """
+    Registry'nin devre kesicisini izler ve yönlendirmenin kaynağını değiştirir.
+    Failover'da A_M_R State'teki peer'larla tohumlanıp başlatılır, State'in peer
+    listesi gossip üyeliğinden kurulur ve peer yükleri doğrudan (/load) sorgulanır.
+    Failback'te A_M_R durdurulur ve registry'den tam liste istenerek kesinti
+    sırasındaki değişiklikler uzlaştırılır.
+    """
+
+    def __init__(self, registry_addr, state: State, a_m_r, discovery: Discovery, breakers: PeerBreakers,
+                 scheduler: Optional[Scheduler] = None, gossip_interval: int = 5, poll_interval: int = 7,
+                 sync_interval: float = 1.0, time_fn: Callable[[], float] = time.time):
+        """
+        Args:
+            registry_addr: Registry adresi ya da replika listesi ("a,b" veya RegistryReplicas)
+            gossip_interval: Failover'da A_M_R gossip turu aralığı (saniye)
+            poll_interval: Failover'da peer yüklerini sorgulama aralığı
+            sync_interval: State'in peer listesini A_M_R üyeliğinden güncelleme aralığı
+        """
+        self.replicas = (registry_addr if isinstance(registry_addr, RegistryReplicas)
+                         else RegistryReplicas(registry_addr, breakers=breakers))
+        self.registry_addr = str(self.replicas)
+        self.state = state
+        self.a_m_r = a_m_r
+        self.discovery = discovery
+        self.breakers = breakers
+        self.scheduler = scheduler or Scheduler()
+        self.gossip_interval = gossip_interval
+        self.poll_interval = poll_interval
+        self.sync_interval = sync_interval
+        self.time_fn = time_fn
+
+        self.mode = MODE_REGISTRY
+        self.changed_at = 0.0
+        self.failovers = 0
+        self.failbacks = 0
+        self._lock = threading.Lock()
+        self._saved_poll_mode = discovery.poll_mode
+        self._started_a_m_r = False
+
+    def start(self):
+        """Registry'nin devre kesicisine abone olur."""
+        self.breakers.subscribe(self._on_circuit)
+
+    def _on_circuit(self, address: str, is_open: bool):
+        if address not in self.replicas:
+            return
+        if not is_open:
+            self.fail_back()
+        elif self.replicas.all_open():
+            self.fail_over()
+
+    def _switch(self, mode: str) -> Optional[float]:
+        """Modu değiştirir. Dönüş: önceki modda geçen süre (zaten bu moddaysa None)."""
+        with self._lock:
+            if self.mode == mode:
+                return None
+            now = self.time_fn()
+            previous = now - self.changed_at
+            self.mode = mode
+            self.changed_at = now
+            if mode == MODE_P2P:
+                self.failovers += 1
+            else:
+                self.failbacks += 1
+        SWITCHES.labels(mode).inc()
+        return previous
+
+    def fail_over(self):
+        """Yönlendirmeyi A_M_R üyeliğine geçirir."""
+        if self._switch(MODE_P2P) is None:
+            return
+        # Registry'den bilinen peer'lar gossip'in başlangıç üyeleridir
+        peers = [p.address for p in self.state.all_peers()]
+        self.a_m_r.merge([{"address": addr} for addr in peers])
+        if not self.a_m_r.running:
+            self.a_m_r.start(interval=self.gossip_interval)
+            self._started_a_m_r = True
+
+        # Heartbeat metrikleri artık gelmiyor; yükler peer'lardan sorgulanır
+        self._saved_poll_mode = self.discovery.poll_mode
+        self.discovery.poll_mode = POLL_FULL
+        if self._saved_poll_mode == POLL_OFF:
+            self.discovery.poll_peer_loads(interval=self.poll_interval)
+        self.scheduler.add("failover-sync", self.sync_peers, self.sync_interval, initial_delay=0)
+        self.scheduler.start()
+        logger.warning(f"🔴 Registry'ye ulaşılamıyor: A_M_R'a geçildi ({len(peers)} peer ile)")
+
+    def fail_back(self):
+        """Registry'ye geri döner ve peer listesini registry'ninkiyle uzlaştırır."""
+        p2p_duration = self._switch(MODE_REGISTRY)
+        if p2p_duration is None:
+            return
+        self.scheduler.cancel("failover-sync")
+        if self._saved_poll_mode == POLL_OFF:
+            self.scheduler.cancel("peer-poll")
+        self.discovery.poll_mode = self._saved_poll_mode
+        if self._started_a_m_r:
+            self.a_m_r.stop()
+            self._started_a_m_r = False
+        # Kesinti sırasında kaçırılan ekleme/çıkarmalar için tam liste iste
+        self.discovery.version = 0
+        logger.info(f"🟢 Registry geri geldi: A_M_R'dan dönüldü ({p2p_duration:.1f}s P2P modunda kalındı)")
+
+    def sync_peers(self):
+        """P2P modunda State'in peer listesini gossip üyeliğinden kurar (ölü üyeler çıkar)."""
+        if self.mode == MODE_P2P:
+            self.state.set_peers(self.a_m_r.get_active_peers())
+
+    def status(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "registry": self.replicas.addresses,
+            "changed_at": self.changed_at,
+            "failovers": self.failovers,
+            "failbacks": self.failbacks,
+            "members": len(self.a_m_r.get_active_peers()),
+        }
@@ -0,0 +1,119 @@
+"""
+src/utils/forwarder.py - Aşırı yüklü node için ters proxy yönlendirmesi.
+İstemciye 307 dönmek yerine isteği seçilen peer'a iletir ve cevabı geri akıtır.
+"""
+import threading
+import logging
+from typing import Dict, Iterable, Set
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Proxy'lerin iletmemesi gereken bağlantıya özgü header'lar (RFC 7230 §6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade",
+}
+
+HOP_HEADER = "X-Redirect-Count"  # 307 modu ile aynı döngü sayacı
+
+
+def hop_by_hop(headers) -> Set[str]:
+    """Sabit listeye ek olarak Connection header'ında adı geçen header'lar da bağlantıya özgüdür."""
+    named = {token.strip().lower() for token in headers.get("Connection", "").split(",") if token.strip()}
+    return HOP_BY_HOP_HEADERS | named
+
+
+class Forwarder:
+    """İstekleri peer'lara keep-alive bağlantılar üzerinden iletir."""
+
+    def __init__(self, max_concurrent_per_peer: int = 32, timeout: float = 10.0,
+                 chunk_size: int = 64 * 1024):
+        self.max_concurrent_per_peer = max_concurrent_per_peer
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _peer_resources(self, peer_addr: str):
+        """Peer'ın oturumunu ve eşzamanlılık semaforunu döndürür (yoksa oluşturur)."""
+        with self._lock:
+            session = self._sessions.get(peer_addr)
+            if session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_concurrent_per_peer)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[peer_addr] = session
+                self._slots[peer_addr] = threading.BoundedSemaphore(self.max_concurrent_per_peer)
+            return session, self._slots[peer_addr]
+
+    def forget(self, peer_addrs: Iterable[str]):
+        """
+        Cluster'dan çıkan peer'ların oturumlarını ve semaforlarını bırakır
+        (State.subscribe_removals). Süren iletimler kendi referanslarıyla biter.
+        """
+        with self._lock:
+            sessions = [self._sessions.pop(addr) for addr in peer_addrs if addr in self._sessions]
+            for addr in peer_addrs:
+                self._slots.pop(addr, None)
+        for session in sessions:
+            session.close()
+
+    def forward(self, peer_addr: str, flask_request, hops: int):
+        """
+        İsteği peer'a iletir ve Flask Response olarak döndürür.
+        Peer'ın eşzamanlılık limiti doluysa veya iletim başarısızsa None döner;
+        çağıran 307 yönlendirmesine geri düşer.
+        """
+        from flask import Response
+
+        session, slot = self._peer_resources(peer_addr)
+        if not slot.acquire(blocking=False):
+            logger.debug(f"Proxy limiti dolu: {peer_addr}")
+            return None
+
+        skip = hop_by_hop(flask_request.headers)
+        headers = {
+            k: v for k, v in flask_request.headers.items()
+            if k.lower() not in skip and k.lower() != "host"
+        }
+        headers[HOP_HEADER] = str(hops)
+        forwarded_for = flask_request.headers.get("X-Forwarded-For")
+        client = flask_request.remote_addr or ""
+        headers["X-Forwarded-For"] = f"{forwarded_for}, {client}" if forwarded_for else client
+
+        try:
+            upstream = session.request(
+                flask_request.method,
+                f"{peer_addr}{flask_request.full_path.rstrip('?')}",
+                headers=headers,
+                data=flask_request.get_data(),
+                stream=True,
+                allow_redirects=False,
+                timeout=self.timeout,
+            )
+        except Exception as e:
+            slot.release()
+            logger.warning(f"Proxy iletimi başarısız ({peer_addr}): {e}")
+            return None
+
+        skip = hop_by_hop(upstream.raw.headers)
+        response_headers = [
+            (k, v) for k, v in upstream.raw.headers.items()
+            if k.lower() not in skip
+        ]
+        # Sıkıştırılmış gövde olduğu gibi aktarılır (Content-Encoding/Length korunur)
+        body = upstream.raw.stream(self.chunk_size, decode_content=False)
+        response = Response(body, status=upstream.status_code, headers=response_headers)
+        response.headers["X-Served-By"] = peer_addr
+
+        def _release():
+            upstream.close()
+            slot.release()
+
+        response.call_on_close(_release)
+        return response
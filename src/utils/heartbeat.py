@@ -2,48 +2,100 @@
 src/utils/heartbeat.py - Ana sunucuya periyodik kalp atışı gönderir.
 """
 import requests
-import threading
 import time
 import logging
+from typing import Optional
+from .state import State
+from .scheduler import Scheduler
+from .metrics import METRICS
+from .breaker import PeerBreakers
+from .replicas import RegistryReplicas
 
 logger = logging.getLogger(__name__)
 
+HEARTBEATS = METRICS.counter("dinc_heartbeats_total", "Registry'ye gönderilen heartbeat'ler (sonuca göre)",
+                              ("result",))
+HEARTBEAT_DURATION = METRICS.histogram("dinc_heartbeat_duration_seconds", "Heartbeat isteği süresi")
+
 
 class Heartbeat:
-    """Ana sunucuya periyodik olarak kayıt ve "hayattayım" mesajı gönderir."""
+    """
+    Ana sunucuya periyodik olarak kayıt ve "hayattayım" mesajı gönderir.
+    main_server_addr virgülle ayrılmış replika listesi olabilir; heartbeat'ler
+    tercih edilen replikaya, onun devresi açıksa sıradakine gider.
+    """
     
-    def __init__(self, main_server_addr: str, my_addr: str, interval: int = 5):
+    def __init__(self, main_server_addr: str, my_addr: str, interval: int = 5,
+                 state: Optional[State] = None, scheduler: Optional[Scheduler] = None,
+                 breakers: Optional[PeerBreakers] = None):
         self.main_server_addr = main_server_addr
         self.my_addr = my_addr
+        self.replicas = RegistryReplicas(main_server_addr, my_addr, breakers)
         self.interval = interval
+        self.state = state  # Verilirse yük metrikleri heartbeat'e eklenir
+        self.scheduler = scheduler or Scheduler()
+        self.breakers = breakers  # Registry devresi açıksa heartbeat gönderilmez (Discovery ile ortak)
+        self._session = requests.Session()  # Keep-alive: her heartbeat için yeni TCP bağlantısı açılmaz
     
     def start(self):
-        """Heartbeat döngüsünü arka planda başlatır."""
+        """Heartbeat görevini zamanlayıcıya ekler."""
         # İlk kayıt hemen yap
         self._send()
         
         # Sonrasında periyodik olarak gönder
-        thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
-        thread.start()
+        self.scheduler.add("heartbeat", self._send, self.interval, initial_delay=self.interval, pool="heartbeat")
+        self.scheduler.start()
+    
+    def _payload(self) -> dict:
+        """Heartbeat gövdesini oluşturur (adres + yük metrikleri)."""
+        payload = {"address": self.my_addr}
+        if self.state is not None:
+            payload["cpuLoad"] = round(self.state.my_cpu_load, 2)
+            payload["inFlight"] = self.state.inflight_count()
+            payload["effectiveLoad"] = round(self.state.effective_load(), 2)
+            payload["timestamp"] = time.time()
+        return payload
     
     def _send(self):
-        """Ana sunucuya bir heartbeat isteği gönderir."""
+        """
+        Ana sunucuya bir heartbeat isteği gönderir. Replika cevap vermezse aynı
+        turda sıradaki hazır replika denenir; düşen replikanın deneme isteği
+        heartbeat'in kaybolmasına yol açmaz.
+        """
+        for registry in self.replicas.candidates():
+            if self._send_to(registry):
+                return
+    
+    def _send_to(self, registry: str) -> bool:
+        """Heartbeat'i tek bir replikaya gönderir. Dönüş: Replika erişilebilir mi"""
+        if self.breakers is not None and not self.breakers.allow(registry):
+            HEARTBEATS.labels("skipped").inc()
+            return False
+        start = time.perf_counter()
+        ok = False
         try:
-            payload = {"address": self.my_addr}
-            response = requests.post(
-                f"{self.main_server_addr}/register",
+            payload = self._payload()
+            response = self._session.post(
+                f"{registry}/register",
                 json=payload,
                 timeout=3
             )
+            # 5xx registry'nin sağlıksız olduğunu gösterir; 4xx ile reddetse de erişilebilir
+            ok = response.status_code < 500
             if response.status_code == 200:
+                HEARTBEATS.labels("ok").inc()
                 logger.debug(f"Heartbeat gönderildi: {self.my_addr}")
             else:
+                HEARTBEATS.labels("rejected").inc()
                 logger.warning(f"Heartbeat ana sunucudan hata aldı: {response.status_code}")
         except Exception as e:
-            logger.error(f"Heartbeat gönderilemedi: {e}")
-    
-    def _heartbeat_loop(self):
-        """Periyodik olarak heartbeat gönderir."""
-        while True:
-            time.sleep(self.interval)
-            self._send()
+            HEARTBEATS.labels("error").inc()
+            logger.error(f"Heartbeat gönderilemedi ({registry}): {e}")
+        finally:
+            HEARTBEAT_DURATION.observe(time.perf_counter() - start)
+            if self.breakers is not None:
+                if ok:
+                    self.breakers.record_success(registry)
+                else:
+                    self.breakers.record_failure(registry)
+        return ok
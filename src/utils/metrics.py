@@ -0,0 +1,242 @@
+"""
+src/utils/metrics.py - Prometheus metin formatında düşük maliyetli metrikler.
+Sayaç ve histogramlar kilitsizdir: her thread, thread kimliğine göre kendi
+hücresine yazar; /metrics okunurken hücreler toplanır. Sıcak yolda kilit,
+I/O veya bellek ayırma yoktur (ilk kullanımda thread başına bir liste hariç).
+
+Aynı anda yaşayan iki thread'in kimliği aynı olamaz; kimliği yeniden kullanan
+yeni thread, ölmüş thread'in hücresine eklemeye devam eder. Bu yüzden hücre
+sayısı thread sayısıyla (istek başına thread açan sunucularda bile) sınırlıdır.
+"""
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+_get_ident = threading.get_ident
+
+# Saniye cinsinden varsayılan histogram sınırları (handler ve kontrol düzlemi süreleri)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+class _CounterChild:
+    """Tek bir etiket kombinasyonunun sayacı."""
+
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells: Dict[int, List[float]] = {}
+
+    def inc(self, amount: float = 1):
+        cell = self._cells.get(_get_ident())
+        if cell is None:
+            cell = self._cells.setdefault(_get_ident(), [0])
+        cell[0] += amount
+
+    @property
+    def value(self) -> float:
+        return sum(cell[0] for cell in list(self._cells.values()))
+
+
+class _HistogramChild:
+    """Sabit kovalı histogram; hücre = [kova sayıları..., +Inf, toplam]."""
+
+    __slots__ = ("_bounds", "_size", "_cells")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._size = len(bounds) + 1
+        self._cells: Dict[int, List[float]] = {}
+
+    def observe(self, value: float):
+        cell = self._cells.get(_get_ident())
+        if cell is None:
+            cell = self._cells.setdefault(_get_ident(), [0] * self._size + [0.0])
+        cell[bisect.bisect_left(self._bounds, value)] += 1
+        cell[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """(kümülatif kova sayıları, toplam) döndürür."""
+        counts = [0] * self._size
+        total = 0.0
+        for cell in list(self._cells.values()):
+            for i in range(self._size):
+                counts[i] += cell[i]
+            total += cell[-1]
+        for i in range(1, self._size):
+            counts[i] += counts[i - 1]
+        return counts, total
+
+
+class _Metric:
+    """Etiketli metrik ailesi; etiketsizse doğrudan kullanılabilir."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Etiket değerlerine ait alt metriği döndürür (yoksa oluşturur). Sıcak yolda önceden bağlanmalı."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: {len(self.labelnames)} etiket bekleniyordu, {len(values)} verildi")
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def remove(self, *values: str):
+        """Artık anlamı olmayan etiket kombinasyonunu siler (ör. ayrılan peer)."""
+        self._children.pop(values, None)
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Sadece artan sayaç."""
+
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._children[()].inc(amount)
+
+    @property
+    def value(self) -> float:
+        return self._children[()].value
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+                for values, child in list(self._children.items())]
+
+
+class Histogram(_Metric):
+    """Sabit kovalı gecikme/boyut dağılımı."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._children[()].observe(value)
+
+    def render(self) -> List[str]:
+        lines = []
+        bounds = self.buckets + (math.inf,)
+        for values, child in list(self._children.items()):
+            counts, total = child.snapshot()
+            for bound, count in zip(bounds, counts):
+                labels = _format_labels(self.labelnames + ("le",), values + (_format_value(float(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Değeri okuma anında fonksiyondan alınan gösterge (CPU, peer sayısı...).
+    Etiketliyse fonksiyon {(etiket değerleri): değer} sözlüğü döndürür.
+    """
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable, labelnames: Sequence[str] = ()):
+        self.fn = fn
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self):
+        return None
+
+    def render(self) -> List[str]:
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        items = value.items() if self.labelnames else [((), value)]
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(float(v))}"
+                for labels, v in items]
+
+
+class MetricsRegistry:
+    """Process'in metrikleri; aynı isimle ikinci kayıt mevcut metriği döndürür."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} zaten {metric.type} olarak kayıtlı")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets)
+
+    def gauge(self, name: str, help: str, fn: Callable, labelnames: Sequence[str] = ()) -> Gauge:
+        """Göstergeyi kaydeder; aynı isim tekrar kaydedilirse fonksiyonu değiştirilir."""
+        metric = self._register(Gauge, name, help, fn, labelnames)
+        metric.fn = fn
+        return metric
+
+    def render(self) -> str:
+        """Tüm metrikleri Prometheus metin formatında döndürür."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process genelindeki varsayılan kayıt; modüller metriklerini import anında burada tanımlar
+METRICS = MetricsRegistry()
@@ -0,0 +1,87 @@
+"""
+src/utils/overload.py - CPU dışı yük sinyalleri ve bileşik aşırı yük algılama.
+Sistem geneli CPU yüzdesi paylaşılan host'ta başka process'leri de içerir ve
+I/O'ya bağlı doymada (gecikme artarken CPU düşük kalır) geride kalır. Bu yüzden
+işlenmekte olan istek sayısı, handler gecikmesi (EWMA) ve accept kuyruğu da izlenir.
+"""
+from typing import Dict, Optional
+
+
+class OverloadDetector:
+    """
+    Sinyalleri CPU yüzdesi birimine çevirir ve histerezisle karar verir.
+    Her sinyal kendi limitine oranlanır (1.0 = limitte) ve cpu_threshold ile
+    çarpılır; efektif yük CPU ile bu değerlerin en büyüğüdür. Node efektif yük
+    eşiği aştığında aşırı yüklü olur, eşiğin release_ratio katının altına
+    inene kadar öyle kalır (eşik çevresinde açılıp kapanmayı önler).
+    """
+
+    def __init__(self, cpu_threshold: float = 70.0, inflight_limit: Optional[int] = None,
+                 latency_threshold_ms: Optional[float] = None, queue_limit: Optional[int] = None,
+                 release_ratio: float = 0.85):
+        """
+        Args:
+            inflight_limit: Bu kadar eşzamanlı istek eşik sayılır (None = kapalı)
+            latency_threshold_ms: Handler gecikmesi EWMA eşiği (None = kapalı)
+            queue_limit: Accept kuyruğunda bekleyen bağlantı eşiği (None = kapalı)
+        """
+        self.cpu_threshold = cpu_threshold
+        self.inflight_limit = inflight_limit
+        self.latency_threshold_ms = latency_threshold_ms
+        self.queue_limit = queue_limit
+        self.release_ratio = release_ratio
+        self.overloaded = False
+        self.reason = ""  # Efektif yükü belirleyen sinyal
+
+    def pressures(self, cpu: float, inflight: int, latency_ms: float, queue: int) -> Dict[str, float]:
+        """Her sinyalin CPU yüzdesi cinsinden karşılığı."""
+        result = {"cpu": cpu}
+        if self.inflight_limit:
+            result["inflight"] = self.cpu_threshold * inflight / self.inflight_limit
+        if self.latency_threshold_ms:
+            result["latency"] = self.cpu_threshold * latency_ms / self.latency_threshold_ms
+        if self.queue_limit:
+            result["queue"] = self.cpu_threshold * queue / self.queue_limit
+        return result
+
+    def effective_load(self, cpu: float, inflight: int, latency_ms: float, queue: int) -> float:
+        """Sinyallerin en büyüğü (CPU yüzdesi biriminde)."""
+        return max(self.pressures(cpu, inflight, latency_ms, queue).values())
+
+    def update(self, cpu: float, inflight: int, latency_ms: float, queue: int) -> bool:
+        """Güncel sinyallerle kararı günceller. Dönüş: aşırı yüklü mü?"""
+        pressures = self.pressures(cpu, inflight, latency_ms, queue)
+        reason = max(pressures, key=pressures.get)
+        load = pressures[reason]
+        if self.overloaded:
+            self.overloaded = load >= self.cpu_threshold * self.release_ratio
+        else:
+            self.overloaded = load > self.cpu_threshold
+        self.reason = reason if self.overloaded else ""
+        return self.overloaded
+
+
+def accept_queue_depth(port: int) -> Optional[int]:
+    """
+    Port'u dinleyen soketlerin accept kuyruğundaki bağlantı sayısı (Linux).
+    LISTEN durumundaki soketler için /proc/net/tcp'deki rx_queue bu değerdir.
+    Port'u henüz dinleyen soket yoksa (sunucu bind etmeden) None döner.
+    Kaynak okunamazsa (Linux değil, erişim yok) OSError fırlatır.
+    """
+    suffix = f":{port:04X}"
+    depth = None
+    readable = False
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path) as f:
+                next(f)  # Başlık
+                readable = True
+                for line in f:
+                    fields = line.split()
+                    if fields[3] == "0A" and fields[1].endswith(suffix):
+                        depth = (depth or 0) + int(fields[4].split(":")[1], 16)
+        except (OSError, StopIteration):
+            continue
+    if not readable:
+        raise OSError("/proc/net/tcp okunamıyor")
+    return depth
@@ -0,0 +1,152 @@
+"""
+src/utils/peer_view.py - State'in peer görünümünü process'ler arasında paylaşır.
+Çok worker'lı modda kontrol düzlemi (heartbeat, discovery, CPU örnekleme) host başına
+bir kez çalışır; görünüm atomik olarak bir dosyaya yazılır ve worker'lar onu okur.
+"""
+import json
+import os
+import tempfile
+import time
+import logging
+from typing import Callable, Optional
+from .state import State
+from .scheduler import Scheduler
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+def dump_peers(state: State) -> list:
+    """Peer'ları ve yumuşatılmış metriklerini State.apply_peer_view() formatında döndürür."""
+    return [
+        {
+            "address": p.address,
+            "load": p.load,
+            "effective_load": p.effective_load,
+            "latency": p.latency,
+            "jitter": p.jitter,
+            "updated_at": p.updated_at,
+            "source_at": p.source_at,
+            "rtt_at": p.rtt_at,
+            "circuit_open": p.circuit_open,
+        }
+        for p in state.all_peers()
+    ]
+
+
+def dump_peer_view(state: State) -> dict:
+    """State'in paylaşılacak kısmını sözlüğe dönüştürür."""
+    return {
+        "version": FORMAT_VERSION,
+        "written_at": time.time(),
+        "my_cpu_load": state.my_cpu_load,
+        "accept_queue": state.accept_queue,
+        "peers": dump_peers(state),
+    }
+
+
+def write_json_atomic(path: str, obj: dict, durable: bool = False):
+    """
+    JSON'u geçici dosyaya yazıp os.replace ile atomik olarak yerine koyar;
+    okuyucu yarım yazılmış dosya görmez.
+    durable=True ise yeniden başlatmadan sağ çıkması için diske de zorlanır (fsync).
+    """
+    data = json.dumps(obj, separators=(",", ":"))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_peer_view(path: str, state: State, extras: Optional[dict] = None):
+    """Görünümü (ve State dışındaki ek alanları) atomik olarak dosyaya yazar."""
+    write_json_atomic(path, {**dump_peer_view(state), **(extras or {})})
+
+
+def read_peer_view(path: str) -> Optional[dict]:
+    """Görünümü okur; dosya yoksa veya sürüm uyuşmuyorsa None döner."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get("version") != FORMAT_VERSION:
+        logger.warning(f"Peer görünümü sürümü desteklenmiyor: {data.get('version')}")
+        return None
+    return data
+
+
+def apply_peer_view(state: State, data: dict):
+    """Okunan görünümü State'e uygular."""
+    state.set_my_cpu_load(data.get("my_cpu_load", 0.0))
+    state.set_accept_queue(data.get("accept_queue", 0))
+    state.apply_peer_view(data.get("peers", []))
+
+
+class PeerViewPublisher:
+    """Kontrol düzlemi process'inde görünümü periyodik olarak dosyaya yazar."""
+
+    def __init__(self, state: State, path: str, interval: float = 0.5,
+                 scheduler: Optional[Scheduler] = None, extras: Optional[Callable[[], dict]] = None):
+        """
+        Args:
+            extras: Görünüme eklenecek, State'te olmayan alanları döndürür (ör. failover durumu)
+        """
+        self.state = state
+        self.path = path
+        self.interval = interval
+        self.scheduler = scheduler or Scheduler()
+        self.extras = extras
+
+    def start(self):
+        """Yazma görevini zamanlayıcıya ekler."""
+        self.scheduler.add("peer-view-publish", self.publish, self.interval, initial_delay=0)
+        self.scheduler.start()
+
+    def publish(self):
+        """Görünümü dosyaya yazar."""
+        write_peer_view(self.path, self.state, self.extras() if self.extras else None)
+
+
+class PeerViewSubscriber:
+    """Worker process'inde görünüm dosyası değiştikçe State'i günceller."""
+
+    def __init__(self, state: State, path: str, interval: float = 0.5,
+                 scheduler: Optional[Scheduler] = None):
+        self.state = state
+        self.path = path
+        self.interval = interval
+        self.scheduler = scheduler or Scheduler()
+        self._last_mtime = 0
+        self.data: dict = {}  # Son okunan görünüm (ek alanlar dahil)
+
+    def start(self):
+        """Okuma görevini zamanlayıcıya ekler."""
+        self.scheduler.add("peer-view-refresh", self.refresh, self.interval, initial_delay=0)
+        self.scheduler.start()
+
+    def refresh(self) -> bool:
+        """Dosya değiştiyse görünümü yeniden yükler. Dönüş: yüklendi mi?"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._last_mtime:
+            return False
+
+        data = read_peer_view(self.path)
+        if data is None:
+            return False
+        apply_peer_view(self.state, data)
+        self.data = data
+        self._last_mtime = mtime
+        return True
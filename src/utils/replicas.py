@@ -0,0 +1,65 @@
+"""
+src/utils/replicas.py - Registry replikaları arasında seçim.
+--main-server virgülle ayrılmış birden fazla registry adresi alabilir. Her node
+adres listesini kendi adresine göre döndürerek farklı bir replikayı tercih eder;
+böylece heartbeat ve long-poll yükü replikalara yayılır. Tercih edilen replikanın
+devresi açıksa sıradaki hazır replika kullanılır.
+"""
+import zlib
+from typing import Iterable, List, Optional, Union
+
+from .breaker import PeerBreakers
+
+
+def parse_addresses(addresses: Union[str, Iterable[str]]) -> List[str]:
+    """"http://a:8000,http://b:8000" ya da adres listesini normalize eder (sıra korunur)."""
+    if isinstance(addresses, str):
+        addresses = addresses.split(",")
+    result = []
+    for addr in addresses:
+        addr = addr.strip().rstrip("/")
+        if addr and addr not in result:
+            result.append(addr)
+    if not result:
+        raise ValueError("En az bir registry adresi gerekli")
+    return result
+
+
+class RegistryReplicas:
+    """Registry replika adresleri; node başına sabit bir tercih sırası tutar."""
+
+    def __init__(self, addresses: Union[str, Iterable[str]], my_addr: str = "",
+                 breakers: Optional[PeerBreakers] = None):
+        self.addresses = parse_addresses(addresses)
+        self.breakers = breakers
+        # Aynı node her zaman aynı replikayı tercih eder (bağlantı ve sürüm takibi korunur)
+        offset = zlib.crc32(my_addr.encode()) % len(self.addresses)
+        self.order = self.addresses[offset:] + self.addresses[:offset]
+
+    @property
+    def preferred(self) -> str:
+        return self.order[0]
+
+    def candidates(self) -> List[str]:
+        """Devresi istek kabul eden replikalar (tercih sırasıyla); hiçbiri hazır değilse tercih edilen."""
+        if self.breakers is None:
+            return list(self.order)
+        ready = [addr for addr in self.order if self.breakers.ready(addr)]
+        return ready or [self.preferred]
+
+    def pick(self) -> str:
+        """Devresi istek kabul eden ilk replika; hiçbiri hazır değilse tercih edilen."""
+        return self.candidates()[0]
+
+    def all_open(self) -> bool:
+        """Tüm replikaların devresi açık mı (registry tamamen kayıp)?"""
+        return self.breakers is not None and all(self.breakers.is_open(addr) for addr in self.order)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self.addresses
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __str__(self) -> str:
+        return ",".join(self.addresses)
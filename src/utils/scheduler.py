@@ -0,0 +1,236 @@
+"""
+src/utils/scheduler.py - Node'un tüm periyodik görevleri için tek zamanlayıcı.
+Her görev için ayrı "while True: ... sleep()" thread'i yerine tek bir zamanlayıcı
+thread'i görevleri küçük bir havuza dağıtır: jitter, kaçırılan tick yönetimi,
+iptal ve görev başına süre istatistikleri. Uzun bloklayan (long-poll) ya da
+zamanlaması kritik görevler (CPU örnekleme, heartbeat) pool ile ayrı bir
+thread'e verilir; ortak havuz yavaş peer'larla dolsa da gecikmezler.
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Zamanlayıcıya kayıtlı periyodik bir görev ve istatistikleri."""
+
+    def __init__(self, name: str, func: Callable[[], Optional[float]], interval: float, jitter: float,
+                 fixed_delay: bool = False, pool: Optional[str] = None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter          # Aralığın oranı olarak (0.1 = ±%10)
+        self.fixed_delay = fixed_delay  # True: bir sonraki tur, önceki bittikten interval sonra
+        self.pool = pool              # Ayrı thread'in adı (None = ortak havuz)
+
+        self.base_next = 0.0          # Jitter'sız planlanan zaman (monotonic)
+        self.running = False
+        self.cancelled = False
+        self.future: Optional[Future] = None  # Son gönderilen tur
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0              # Kaçırılan (çalıştırılmayan) tick sayısı
+        self.last_duration = 0.0
+        self.avg_duration = 0.0       # EWMA (saniye)
+        self.max_duration = 0.0
+
+    def record(self, duration: float, failed: bool):
+        """Bir çalıştırmanın sonucunu kaydeder."""
+        self.runs += 1
+        if failed:
+            self.failures += 1
+        self.last_duration = duration
+        self.avg_duration = duration if self.runs == 1 else 0.2 * duration + 0.8 * self.avg_duration
+        self.max_duration = max(self.max_duration, duration)
+
+    def stats(self) -> Dict:
+        """Görev istatistiklerini sözlük olarak döndürür."""
+        return {
+            "interval": self.interval,
+            "pool": self.pool or "shared",
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "running": self.running,
+            "last_ms": round(self.last_duration * 1000, 2),
+            "avg_ms": round(self.avg_duration * 1000, 2),
+            "max_ms": round(self.max_duration * 1000, 2),
+        }
+
+
+class Scheduler:
+    """Periyodik görevleri tek thread'den zamanlayan ve havuzda çalıştıran yapı."""
+
+    def __init__(self, max_workers: int = 4, jitter: float = 0.1, rng: Optional[random.Random] = None):
+        self.max_workers = max_workers
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+        self._tasks: Dict[str, PeriodicTask] = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pools: Dict[str, ThreadPoolExecutor] = {}  # Ayrı thread isteyen görevler için
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def add(self, name: str, func: Callable[[], Optional[float]], interval: float,
+            initial_delay: Optional[float] = None, jitter: Optional[float] = None,
+            fixed_delay: bool = False, pool: Optional[str] = None) -> PeriodicTask:
+        """
+        Periyodik görev ekler (aynı isimde görev varsa onu değiştirir).
+
+        Args:
+            initial_delay: İlk çalıştırmaya kadar bekleme. None ise [0, interval)
+                aralığından rastgele seçilir; node'lar aynı anda çalışmaz.
+            fixed_delay: Sabit oran yerine sabit gecikme (uzun süren long-poll
+                görevleri için). Bu modda görev bir sayı döndürürse bir sonraki
+                tura kadar o kadar saniye beklenir.
+            pool: Görevin çalışacağı ayrı thread'in adı. Aynı adı taşıyan görevler
+                o thread'i paylaşır; None ise ortak havuz kullanılır.
+        """
+        task = PeriodicTask(name, func, interval, self.jitter if jitter is None else jitter, fixed_delay, pool)
+        if initial_delay is None:
+            initial_delay = self.rng.uniform(0, interval)
+
+        with self._cond:
+            old = self._tasks.get(name)
+            if old:
+                old.cancelled = True
+            self._tasks[name] = task
+            task.base_next = time.monotonic() + initial_delay
+            self._push(task, task.base_next)
+            self._cond.notify()
+        return task
+
+    def cancel(self, name: str):
+        """Görevi iptal eder; çalışmakta olan tur tamamlanır."""
+        with self._cond:
+            task = self._tasks.pop(name, None)
+            if task:
+                task.cancelled = True
+                self._cond.notify()
+
+    def start(self):
+        """Zamanlayıcı thread'ini başlatır (birden fazla çağrı güvenlidir)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sched")
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Zamanlayıcıyı durdurur ve çalışan görevleri en fazla timeout saniye bekler.
+        Süreyi aşan tur (ör. 25 sn'ye kadar süren registry long-poll'u) beklenmez;
+        kendi isteğinin süresi dolunca biter.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+        for executor in [self._executor, *self._pools.values()]:
+            executor.shutdown(wait=False, cancel_futures=True)
+        with self._cond:
+            running = {task.future: task.name for task in self._tasks.values()
+                       if task.running and task.future is not None}
+        _, pending = wait(running, timeout=max(0.0, deadline - time.monotonic()))
+        if pending:
+            logger.warning(f"Zamanlayıcı durduruldu; bitmeyen görevler beklenmedi: "
+                           f"{sorted(running[f] for f in pending)}")
+        else:
+            logger.info("Zamanlayıcı durduruldu")
+
+    def stats(self) -> Dict[str, Dict]:
+        """Tüm görevlerin istatistiklerini döndürür."""
+        with self._cond:
+            return {name: task.stats() for name, task in self._tasks.items()}
+
+    def _executor_for(self, task: PeriodicTask) -> ThreadPoolExecutor:
+        """Görevin havuzu; ayrı thread'ler ilk kullanımda oluşturulur. Lock altında çağrılmalı."""
+        if task.pool is None:
+            return self._executor
+        executor = self._pools.get(task.pool)
+        if executor is None:
+            executor = self._pools[task.pool] = ThreadPoolExecutor(max_workers=1,
+                                                                    thread_name_prefix=f"sched-{task.pool}")
+        return executor
+
+    def _push(self, task: PeriodicTask, base: float, period: Optional[float] = None):
+        """Görevi jitter uygulanmış zamanla kuyruğa ekler. Lock altında çağrılmalı."""
+        spread = task.jitter * (task.interval if period is None else period)
+        when = base + (self.rng.uniform(-spread, spread) if spread else 0.0)
+        heapq.heappush(self._heap, (when, next(self._seq), task))
+
+    def _reschedule(self, task: PeriodicTask, now: float):
+        """Bir sonraki tick'i planlar; geride kalındıysa kaçırılan tick'leri atlar."""
+        planned = task.base_next + task.interval
+        if planned <= now:
+            missed = int((now - task.base_next) // task.interval)
+            task.skipped += missed
+            planned = task.base_next + (missed + 1) * task.interval
+        task.base_next = planned
+        self._push(task, planned)
+
+    def _loop(self):
+        """Kuyruktaki ilk görevin zamanı gelene kadar bekler ve onu havuza verir."""
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                when, _, task = self._heap[0]
+                now = time.monotonic()
+                if when > now:
+                    self._cond.wait(when - now)
+                    continue
+
+                heapq.heappop(self._heap)
+                if task.cancelled:
+                    continue
+
+                if task.running:
+                    # Önceki tur hâlâ sürüyor: üst üste bindirme, bu tick'i atla
+                    task.skipped += 1
+                else:
+                    task.running = True
+                    task.future = self._executor_for(task).submit(self._run, task)
+                if not task.fixed_delay:
+                    self._reschedule(task, now)
+
+    def _run(self, task: PeriodicTask):
+        """Görevi çalıştırır ve süresini kaydeder."""
+        started = time.monotonic()
+        failed = False
+        delay = None
+        try:
+            delay = task.func()
+        except Exception as e:
+            failed = True
+            logger.error(f"Görev başarısız ({task.name}): {e}")
+        finally:
+            with self._cond:
+                finished = time.monotonic()
+                task.record(finished - started, failed)
+                task.running = False
+                if task.fixed_delay and not task.cancelled and self._running:
+                    if isinstance(delay, bool) or not isinstance(delay, (int, float)):
+                        delay = task.interval
+                    task.base_next = finished + delay
+                    self._push(task, task.base_next, delay)
+                    self._cond.notify()
@@ -0,0 +1,96 @@
+"""
+src/utils/selection.py - Yönlendirme hedefi seçim politikaları.
+Tüm aşırı yüklü node'ların aynı "en iyi" peer'a yığılmasını (herd) önler.
+"""
+import random
+from typing import Dict, Optional, Sequence
+
+from .state import Peer
+
+
+# Son örnekten beri gönderilen her yönlendirme için skora eklenen ceza
+REDIRECT_PENALTY = 2.0
+
+
+def effective_score(peer: Peer) -> float:
+    """Peer skoruna, son örnekten beri ona gönderdiğimiz yönlendirmeleri ekler."""
+    return peer.score + peer.redirects * REDIRECT_PENALTY
+
+
+class SelectionPolicy:
+    """Aday peer'lar arasından yönlendirme hedefini seçer."""
+
+    name = "base"
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+
+    def choose(self, ranked: Sequence[Peer]) -> Optional[Peer]:
+        """
+        Args:
+            ranked: Skora göre sıralı (en iyi başta) aday peer'lar
+        """
+        raise NotImplementedError
+
+
+class BestScorePolicy(SelectionPolicy):
+    """Her zaman en düşük skorlu peer'ı seçer (eski davranış)."""
+
+    name = "best"
+
+    def choose(self, ranked):
+        return ranked[0] if ranked else None
+
+
+class PowerOfTwoPolicy(SelectionPolicy):
+    """Rastgele iki aday seçer, efektif skoru düşük olana yönlendirir."""
+
+    name = "p2c"
+
+    def choose(self, ranked):
+        if not ranked:
+            return None
+        if len(ranked) == 1:
+            return ranked[0]
+        a, b = self.rng.sample(ranked, 2)
+        return a if effective_score(a) <= effective_score(b) else b
+
+
+class WeightedRandomPolicy(SelectionPolicy):
+    """Efektif skorla ters orantılı ağırlıkla rastgele seçer."""
+
+    name = "weighted"
+
+    def choose(self, ranked):
+        if not ranked:
+            return None
+        weights = [1.0 / (1.0 + max(0.0, effective_score(p))) for p in ranked]
+        return self.rng.choices(ranked, weights=weights, k=1)[0]
+
+
+class LeastRecentlyChosenPolicy(SelectionPolicy):
+    """En iyi k aday arasından en uzun süredir seçilmemiş olanı seçer."""
+
+    name = "lrc"
+
+    def __init__(self, rng: Optional[random.Random] = None, top_k: int = 3):
+        super().__init__(rng)
+        self.top_k = top_k
+
+    def choose(self, ranked):
+        if not ranked:
+            return None
+        return min(ranked[:self.top_k], key=lambda p: p.last_chosen)
+
+
+POLICIES: Dict[str, type] = {
+    cls.name: cls
+    for cls in (BestScorePolicy, PowerOfTwoPolicy, WeightedRandomPolicy, LeastRecentlyChosenPolicy)
+}
+
+
+def make_policy(name: str, rng: Optional[random.Random] = None) -> SelectionPolicy:
+    """İsimden politika nesnesi oluşturur."""
+    if name not in POLICIES:
+        raise ValueError(f"Bilinmeyen seçim politikası: {name} (seçenekler: {', '.join(POLICIES)})")
+    return POLICIES[name](rng=rng)
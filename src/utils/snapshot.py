@@ -0,0 +1,93 @@
+"""
+src/utils/snapshot.py - Hızlı yeniden başlatma için peer anlık görüntüsü (warm start).
+Yeniden başlayan node'un State'i boştur: ilk keşif ve yük turu bitene kadar
+best_peer() None döner; registry de kapalıysa A_M_R boş üyelik listesiyle ağa
+geri katılamaz. Node peer'ları, yumuşatılmış metrikleri ve A_M_R üyeliğini
+periyodik olarak db/ altına atomik yazar ve açılışta bu dosyayı yükler.
+"""
+import json
+import time
+import logging
+from typing import Optional
+
+from .state import State
+from .scheduler import Scheduler
+from .peer_view import dump_peers, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def dump_snapshot(state: State, a_m_r=None) -> dict:
+    """Peer'ları ve (varsa) A_M_R üyelik tablosunu sözlüğe dönüştürür."""
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "written_at": time.time(),
+        "peers": dump_peers(state),
+    }
+    if a_m_r is not None:
+        with a_m_r.lock:
+            data["a_m_r"] = {"incarnation": a_m_r.incarnation, "members": a_m_r.delta_since(0)}
+    return data
+
+
+def load_snapshot(path: str, max_age: float = 3600.0) -> Optional[dict]:
+    """
+    Anlık görüntüyü okur. Dosya yoksa, bozuksa, sürümü uyuşmuyorsa ya da
+    max_age saniyeden eskiyse (üyelik artık güvenilir değil) None döner.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Anlık görüntü okunamadı ({path}): {e}")
+        return None
+    if data.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Anlık görüntü sürümü desteklenmiyor: {data.get('version')}")
+        return None
+    age = time.time() - data.get("written_at", 0)
+    if max_age and age > max_age:
+        logger.info(f"Anlık görüntü çok eski ({age:.0f}s), yok sayılıyor")
+        return None
+    return data
+
+
+def restore_snapshot(state: State, data: dict, a_m_r=None) -> int:
+    """
+    Anlık görüntüyü State'e ve A_M_R'a uygular. Metrikler kaydedildikleri
+    zamanla gelir; State'in bayatlık cezası ve süre aşımı eski örnekleri eler.
+    Dönüş: Yüklenen peer sayısı
+    """
+    # Devre kesiciler sıfırdan başlar; açık devre bilgisi taşınmaz
+    peers = [dict(entry, circuit_open=False) for entry in data.get("peers", [])]
+    state.apply_peer_view(peers)
+    if a_m_r is not None:
+        saved = data.get("a_m_r", {})
+        a_m_r.restore(saved.get("members", []), saved.get("incarnation", 0))
+        # Registry'den öğrenilen peer'lar da P2P ağa geri katılmak için tohum olur
+        a_m_r.merge([{"address": entry["address"]} for entry in peers])
+    return len(peers)
+
+
+class SnapshotWriter:
+    """Anlık görüntüyü periyodik olarak diske yazar (kontrol düzlemi process'inde)."""
+
+    def __init__(self, state: State, path: str, a_m_r=None, interval: float = 10.0,
+                 scheduler: Optional[Scheduler] = None):
+        self.state = state
+        self.path = path
+        self.a_m_r = a_m_r
+        self.interval = interval
+        self.scheduler = scheduler or Scheduler()
+
+    def start(self):
+        """Yazma görevini zamanlayıcıya ekler."""
+        self.scheduler.add("snapshot", self.save, self.interval)
+        self.scheduler.start()
+
+    def save(self):
+        """Anlık görüntüyü atomik olarak yazar."""
+        write_json_atomic(self.path, dump_snapshot(self.state, self.a_m_r), durable=True)
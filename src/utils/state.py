@@ -1,65 +1,482 @@
 """
 src/utils/state.py - Ağ durumunu thread-safe şekilde yönetir.
 """
+import math
 import threading
-from typing import List, Dict, Optional
+import time
+import logging
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Callable, List, Dict, Optional, Tuple
+
+from .overload import OverloadDetector
+
+logger = logging.getLogger(__name__)
+
+
+def _alpha(dt: float, tau: float) -> float:
+    """Zaman damgalı EWMA katsayısı: dt saniye sonra gelen örneğin ağırlığı."""
+    return 1.0 - math.exp(-max(0.0, dt) / tau) if tau > 0 else 1.0
 
 
 class Peer:
-    """Ağdaki başka bir sunucunun durumu."""
+    """
+    Ağdaki başka bir sunucunun durumu.
+    Yük ve RTT tek örnek yerine zaman damgalı EWMA ile tutulur: önceki örnekten
+    bu yana geçen süre uzadıkça yeni örneğin ağırlığı artar (1 - e^(-dt/tau)),
+    böylece örnekleme aralığı değişse de yumuşatma aynı zaman ölçeğinde kalır.
+    Zamanlar yerel saatle (alındığı an) tutulur; kaynağın (registry'deki node'un)
+    saati sadece aynı kaynaktan tekrar gelen örneği ayıklamak için kullanılır,
+    böylece host'lar arasındaki saat farkı yaşa ve EWMA'ya karışmaz.
+    Binlerce peer tutulabildiği için __slots__ kullanılır.
+    """
+    
+    __slots__ = ("address", "load", "effective_load", "latency", "jitter", "score", "updated_at", "source_at",
+                 "rtt_at", "redirects", "last_chosen", "circuit_open")
     
     def __init__(self, address: str):
         self.address = address
-        self.load = 0.0          # CPU yükü (%)
-        self.latency = 0.0       # Ağ gecikmesi (ms)
+        self.load = 0.0          # CPU yükü (%, EWMA)
+        self.effective_load = 0.0  # CPU ve diğer yük sinyallerinin en büyüğü (% biriminde, EWMA)
+        self.latency = 0.0       # Ağ gecikmesi (ms, EWMA)
+        self.jitter = 0.0        # Gecikmenin ortalamadan sapması (ms, EWMA)
         self.score = 9999.0      # Sağlık skoru (düşük daha iyi)
+        self.updated_at = 0.0    # Son yük örneğinin alındığı zaman (yerel saat, epoch saniye)
+        self.source_at = 0.0     # Son registry örneğinin kaynaktaki zaman damgası (gönderen node'un saati)
+        self.rtt_at = 0.0        # Son RTT ölçümünün zamanı
+        self.redirects = 0       # Son örnekten beri bu peer'a gönderdiğimiz yönlendirmeler
+        self.last_chosen = 0.0   # Bu peer'ın en son seçildiği zaman
+        self.circuit_open = False  # Devre kesici açık: cevap vermiyor, seçilemez
     
-    def update_metrics(self, load: float, latency: float):
-        """Yük ve gecikme metriklerini günceller ve skoru hesaplar."""
-        self.load = load
-        self.latency = latency
-        # Basit skorlama: %70 yük, %30 gecikme
-        self.score = (load * 0.7) + (latency * 0.3)
+    @property
+    def has_sample(self) -> bool:
+        """En az bir yük ya da RTT örneği var mı? (Boşta olan peer'ın yükü 0 olabilir)"""
+        return self.updated_at > 0 or self.rtt_at > 0
+    
+    @property
+    def sampled_at(self) -> float:
+        """Skoru belirleyen en son örneğin zamanı (yük yoksa RTT)."""
+        return self.updated_at or self.rtt_at
+    
+    def observe_load(self, load: float, received_at: float, effective_load: Optional[float] = None,
+                     tau: float = 5.0, source_at: Optional[float] = None) -> bool:
+        """
+        Yük örneğini EWMA'ya ekler. effective_load verilmezse (eski node) CPU yükü kullanılır.
+        received_at örneğin yerel alım zamanıdır; yaş ve EWMA aralığı bundan hesaplanır.
+        source_at (registry kaydındaki node zaman damgası) verilirse aynı ya da daha
+        eski damgalı örnek (tekrar gelen registry kaydı) yok sayılır.
+        Dönüş: Örnek uygulandı mı?
+        """
+        if source_at is not None:
+            if source_at <= self.source_at:
+                return False
+            self.source_at = source_at
+        effective = effective_load if effective_load is not None else load
+        if self.updated_at == 0.0:
+            self.load = load
+            self.effective_load = effective
+        else:
+            alpha = _alpha(received_at - self.updated_at, tau)
+            self.load += alpha * (load - self.load)
+            self.effective_load += alpha * (effective - self.effective_load)
+        self.updated_at = max(self.updated_at, received_at)
+        # Yeni örnek bizim yönlendirmelerimizi zaten yansıtıyor
+        self.redirects = 0
+        return True
+    
+    def observe_rtt(self, latency: float, measured_at: float, tau: float = 10.0) -> bool:
+        """RTT ölçümünü EWMA'ya ekler; sapma RFC 6298'deki RTTVAR gibi izlenir."""
+        if measured_at <= self.rtt_at:
+            return False
+        if self.rtt_at == 0.0:
+            self.latency = latency
+            self.jitter = latency / 2
+        else:
+            alpha = _alpha(measured_at - self.rtt_at, tau)
+            self.jitter += alpha * (abs(latency - self.latency) - self.jitter)
+            self.latency += alpha * (latency - self.latency)
+        self.rtt_at = measured_at
+        return True
     
     def to_dict(self):
         """Peer'ı sözlüğe dönüştürür (JSON serializable)."""
         return {
             "address": self.address,
             "load": round(self.load, 2),
+            "effective_load": round(self.effective_load, 2),
             "latency": round(self.latency, 2),
+            "jitter": round(self.jitter, 2),
             "score": round(self.score, 2),
+            "updated_at": round(self.updated_at, 3),
+            "redirects": self.redirects,
+            "circuit_open": self.circuit_open,
         }
 
 
+class ScoreWeights:
+    """
+    Peer skorunun ağırlıkları (düşük skor daha iyi).
+    skor = load * efektif yük + latency * RTT + jitter * sapma + staleness * bayatlık (sn)
+    """
+    
+    __slots__ = ("load", "latency", "jitter", "staleness")
+    
+    def __init__(self, load: float = 0.7, latency: float = 0.3, jitter: float = 0.1, staleness: float = 2.0):
+        """
+        Args:
+            staleness: Örnek stale_after'dan eskiyse, aşan her saniye için eklenen ceza
+        """
+        self.load = load
+        self.latency = latency
+        self.jitter = jitter
+        self.staleness = staleness
+    
+    @classmethod
+    def parse(cls, spec: str) -> "ScoreWeights":
+        """"load=0.7,latency=0.3,jitter=0.1,staleness=2" biçiminden oluşturur (verilmeyenler varsayılan)."""
+        weights = cls()
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, value = item.partition("=")
+            if name not in cls.__slots__:
+                raise ValueError(f"Bilinmeyen skor ağırlığı: {name} (seçenekler: {', '.join(cls.__slots__)})")
+            setattr(weights, name, float(value))
+        return weights
+    
+    def score(self, peer: Peer, stale_for: float) -> float:
+        return (self.load * peer.effective_load + self.latency * peer.latency + self.jitter * peer.jitter
+                + self.staleness * stale_for)
+
+
 class State:
     """Sunucunun bildiği tüm ağ durumunu thread-safe şekilde yönetir."""
     
-    def __init__(self, cpu_threshold: float = 70.0):
+    def __init__(self, cpu_threshold: float = 70.0, cpu_alpha: float = 0.3, cpu_window: int = 10,
+                 policy=None, shared_inflight=None, time_fn=time.time, inflight_limit: Optional[int] = None,
+                 latency_threshold_ms: Optional[float] = None, queue_limit: Optional[int] = None,
+                 latency_alpha: float = 0.2, score_weights: Optional[ScoreWeights] = None,
+                 stale_after: float = 15.0, expire_after: float = 45.0, load_tau: float = 5.0,
+                 rtt_tau: float = 10.0):
+        """
+        Args:
+            score_weights: Peer skorunun ağırlıkları (None = varsayılanlar)
+            stale_after: Bu kadar saniyeden eski örnek bayat sayılır ve skoruna ceza eklenir
+            expire_after: Bu kadar saniyedir örneği gelmeyen peer seçilmez (0 = kapalı)
+            load_tau, rtt_tau: Yük ve RTT EWMA'sının zaman sabitleri (saniye)
+        """
         self.lock = threading.RLock()
+        self.time_fn = time_fn  # Zaman damgaları için saat (simülasyonda sanal saat)
+        self.policy = policy  # SelectionPolicy (None = her zaman en iyi skor)
         self.peers: Dict[str, Peer] = {}
-        self.cpu_threshold = cpu_threshold  # %70 varsayılan
-        self.my_cpu_load = 0.0  # Bu sunucunun CPU yükü
+        self.my_cpu_load = 0.0  # Bu sunucunun CPU yükü (EWMA ile yumuşatılmış)
+        self.cpu_alpha = cpu_alpha  # EWMA katsayısı (yüksek = yeni örneğe daha duyarlı)
+        self.cpu_samples = deque(maxlen=cpu_window)  # Son ham örnekler (kayan pencere)
+        self.inflight = 0  # Şu an işlenmekte olan istek sayısı (bu process)
+        # Çok process'li modda tüm worker'ların ortak sayacı (multiprocessing.Value)
+        self.shared_inflight = shared_inflight
+        self.latency_ms = 0.0  # Yerel olarak karşılanan isteklerin handler süresi (EWMA, ms)
+        self.latency_alpha = latency_alpha
+        self.accept_queue = 0  # Accept kuyruğunda bekleyen bağlantılar (son örnek)
+        # Aşırı yük kararı (CPU eşiği %70 varsayılan; diğer sinyaller limit verilirse devreye girer)
+        self.overload = OverloadDetector(cpu_threshold, inflight_limit, latency_threshold_ms, queue_limit)
+        self.weights = score_weights or ScoreWeights()
+        self.stale_after = stale_after
+        self.expire_after = expire_after
+        self.load_tau = load_tau
+        self.rtt_tau = rtt_tau
+        
+        # Skora göre sıralı indeks: (score, address) -> sadece metriği olan peer'lar.
+        # Yazarlar lock altında günceller; okuyucular _ranked anlık görüntüsünü lock'suz okur.
+        self._index: List[Tuple[float, str]] = []
+        self._index_keys: Dict[str, Tuple[float, str]] = {}
+        self._ranked: Tuple[Peer, ...] = ()
+        # Durum sayfası gibi türetilmiş görünümler için değişiklik sayacı: sadece peer
+        # üyeliği, metrikleri ya da sıralaması değişince artar. CPU örnekleri ve değişmeyen
+        # skorların periyodik yeniden hesabı artırmaz (yönlendirme sayaçları da)
+        self.version = 0
+        self._removal_listeners: List[Callable[[List[str]], None]] = []
+    
+    @property
+    def cpu_threshold(self) -> float:
+        return self.overload.cpu_threshold
+    
+    def subscribe_removals(self, listener: Callable[[List[str]], None]):
+        """Peer'lar silindiğinde listener(adresler) çağrılır (peer başına kaynakları bırakmak için)."""
+        self._removal_listeners.append(listener)
+    
+    def _notify_removed(self, addresses: List[str]):
+        for listener in self._removal_listeners:
+            try:
+                listener(addresses)
+            except Exception as e:
+                logger.error(f"Peer silme dinleyicisi hata verdi: {e}")
     
     def set_my_cpu_load(self, load: float):
         """Bu sunucunun CPU yükünü ayarla."""
         with self.lock:
             self.my_cpu_load = load
     
+    def record_cpu_sample(self, sample: float):
+        """
+        Ham bir CPU örneğini kaydeder ve EWMA değerini günceller.
+        İlk örnek EWMA'yı doğrudan başlatır.
+        """
+        with self.lock:
+            if not self.cpu_samples:
+                self.my_cpu_load = sample
+            else:
+                self.my_cpu_load = self.cpu_alpha * sample + (1 - self.cpu_alpha) * self.my_cpu_load
+            self.cpu_samples.append(sample)
+    
+    def cpu_window_stats(self) -> Dict[str, float]:
+        """Kayan penceredeki ham örneklerin ortalamasını ve tepe değerini döndürür."""
+        with self.lock:
+            if not self.cpu_samples:
+                return {"avg": 0.0, "max": 0.0}
+            return {
+                "avg": sum(self.cpu_samples) / len(self.cpu_samples),
+                "max": max(self.cpu_samples),
+            }
+    
+    def begin_request(self):
+        """Bir isteğin işlenmeye başladığını kaydeder."""
+        with self.lock:
+            self.inflight += 1
+        if self.shared_inflight is not None:
+            with self.shared_inflight.get_lock():
+                self.shared_inflight.value += 1
+    
+    def end_request(self):
+        """Bir isteğin bittiğini kaydeder."""
+        with self.lock:
+            self.inflight = max(0, self.inflight - 1)
+        if self.shared_inflight is not None:
+            with self.shared_inflight.get_lock():
+                self.shared_inflight.value = max(0, self.shared_inflight.value - 1)
+    
+    def inflight_count(self) -> int:
+        """İşlenmekte olan istek sayısı (çok process'li modda host geneli)."""
+        if self.shared_inflight is not None:
+            return self.shared_inflight.value
+        return self.inflight
+    
+    def record_latency(self, latency_ms: float):
+        """Yerel olarak karşılanan bir isteğin süresini EWMA'ya ekler."""
+        with self.lock:
+            if self.latency_ms == 0.0:
+                self.latency_ms = latency_ms
+            else:
+                self.latency_ms = self.latency_alpha * latency_ms + (1 - self.latency_alpha) * self.latency_ms
+    
+    def set_accept_queue(self, depth: int):
+        """Accept kuyruğu derinliğinin son örneğini kaydeder."""
+        with self.lock:
+            self.accept_queue = depth
+    
     def is_overloaded(self) -> bool:
-        """Bu sunucu aşırı yüklü mü?"""
+        """
+        Bu sunucu aşırı yüklü mü?
+        CPU, in-flight, gecikme ve accept kuyruğu sinyalleri histerezisle birlikte değerlendirilir.
+        """
+        inflight = self.inflight_count()
         with self.lock:
-            return self.my_cpu_load > self.cpu_threshold
+            return self.overload.update(self.my_cpu_load, inflight, self.latency_ms, self.accept_queue)
+    
+    def effective_load(self) -> float:
+        """Yük sinyallerinin en büyüğü, CPU yüzdesi biriminde (heartbeat ve /load ile yayınlanır)."""
+        inflight = self.inflight_count()
+        with self.lock:
+            return self.overload.effective_load(self.my_cpu_load, inflight, self.latency_ms, self.accept_queue)
+    
+    def load_signals(self) -> Dict:
+        """/load için tüm yük sinyalleri."""
+        inflight = self.inflight_count()
+        with self.lock:
+            overload = self.overload
+            return {
+                "cpuLoad": self.my_cpu_load,
+                "inFlight": inflight,
+                "latencyMs": self.latency_ms,
+                "acceptQueue": self.accept_queue,
+                "effectiveLoad": overload.effective_load(self.my_cpu_load, inflight, self.latency_ms,
+                                                         self.accept_queue),
+                "overloaded": overload.overloaded,
+                "overloadReason": overload.reason,
+            }
     
     def all_peers(self) -> List[Peer]:
         """Tüm bilinen peer'ları döndürür."""
         with self.lock:
             return list(self.peers.values())
     
-    def update_peer_metrics(self, address: str, load: float, latency: float):
+    def _reindex_remove(self, address: str):
+        """Peer'ı sıralı indeksten çıkarır. Lock altında çağrılmalı."""
+        key = self._index_keys.pop(address, None)
+        if key is not None:
+            i = bisect_left(self._index, key)
+            if i < len(self._index) and self._index[i] == key:
+                del self._index[i]
+    
+    def _rescore(self, peer: Peer, now: float) -> bool:
+        """
+        Peer'ın skorunu örneğin yaşıyla birlikte yeniden hesaplar. Lock altında çağrılmalı.
+        Dönüş: Peer seçilebilir mi (örneği var, süresi dolmamış, devresi kapalı)?
+        """
+        if not peer.has_sample:
+            return False
+        age = now - peer.sampled_at
+        peer.score = self.weights.score(peer, max(0.0, age - self.stale_after))
+        return not peer.circuit_open and not (self.expire_after and age > self.expire_after)
+    
+    def _reindex(self, peer: Peer):
+        """Peer'ın sıralı indeksteki yerini günceller. Lock altında çağrılmalı."""
+        self._reindex_remove(peer.address)
+        
+        # Yükü 0 olan (boştaki) peer da örneği varsa seçilebilir
+        if self._rescore(peer, self.time_fn()):
+            key = (peer.score, peer.address)
+            insort(self._index, key)
+            self._index_keys[peer.address] = key
+    
+    def refresh_scores(self):
+        """
+        Tüm skorları güncel zamana göre yeniden hesaplar ve indeksi baştan kurar.
+        Yeni örnek gelmeyen peer'ın skoru kendiliğinden değişmediği için periyodik
+        çağrılır; bayatlayan peer geriye düşer, süresi dolan seçimden çıkar.
+        """
+        with self.lock:
+            now = self.time_fn()
+            keys = {peer.address: (peer.score, peer.address)
+                    for peer in self.peers.values() if self._rescore(peer, now)}
+            index = sorted(keys.values())
+            if index == self._index:
+                # Skor ve sıra aynı: anlık görüntü ve sürüm olduğu gibi kalır
+                return
+            self._index = index
+            self._index_keys = keys
+            self._publish()
+    
+    def _publish(self):
+        """Okuyucular için yeni sıralı anlık görüntü yayınlar. Lock altında çağrılmalı."""
+        self._ranked = tuple(self.peers[addr] for _, addr in self._index)
+        self.version += 1
+    
+    def _apply_metrics(self, peer: Peer, load: Optional[float], latency: Optional[float],
+                       sampled_at: Optional[float], effective_load: Optional[float] = None):
+        """
+        Yük ve/veya RTT örneğini peer'ın EWMA'larına ekler ve indeksi günceller
+        (None verilen metrik değişmez). Örnek yerel saatle damgalanır; sampled_at
+        (kaynağın saati) sadece tekrar gelen kaydı ayıklar. Lock altında çağrılmalı.
+        """
+        now = self.time_fn()
+        if load is not None:
+            peer.observe_load(load, now, effective_load, self.load_tau, source_at=sampled_at)
+        if latency is not None:
+            # RTT her zaman yerel saatle ölçülür
+            peer.observe_rtt(latency, now, self.rtt_tau)
+        self._reindex(peer)
+    
+    def update_peer_metrics(self, address: str, load: float, latency: float,
+                            sampled_at: Optional[float] = None, effective_load: Optional[float] = None):
         """Bir peer'ın metriklerini günceller."""
         with self.lock:
-            if address in self.peers:
-                self.peers[address].update_metrics(load, latency)
+            peer = self.peers.get(address)
+            if peer:
+                self._apply_metrics(peer, load, latency, sampled_at, effective_load)
+                self._publish()
+    
+    def update_peer_load(self, address: str, load: float, sampled_at: Optional[float] = None,
+                         effective_load: Optional[float] = None):
+        """Bir peer'ın sadece yükünü günceller (gecikme son ölçülen değerde kalır)."""
+        self.update_peer_loads([(address, load, sampled_at, effective_load)])
+    
+    def update_peer_loads(self, samples: List[Tuple[str, float, Optional[float], Optional[float]]]):
+        """
+        Birden fazla peer'ın yükünü tek seferde günceller.
+        samples: [(adres, CPU yükü, kaynaktaki örnek zamanı veya None, efektif yük veya None), ...]
+        Anlık görüntü tüm güncellemelerden sonra bir kez yayınlanır.
+        """
+        with self.lock:
+            for address, load, sampled_at, effective_load in samples:
+                peer = self.peers.get(address)
+                if peer:
+                    self._apply_metrics(peer, load, None, sampled_at, effective_load)
+            self._publish()
+    
+    def update_peer_latency(self, address: str, latency: float):
+        """Bir peer'ın sadece gecikmesini (RTT) günceller."""
+        with self.lock:
+            peer = self.peers.get(address)
+            if peer:
+                self._apply_metrics(peer, None, latency, None)
+                self._publish()
+    
+    def set_peer_circuit(self, address: str, is_open: bool):
+        """
+        Peer'ın devre kesici durumunu uygular (PeerBreakers aboneliği).
+        Açık peer sıralı indeksten hemen çıkar; kapanınca son metrikleriyle geri döner.
+        """
+        with self.lock:
+            peer = self.peers.get(address)
+            if peer and peer.circuit_open != is_open:
+                peer.circuit_open = is_open
+                self._reindex(peer)
+                self._publish()
+    
+    def apply_peer_view(self, entries: List[Dict]):
+        """
+        Başka bir kaynaktan gelen tam peer görünümünü uygular (üyelik + metrikler).
+        Değerler kaynakta zaten yumuşatılmış olduğundan EWMA'ya eklenmez, kopyalanır.
+        entries: [{"address", "load", "effective_load", "latency", "jitter", "updated_at",
+                   "source_at", "rtt_at", "circuit_open"}, ...]
+        """
+        with self.lock:
+            known = set(self.peers)
+            index = list(self._index)
+            self.set_peers([e["address"] for e in entries])
+            changed = set(self.peers) != known
+            for e in entries:
+                peer = self.peers.get(e["address"])
+                if not peer:
+                    continue
+                before = (peer.circuit_open, peer.load, peer.effective_load, peer.latency, peer.jitter,
+                          peer.updated_at, peer.rtt_at)
+                peer.circuit_open = bool(e.get("circuit_open"))
+                peer.load = e.get("load", 0.0)
+                peer.effective_load = e.get("effective_load", peer.load)
+                peer.latency = e.get("latency", 0.0)
+                peer.jitter = e.get("jitter", 0.0)
+                if e.get("updated_at", 0.0) != peer.updated_at:
+                    peer.redirects = 0
+                peer.updated_at = e.get("updated_at", 0.0)
+                peer.source_at = e.get("source_at", 0.0)
+                peer.rtt_at = e.get("rtt_at", 0.0)
+                changed = changed or before != (peer.circuit_open, peer.load, peer.effective_load, peer.latency,
+                                                peer.jitter, peer.updated_at, peer.rtt_at)
+                self._reindex(peer)
+            # Görünüm dosyası her yazımda yeniden okunur; aynı içerik sürümü artırmaz
+            if changed or self._index != index:
+                self._publish()
+    
+    def upsert_peers(self, peer_addresses: List[str]):
+        """Bilinmeyen peer'ları ekler; mevcutlara dokunmaz."""
+        with self.lock:
+            for addr in peer_addresses:
+                if addr not in self.peers:
+                    self.peers[addr] = Peer(addr)
+    
+    def remove_peers(self, peer_addresses: List[str]):
+        """Verilen peer'ları siler."""
+        with self.lock:
+            removed = []
+            for addr in peer_addresses:
+                if addr in self.peers:
+                    self._reindex_remove(addr)
+                    del self.peers[addr]
+                    removed.append(addr)
+            if removed:
+                self._publish()
+        if removed:
+            self._notify_removed(removed)
     
     def set_peers(self, peer_addresses: List[str]):
         """Peer listesini günceller (eski olanları siler, yenilerini ekler)."""
@@ -75,21 +492,43 @@ class State:
             # Eski peer'ları sil
             to_delete = [addr for addr in self.peers if addr not in new_peers_set]
             for addr in to_delete:
+                self._reindex_remove(addr)
                 del self.peers[addr]
+            
+            if to_delete:
+                self._publish()
+        if to_delete:
+            self._notify_removed(to_delete)
     
     def best_peer(self) -> Optional[Peer]:
-        """En düşük skora sahip (en sağlıklı) peer'ı döndürür."""
+        """En düşük skora sahip (en sağlıklı) peer'ı döndürür. Lock almaz, O(1)."""
+        ranked = self._ranked
+        return ranked[0] if ranked else None
+    
+    def top_peers(self, k: int) -> List[Peer]:
+        """Skora göre en iyi k peer'ı döndürür. Lock almaz."""
+        return list(self._ranked[:k])
+    
+    def choose_peer(self, record: bool = True) -> Optional[Peer]:
+        """
+        Seçim politikasına göre yönlendirme hedefini seçer ve seçimi kaydeder.
+        Politika yoksa best_peer() ile aynıdır.
+        
+        Args:
+            record: False ise seçim kaydedilmez; hedef reddedilebilecekse çağıran,
+                gerçekten kullandığı peer için record_redirect() çağırır
+        """
+        ranked = self._ranked
+        peer = self.policy.choose(ranked) if self.policy else (ranked[0] if ranked else None)
+        if peer and record:
+            self.record_redirect(peer)
+        return peer
+    
+    def record_redirect(self, peer: Peer):
+        """Peer'a bir yönlendirme gönderildiğini kaydeder."""
         with self.lock:
-            if not self.peers:
-                return None
-            
-            # Sadece metrikleri güncellenenler arasından seç
-            valid_peers = [p for p in self.peers.values() if p.load > 0 or p.latency > 0]
-            if not valid_peers:
-                return None
-            
-            # En düşük skora sahip olanı döndür
-            return min(valid_peers, key=lambda p: p.score)
+            peer.redirects += 1
+            peer.last_chosen = self.time_fn()
     
     def get_peer(self, address: str) -> Optional[Peer]:
         """Belirli bir peer'ı adresiyle döndürür."""
@@ -0,0 +1,190 @@
+"""
+src/utils/status.py - Durum sayfası için önbellek ve peer değişiklik akışı.
+Her GET / isteğinde şablonu yeniden işlemek, tüm peer'ları sözlüğe çevirmek
+ve lock almak sayfayı sık yoklayan panoları yüklü node'a ek yük yapar.
+Görünüm State.version (peer üyeliği, metrikleri, sıralaması) ya da yuvarlanmış
+CPU yükü değiştiğinde bir kez kurulur; sayfa, /status.json ve SSE akışındaki
+delta'lar aynı görünümden üretilir.
+"""
+import hashlib
+import json
+import threading
+import time
+import logging
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .state import State
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+REBUILDS = METRICS.counter("dinc_status_rebuilds_total", "Durum görünümünün yeniden kurulması", ("kind",))
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+class StatusView:
+    """Tek bir State sürümünün değişmez görünümü."""
+
+    __slots__ = ("key", "data", "peers", "json", "json_etag")
+
+    def __init__(self, key: Tuple, data: Dict):
+        self.key = key
+        self.data = data
+        self.peers = {p["address"]: p for p in data["peers"]}
+        self.json = json.dumps(data, separators=(",", ":")).encode()
+        self.json_etag = _etag(self.json)
+
+
+class StatusCache:
+    """
+    State sürümüne göre önbelleklenen durum görünümü, sayfası ve delta'ları.
+    Aynı sürüm için kaç istek gelirse gelsin görünüm bir kez kurulur; sayfa
+    şablonu da görünüm başına en fazla bir kez işlenir.
+    """
+
+    def __init__(self, state: State, my_addr: str, render: Optional[Callable[[Dict], str]] = None,
+                 stream_interval: float = 1.0, keepalive: float = 15.0, max_streams: int = 16):
+        """
+        Args:
+            render: Görünüm sözlüğünden HTML üreten fonksiyon (ör. Flask render_template)
+            stream_interval: Akışta sürüm değişikliği kontrol aralığı (saniye)
+            keepalive: Değişiklik olmasa da bağlantıyı canlı tutan yorum satırı aralığı
+            max_streams: Eşzamanlı akış sınırı (her akış bir worker thread'i tutar)
+        """
+        self.state = state
+        self.my_addr = my_addr
+        self.render = render
+        self.stream_interval = stream_interval
+        self.keepalive = keepalive
+        self.max_streams = max_streams
+        self.streams = 0
+        self._view: Optional[StatusView] = None
+        self._page: Tuple[Optional[Tuple], bytes, str] = (None, b"", "")
+        self._delta: Tuple[Optional[Tuple], Optional[Tuple], bytes] = (None, None, b"")
+        self._lock = threading.Lock()
+        self._page_lock = threading.Lock()  # Sürüm değişince şablonu tek bir istek işler
+
+    def _key(self) -> Tuple:
+        # Aşırı yük bayrağı histerezisle is_overloaded() çağrılarında değişir; sürümün yanında anahtarda.
+        # CPU örnekleri sürümü artırmaz: yük tam yüzde değiştikçe görünüm yenilenir
+        state = self.state
+        return state.version, state.overload.overloaded, round(state.my_cpu_load)
+
+    def view(self) -> StatusView:
+        """Güncel sürümün görünümü (gerekirse kurulur)."""
+        key = self._key()
+        view = self._view
+        if view is not None and view.key == key:
+            return view
+        with self._lock:
+            view = self._view
+            if view is None or view.key != key:
+                view = self._view = StatusView(key, self._build())
+                REBUILDS.labels("view").inc()
+        return view
+
+    def _build(self) -> Dict:
+        state = self.state
+        best = state.best_peer()
+        return {
+            "address": self.my_addr,
+            "version": state.version,
+            "cpuLoad": round(state.my_cpu_load, 2),
+            "overloaded": state.overload.overloaded,
+            "threshold": state.cpu_threshold,
+            "best": best.to_dict() if best else None,
+            "peers": [p.to_dict() for p in state.all_peers()],
+        }
+
+    def page(self) -> Tuple[bytes, str]:
+        """İşlenmiş sayfa ve ETag'i; şablon sadece görünüm değişince işlenir."""
+        view = self.view()
+        key, body, etag = self._page
+        if key == view.key:
+            return body, etag
+        with self._page_lock:
+            key, body, etag = self._page
+            if key != view.key:
+                body = self.render(view.data).encode()
+                etag = _etag(body)
+                self._page = (view.key, body, etag)
+                REBUILDS.labels("page").inc()
+        return body, etag
+
+    def delta(self, old: Optional[StatusView], new: StatusView) -> bytes:
+        """
+        old'dan new'e değişen peer'ları içeren SSE olayı. Aynı sürümdeki
+        akışlar aynı delta'yı paylaşır (son hesaplanan saklanır).
+        """
+        old_key = old.key if old is not None else None
+        cached_old, cached_new, event = self._delta
+        if cached_old == old_key and cached_new == new.key:
+            return event
+        data = {k: v for k, v in new.data.items() if k != "peers"}
+        if old is None:
+            data["full"] = True
+            data["changed"] = new.data["peers"]
+            data["removed"] = []
+        else:
+            data["full"] = False
+            data["changed"] = [p for addr, p in new.peers.items() if old.peers.get(addr) != p]
+            data["removed"] = [addr for addr in old.peers if addr not in new.peers]
+        event = b"event: status\ndata: " + json.dumps(data, separators=(",", ":")).encode() + b"\n\n"
+        self._delta = (old_key, new.key, event)
+        return event
+
+    def open_stream(self, sleep: Callable[[float], None] = time.sleep) -> Optional["StatusStream"]:
+        """Akış sınırı dolmadıysa yeni bir SSE akışı açar (doluysa None)."""
+        with self._lock:
+            if self.streams >= self.max_streams:
+                return None
+            self.streams += 1
+        return StatusStream(self, sleep)
+
+    def _release_stream(self):
+        with self._lock:
+            self.streams -= 1
+
+    def events(self, sleep: Callable[[float], None] = time.sleep) -> Iterator[bytes]:
+        """
+        SSE olayları üretir: önce tam görünüm, sonra sürüm değiştikçe sadece
+        değişen peer'lar; değişiklik yoksa arada bir keepalive yorumu.
+        """
+        yield b"retry: 5000\n\n"
+        sent = None
+        last_write = time.monotonic()
+        while True:
+            view = self.view()
+            if sent is None or view.key != sent.key:
+                event = self.delta(sent, view)
+                sent = view
+                last_write = time.monotonic()
+                yield event
+            elif time.monotonic() - last_write >= self.keepalive:
+                last_write = time.monotonic()
+                yield b": keepalive\n\n"
+            sleep(self.stream_interval)
+
+
+class StatusStream:
+    """
+    Açık bir SSE akışı. WSGI sunucusu istemci koptuğunda close() çağırır;
+    üreteç hiç başlamamış olsa da akış yeri bırakılır.
+    """
+
+    def __init__(self, cache: StatusCache, sleep: Callable[[float], None]):
+        self._cache = cache
+        self._events = cache.events(sleep)
+        self._closed = False
+
+    def __iter__(self):
+        return self._events
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._events.close()
+            self._cache._release_stream()